@@ -302,10 +302,22 @@ router.post('/visualize-public', async (req, res) => {
 
 router.get('/model-statistics', async (req, res) => {
   try {
+    const ifNoneMatch = req.get('if-none-match');
     const response = await requestMlWithRouteFallback((routePrefix) => axios.get(
       buildMlUrl('/model-statistics', routePrefix),
-      { timeout: 60000 }
+      {
+        timeout: 60000,
+        headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {},
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+      }
     ));
+    if (response.headers?.etag) {
+      res.set('ETag', response.headers.etag);
+      res.set('Cache-Control', 'no-cache');
+    }
+    if (response.status === 304) {
+      return res.status(304).end();
+    }
     res.json(response.data);
   } catch (error) {
     console.error('Error fetching model statistics:', error.message);
@@ -362,6 +374,8 @@ router.get('/warmup', async (req, res) => {
         health: true,
         root: true
       },
+      // Per-stage timings of the ML engine's background model warm-up
+      ml_warmup: checks[0].value?.data?.warmup ?? null,
       duration_ms: Date.now() - startedAt
     });
   } catch (error) {
@@ -3,31 +3,45 @@ FastAPI ML Engine
 Main API server for ML operations.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
+from fastapi.responses import StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union, Iterator
 import numpy as np
 import os
+import asyncio
+import hashlib
+import hmac
+import json
+import threading
+import time
 from dotenv import load_dotenv
-from sklearn.metrics import (
-    silhouette_score, 
-    calinski_harabasz_score, 
-    davies_bouldin_score,
-    adjusted_rand_score,
-    normalized_mutual_info_score,
-    fowlkes_mallows_score
-)
 
 from core.riasec_scorer import RIASECScorer
 from core.profile_processor import ProfileProcessor
 from core.clustering import StudentClusterer
-from core.embeddings import EmbeddingReducer
+from core.embeddings import EmbeddingReducer, configure_numba
 from core.similarity import SimilarityEngine
+from core.career_store import CareerStore, CareerRecord
 from core.data_loader import DataLoader
-from core.metrics import calculate_dunn_index, create_riasec_ground_truth, calculate_external_metrics
+from core.response_cache import ResponseCache
+from core.drift_monitor import DriftMonitor
+from core.serving import file_signature
+from core.logger import configure_logging, get_logger, sample_request_debug, debug_enabled
+from core.metrics import (
+    calculate_dunn_index,
+    calculate_silhouette,
+    create_riasec_ground_truth,
+    calculate_external_metrics,
+    DUNN_SAMPLE_SIZE
+)
 
 load_dotenv()
+configure_logging()
+configure_numba()
+logger = get_logger("ml_engine")
 
 app = FastAPI(title="SCRS ML Engine", version="1.0.0")
 
@@ -47,7 +61,11 @@ profile_processor = ProfileProcessor()
 # Use fixed KMeans++ for deterministic model selection.
 clusterer = StudentClusterer(algorithm='kmeans_plus')
 embedding_reducer = EmbeddingReducer()
-similarity_engine = SimilarityEngine()
+# Optional IVF index for large career catalogs (0 cells = exact search).
+similarity_engine = SimilarityEngine(
+    ann_cells=int(os.getenv("CAREER_ANN_CELLS", 0)),
+    ann_probe=int(os.getenv("CAREER_ANN_PROBE", 4)),
+)
 
 visualization_cache: Dict[str, Any] = {
     "ready": False,
@@ -62,16 +80,23 @@ visualization_cache: Dict[str, Any] = {
     "student_clusters": None,
 }
 
-# Load careers
-careers_data = data_loader.load_careers()
-# Avoid heavyweight runtime embedding generation at startup so the web service
-# binds to $PORT quickly on platforms like Render.
-for career in careers_data:
-    if 'embedding' not in career:
-        riasec = np.array(career.get('riasec', [0, 0, 0, 0, 0, 0]), dtype=float)
-        skills = np.array(career.get('skills_vector', [0] * 10), dtype=float)
-        subjects = np.array([0.0, 0.0, 0.0, 0.0], dtype=float)
-        career['embedding'] = np.concatenate([riasec, skills, subjects]).tolist()
+
+
+def prepare_careers(careers: List[Dict]) -> List[Dict]:
+    """Fill in lightweight RIASEC + skills embeddings for careers missing one."""
+    # Avoid heavyweight runtime embedding generation at startup so the web service
+    # binds to $PORT quickly on platforms like Render.
+    for career in careers:
+        if 'embedding' not in career:
+            riasec = np.array(career.get('riasec', [0, 0, 0, 0, 0, 0]), dtype=float)
+            skills = np.array(career.get('skills_vector', [0] * 10), dtype=float)
+            subjects = np.array([0.0, 0.0, 0.0, 0.0], dtype=float)
+            career['embedding'] = np.concatenate([riasec, skills, subjects]).tolist()
+    return careers
+
+
+# Load careers into a compact store (slotted records + one float32 embedding array)
+career_store = CareerStore(prepare_careers(data_loader.load_careers()))
 
 # Load students and fit models if available
 students_data = data_loader.load_students()
@@ -84,11 +109,15 @@ if len(students_data) > 0:
             if os.path.exists(model_path):
                 # Try to load existing model first
                 try:
-                    clusterer.load_model()
-                    print("[OK] Loaded existing clustering model from disk")
-                    # Ensure KMeans++ model exists for fixed selection mode.
-                    if clusterer.kmeans_plus is None:
-                        print("[WARNING] Saved model missing KMeans++ - retraining")
+                    if clusterer.serving_artifact is None:
+                        clusterer.load_model()
+                        print("[OK] Loaded existing clustering model from disk")
+                    else:
+                        # The sklearn models load on first use (e.g. /model-statistics)
+                        print("[OK] Serving clustering model from the NumPy artifact")
+                    # Ensure the active KMeans model exists for fixed selection mode.
+                    if not clusterer.is_fitted():
+                        print("[WARNING] Saved model missing the active KMeans model - retraining")
                         clusterer.fit(student_vectors)
                 except Exception as load_error:
                     print(f"[WARNING] Could not load model: {load_error}")
@@ -99,18 +128,64 @@ if len(students_data) > 0:
                 clusterer.fit(student_vectors)
 
             # Do not refit reducers on every boot; load existing reducers when available.
-            if embedding_reducer.pca_2d is None:
+            if not embedding_reducer.has_pca_2d():
                 print("[INFO] PCA model missing - fitting PCA 2D")
                 embedding_reducer.fit_pca_2d(student_vectors)
-            if embedding_reducer.umap_3d is None:
+            if not embedding_reducer.has_umap_3d():
                 print("[INFO] UMAP model missing - fitting UMAP 3D")
                 embedding_reducer.fit_umap_3d(student_vectors)
+            elif embedding_reducer.projection_3d is None:
+                print("[INFO] 3D projector missing - building it from the UMAP model")
+                try:
+                    embedding_reducer.fit_projection_3d(student_vectors)
+                except ValueError as projection_error:
+                    # e.g. UMAP was fitted on a streaming sample; /visualize falls back to UMAP.transform
+                    print(f"[WARNING] Could not build the 3D projector: {projection_error}")
             print("[OK] All models loaded and ready")
         except Exception as e:
             print(f"⚠ Warning: Could not fit models: {e}")
             print("   Run 'python train_models.py' to train models")
 
 
+def compute_model_version(careers: Optional[CareerStore] = None) -> str:
+    """Version stamp for the loaded clustering model and career catalog."""
+    parts = [str(clusterer.get_active_algorithm())]
+    if os.path.exists(clusterer.model_path):
+        model_stat = os.stat(clusterer.model_path)
+        parts.append(f"{model_stat.st_mtime_ns}-{model_stat.st_size}")
+    parts.append((career_store if careers is None else careers).fingerprint())
+    return ":".join(parts)
+
+
+model_version = compute_model_version()
+
+# /assess is deterministic per model version, so identical submissions
+# (classroom sessions, api-server retries) are served from memory.
+assess_cache = ResponseCache(
+    max_size=int(os.getenv("ASSESS_CACHE_SIZE", 1024)),
+    ttl_seconds=float(os.getenv("ASSESS_CACHE_TTL", 3600)),
+)
+
+# Drift score (centroid shift in units of training spread) above which a cluster is flagged
+DRIFT_THRESHOLD = float(os.getenv("DRIFT_THRESHOLD", 0.5))
+
+
+def build_drift_monitor() -> Optional[DriftMonitor]:
+    """Drift monitor for the loaded clustering model, baselined on the training students."""
+    try:
+        centers = clusterer.get_cluster_centers()
+    except ValueError:
+        return None
+    vectors = [s.get('combined_vector', []) for s in students_data if 'combined_vector' in s]
+    if vectors and len(vectors[0]) == centers.shape[1]:
+        return DriftMonitor.from_training(centers, np.array(vectors), drift_threshold=DRIFT_THRESHOLD)
+    return DriftMonitor(centers, drift_threshold=DRIFT_THRESHOLD)
+
+
+# Running statistics of live /cluster and /assess assignments
+drift_monitor = build_drift_monitor()
+
+
 def to_model_vector(career_embedding: np.ndarray, target_dim: int) -> np.ndarray:
     """Convert career embedding to the same dimensionality as user vectors."""
     if len(career_embedding) >= 16:
@@ -127,34 +202,35 @@ def to_model_vector(career_embedding: np.ndarray, target_dim: int) -> np.ndarray
     return career_embedding[:target_dim].reshape(1, -1)
 
 
-def get_active_cluster_model():
-    algo = clusterer.get_active_algorithm()
-    if algo == 'kmeans_plus' or algo == 'kmeans':
-        return clusterer.kmeans_plus, algo
-    if algo == 'kmeans_random':
-        return clusterer.kmeans_random, algo
-    return None, algo
-
+def get_active_cluster_algorithm() -> Optional[str]:
+    """Active clustering algorithm, or None if it has no fitted model."""
+    return clusterer.get_active_algorithm() if clusterer.is_fitted() else None
 
-def build_visualization_cache() -> None:
-    """Precompute static visualization data so request-time work stays minimal."""
-    if embedding_reducer.pca_2d is None or embedding_reducer.umap_3d is None:
-        print("[CACHE] Visualization cache skipped: reducers unavailable")
-        return
 
-    target_dim = 20
+def get_target_dim() -> int:
+    """Dimensionality of the student vectors the reducers were fitted on."""
     if len(students_data) > 0:
         student_vectors = np.array([s.get('combined_vector', []) for s in students_data if 'combined_vector' in s])
         if len(student_vectors) > 0 and student_vectors.shape[1] > 0:
-            target_dim = int(student_vectors.shape[1])
+            return int(student_vectors.shape[1])
+    return 20
+
+
+# Build the normalized career matrix (and IVF index, if enabled) once instead of
+# per request, for the dimension of the profile vectors the engine is queried with.
+similarity_engine.set_careers(career_store, query_dim=get_target_dim())
+
 
+def build_career_visualization(careers: CareerStore) -> Dict[str, list]:
+    """Project careers to 2D/3D for the career entries of the visualization cache."""
+    target_dim = get_target_dim()
     careers_2d = []
     careers_3d = []
     career_titles = []
     career_ids = []
 
-    for i, career in enumerate(careers_data):
-        career_embedding = np.array(career.get('embedding', []))
+    for i, career in enumerate(careers):
+        career_embedding = careers.embedding(i).astype(float)
         if len(career_embedding) == 0:
             continue
 
@@ -163,56 +239,375 @@ def build_visualization_cache() -> None:
             career_2d = embedding_reducer.transform_2d(career_vector)[0].tolist()
             career_3d = embedding_reducer.transform_3d(career_vector)[0].tolist()
         except Exception as e:
-            print(f"[CACHE] Skipping career transform at index {i}: {e}")
+            logger.warning("[CACHE] Skipping career transform at index %d: %s", i, e)
             continue
 
         careers_2d.append(career_2d)
         careers_3d.append(career_3d)
-        career_titles.append(career.get('title', f'Career {i + 1}'))
-        career_ids.append(str(career.get('id')) if career.get('id') is not None else None)
+        career_titles.append(career.title or f'Career {i + 1}')
+        career_ids.append(str(career.id) if career.id is not None else None)
+
+    return {
+        "careers_2d": careers_2d,
+        "careers_3d": careers_3d,
+        "career_titles": career_titles,
+        "career_ids": career_ids,
+    }
+
+
+# Held for a whole (tens of seconds) build, so only ever taken in worker threads
+visualization_build_lock = threading.RLock()
+# Held only to compare catalog versions and assign, so the event loop may take it too
+visualization_swap_lock = threading.Lock()
+
+
+def ensure_visualization_cache() -> None:
+    """Build the visualization cache unless it is ready or another thread just built it."""
+    with visualization_build_lock:
+        if not visualization_cache.get("ready"):
+            build_visualization_cache()
+
+
+def build_visualization_cache() -> None:
+    """Precompute static visualization data so request-time work stays minimal."""
+    with visualization_build_lock:
+        _build_visualization_cache()
+
+
+def _build_visualization_cache() -> None:
+    if not embedding_reducer.has_pca_2d() or not embedding_reducer.has_umap_3d():
+        logger.info("[CACHE] Visualization cache skipped: reducers unavailable")
+        return
+
+    # Career entries come from a versioned snapshot of the catalog
+    with visualization_swap_lock:
+        careers, catalog_version = career_store, catalog_state["version"]
+    career_entries = build_career_visualization(careers)
 
     clusters_2d = None
     clusters_3d = None
     students_2d = None
     students_3d = None
     student_clusters = None
-    active_model, active_algo = get_active_cluster_model()
+    active_algo = get_active_cluster_algorithm()
 
     try:
-        if active_model is not None:
+        if active_algo is not None:
             cluster_centers = clusterer.get_cluster_centers()
             clusters_2d = embedding_reducer.transform_2d(cluster_centers).tolist()
             clusters_3d = embedding_reducer.transform_3d(cluster_centers).tolist()
     except Exception as e:
-        print(f"[CACHE] Cluster center transform warning: {e}")
+        logger.warning("[CACHE] Cluster center transform failed: %s", e)
 
     try:
-        if len(students_data) > 0 and active_model is not None:
+        if len(students_data) > 0 and active_algo is not None:
             student_vectors = np.array([s.get('combined_vector', []) for s in students_data if 'combined_vector' in s])
             if len(student_vectors) > 0:
                 students_2d = embedding_reducer.transform_2d(student_vectors).tolist()
                 students_3d = embedding_reducer.transform_3d(student_vectors).tolist()
-                if active_algo == 'kmeans_plus' or active_algo == 'kmeans':
-                    student_clusters = clusterer.kmeans_plus.predict(student_vectors).tolist()
-                elif active_algo == 'kmeans_random':
-                    student_clusters = clusterer.kmeans_random.predict(student_vectors).tolist()
+                student_clusters = clusterer.predict_labels(student_vectors).tolist()
     except Exception as e:
-        print(f"[CACHE] Student transform warning: {e}")
+        logger.warning("[CACHE] Student transform failed: %s", e)
+
+    # One update() so a rebuild in a worker thread swaps all entries together.
+    # A catalog reloaded meanwhile already installed its own career entries,
+    # so entries built from the old catalog are discarded and rebuilt.
+    while True:
+        with visualization_swap_lock:
+            if catalog_state["version"] == catalog_version:
+                visualization_cache.update({
+                    **career_entries,
+                    "ready": True,
+                    "clusters_2d": clusters_2d,
+                    "clusters_3d": clusters_3d,
+                    "students_2d": students_2d,
+                    "students_3d": students_3d,
+                    "student_clusters": student_clusters,
+                })
+                break
+            careers, catalog_version = career_store, catalog_state["version"]
+        logger.info("[CACHE] Career catalog reloaded during build; rebuilding career entries")
+        career_entries = build_career_visualization(careers)
+    logger.info(
+        "[CACHE] Visualization cache ready: careers=%d, students=%d",
+        len(career_entries['careers_2d']),
+        len(students_2d) if students_2d else 0,
+    )
+
+
+# Career catalog hot reload
+CAREERS_PATH = os.path.join(data_loader.data_dir, "careers.json")
+# Poll interval in seconds for careers.json changes (0 disables the watcher)
+CAREERS_WATCH_INTERVAL = float(os.getenv("CAREERS_WATCH_INTERVAL", 0))
+# Admin endpoints are disabled unless a token is configured
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def require_admin_token(x_admin_token: Optional[str]) -> None:
+    """Reject admin calls unless ADMIN_TOKEN is set and the caller sent it."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+def get_careers_mtime() -> Optional[int]:
+    try:
+        return os.stat(CAREERS_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+catalog_state: Dict[str, Any] = {
+    "mtime": get_careers_mtime(),
+    "last_reload": None,
+    # Bumped on every swap so in-flight visualization builds can detect it
+    "version": 0,
+}
+catalog_reload_lock = asyncio.Lock()
+
+
+def build_catalog(careers: List[Dict]) -> Dict[str, Any]:
+    """Build every career-derived structure for a new catalog without touching live state."""
+    store = CareerStore(prepare_careers(careers))
+    engine = SimilarityEngine(ann_cells=similarity_engine.ann_cells, ann_probe=similarity_engine.ann_probe)
+    engine.set_careers(store, query_dim=similarity_engine.query_dim)
+    career_entries = None
+    if visualization_cache.get("ready"):
+        career_entries = build_career_visualization(store)
+    return {
+        "careers": store,
+        "engine": engine,
+        "career_entries": career_entries,
+        "version": compute_model_version(store),
+    }
 
-    visualization_cache["ready"] = True
-    visualization_cache["careers_2d"] = careers_2d
-    visualization_cache["careers_3d"] = careers_3d
-    visualization_cache["career_titles"] = career_titles
-    visualization_cache["career_ids"] = career_ids
-    visualization_cache["clusters_2d"] = clusters_2d
-    visualization_cache["clusters_3d"] = clusters_3d
-    visualization_cache["students_2d"] = students_2d
-    visualization_cache["students_3d"] = students_3d
-    visualization_cache["student_clusters"] = student_clusters
-    print(f"[CACHE] Visualization cache ready: careers={len(careers_2d)}, students={len(students_2d) if students_2d else 0}")
 
+async def reload_careers_catalog() -> Dict[str, Any]:
+    """
+    Reload careers.json in a worker thread, then swap the catalog in.
+    The swap runs on the event loop and request handlers do not await
+    mid-request, so no request ever sees a half-built catalog.
+    """
+    global career_store, similarity_engine, model_version
+
+    async with catalog_reload_lock:
+        started = time.perf_counter()
+        mtime = get_careers_mtime()
+        loop = asyncio.get_running_loop()
+        catalog = await loop.run_in_executor(None, lambda: build_catalog(data_loader.load_careers()))
+
+        with visualization_swap_lock:
+            career_store = catalog["careers"]
+            similarity_engine = catalog["engine"]
+            catalog_state["version"] += 1
+            if catalog["career_entries"] is not None:
+                visualization_cache.update(catalog["career_entries"])
+            elif visualization_cache.get("ready"):
+                # Cache finished building from the old catalog after build_catalog() looked
+                visualization_cache["ready"] = False
+        model_version = catalog["version"]
+        assess_cache.clear()
+
+        catalog_state["mtime"] = mtime
+        catalog_state["last_reload"] = {
+            "n_careers": len(career_store),
+            "domains": similarity_engine.domains,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        logger.info("[CATALOG] Reloaded %d careers in %.1f ms", len(career_store), catalog_state["last_reload"]["duration_ms"])
+        return catalog_state["last_reload"]
+
+
+async def watch_careers_file():
+    """Reload the catalog whenever careers.json changes on disk."""
+    while True:
+        await asyncio.sleep(CAREERS_WATCH_INTERVAL)
+        if get_careers_mtime() == catalog_state["mtime"] or catalog_reload_lock.locked():
+            continue
+        try:
+            await reload_careers_catalog()
+        except Exception:
+            # Keep serving the previous catalog; a half-written file is retried next poll
+            logger.exception("[CATALOG] Reload of %s failed", CAREERS_PATH)
+
+
+@app.on_event("startup")
+async def start_careers_watcher():
+    if CAREERS_WATCH_INTERVAL > 0:
+        asyncio.create_task(watch_careers_file())
+
+
+# Background warm-up
+# The first UMAP/pynndescent call imports and compiles Numba kernels (tens of
+# seconds on a cold deploy); build the visualization cache and run every
+# request-path model once with synthetic vectors so a real user does not pay
+# that cost. Set ML_WARMUP=0 to disable.
+ML_WARMUP = os.getenv("ML_WARMUP", "1") != "0"
+warmup_state: Dict[str, Any] = {
+    "status": "pending" if ML_WARMUP else "disabled",
+    "stages": {},
+    "total_seconds": None,
+}
 
-build_visualization_cache()
+
+def run_warmup() -> None:
+    """Exercise projection, clustering and recommendation once, timing each stage."""
+    warmup_state["status"] = "running"
+    started = time.perf_counter()
+    try:
+        dim = clusterer.get_cluster_centers().shape[1]
+    except ValueError:
+        dim = 20
+    vectors = np.random.default_rng(0).random((2, dim))
+
+    stages = [
+        # Built here rather than at import so the server binds its port first;
+        # /visualize builds it on demand if warm-up is disabled or still running.
+        ("visualization_cache", True, ensure_visualization_cache),
+        ("transform_2d", embedding_reducer.has_pca_2d(), lambda: embedding_reducer.transform_2d(vectors)),
+        ("transform_3d", embedding_reducer.has_umap_3d(), lambda: embedding_reducer.transform_3d(vectors)),
+        ("project_3d", embedding_reducer.has_umap_3d(), lambda: embedding_reducer.project_3d(vectors)),
+        ("clustering", clusterer.is_fitted(), lambda: clusterer.assign(vectors[0])),
+        ("recommendation", len(career_store) > 0, lambda: similarity_engine.rank_careers(vectors[0], 5)),
+    ]
+    failed = False
+    for name, available, stage in stages:
+        if not available:
+            warmup_state["stages"][name] = {"status": "skipped", "seconds": None}
+            continue
+        stage_started = time.perf_counter()
+        try:
+            stage()
+            warmup_state["stages"][name] = {"status": "ok", "seconds": round(time.perf_counter() - stage_started, 4)}
+        except Exception as e:
+            failed = True
+            logger.warning("[WARMUP] Stage %s failed: %s", name, e)
+            warmup_state["stages"][name] = {"status": "failed", "seconds": None, "error": str(e)}
+
+    warmup_state["total_seconds"] = round(time.perf_counter() - started, 4)
+    warmup_state["status"] = "failed" if failed else "done"
+    logger.info("[WARMUP] Finished in %.2fs: %s", warmup_state["total_seconds"], warmup_state["stages"])
+
+
+@app.on_event("startup")
+async def start_warmup():
+    if ML_WARMUP:
+        # Fire and forget: the server accepts requests while kernels compile
+        asyncio.get_running_loop().run_in_executor(None, run_warmup)
+
+
+# Model statistics snapshot
+# Statistics only change when the model, catalog or student data change, so they
+# are computed once, kept in memory and persisted next to clustering_model.joblib.
+MODEL_STATS_PATH = os.path.join(os.path.dirname(clusterer.model_path), "model_statistics.json")
+
+
+def get_model_file_signature() -> Optional[str]:
+    return file_signature(clusterer.model_path)
+
+
+loaded_model_signature = get_model_file_signature()
+model_stats_snapshot: Dict[str, Any] = {}
+model_stats_lock = asyncio.Lock()
+model_reload_lock = asyncio.Lock()
+
+
+def get_stats_signature() -> str:
+    """Everything the statistics depend on: model files, catalog and student data."""
+    model_files = f"{get_model_file_signature()}|{file_signature(embedding_reducer.pca_path)}"
+    return f"{model_version}|{model_files}|{len(students_data)}"
+
+
+def make_stats_snapshot(signature: str, body: bytes) -> Dict[str, Any]:
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    return {"signature": signature, "etag": etag, "body": body}
+
+
+def load_stats_snapshot() -> Optional[Dict[str, Any]]:
+    """Load the persisted snapshot if it matches the loaded model and data."""
+    try:
+        with open(MODEL_STATS_PATH, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if stored.get("signature") != get_stats_signature():
+        return None
+    body = json.dumps(stored["stats"], separators=(',', ':')).encode('utf-8')
+    return make_stats_snapshot(stored["signature"], body)
+
+
+def build_stats_snapshot() -> Dict[str, Any]:
+    """Compute statistics, persist them next to the model and return the snapshot."""
+    signature = get_stats_signature()
+    stats = jsonable_encoder(build_model_statistics())
+    try:
+        with open(MODEL_STATS_PATH, 'w', encoding='utf-8') as f:
+            json.dump({"signature": signature, "stats": stats}, f)
+    except OSError as e:
+        logger.warning("[STATS] Could not persist statistics snapshot: %s", e)
+    body = json.dumps(stats, separators=(',', ':')).encode('utf-8')
+    return make_stats_snapshot(signature, body)
+
+
+def load_models_from_disk():
+    """Load the clustering model and reducers saved by train_models.py."""
+    return StudentClusterer(algorithm='kmeans_plus'), EmbeddingReducer()
+
+
+async def reload_models_if_changed() -> bool:
+    """
+    Swap in the models from disk when clustering_model.joblib has changed
+    (e.g. after a retrain), then refresh everything derived from them.
+    Only called from POST /admin/reload-models.
+
+    Returns:
+        Whether new models were swapped in
+    """
+    global clusterer, embedding_reducer, loaded_model_signature, model_version, drift_monitor
+
+    signature = get_model_file_signature()
+    if signature is None or signature == loaded_model_signature:
+        return False
+    loop = asyncio.get_running_loop()
+    new_clusterer, new_reducer = await loop.run_in_executor(None, load_models_from_disk)
+
+    clusterer = new_clusterer
+    embedding_reducer = new_reducer
+    loaded_model_signature = signature
+    model_version = compute_model_version()
+    assess_cache.clear()
+    drift_monitor = await loop.run_in_executor(None, build_drift_monitor)
+    logger.info("[MODEL] Reloaded models after %s changed", clusterer.model_path)
+    await loop.run_in_executor(None, build_visualization_cache)
+    return True
+
+
+async def ensure_model_statistics_snapshot() -> Dict[str, Any]:
+    """Get the statistics snapshot, rebuilding it if its inputs changed."""
+    global model_stats_snapshot
+
+    async with model_stats_lock:
+        if model_stats_snapshot.get("signature") != get_stats_signature():
+            loop = asyncio.get_running_loop()
+            snapshot = await loop.run_in_executor(None, load_stats_snapshot)
+            if snapshot is None:
+                snapshot = await loop.run_in_executor(None, build_stats_snapshot)
+            model_stats_snapshot = snapshot
+        return model_stats_snapshot
+
+
+@app.on_event("startup")
+async def warm_model_statistics():
+    # Load a persisted snapshot so the first page view is fast. Building one
+    # reads the full sklearn models, which serving from the NumPy artifact
+    # defers, so that is left to the first /model-statistics request.
+    global model_stats_snapshot
+
+    async with model_stats_lock:
+        snapshot = await asyncio.get_running_loop().run_in_executor(None, load_stats_snapshot)
+        if snapshot is not None:
+            model_stats_snapshot = snapshot
 
 
 # Request/Response Models
@@ -244,6 +639,7 @@ class RecommendationResponse(BaseModel):
 
 class AssessRequest(QuestionnaireRequest):
     top_k: int = 5
+    domain: Optional[Union[str, List[str]]] = None
 
 
 class AssessResponse(BaseModel):
@@ -263,6 +659,13 @@ class RecommendRequest(BaseModel):
     combined_vector: List[float]
     user_skills: Optional[Dict[str, float]] = None
     top_k: int = 5
+    domain: Optional[Union[str, List[str]]] = None
+
+class BatchRecommendRequest(BaseModel):
+    combined_vectors: List[List[float]]
+    user_skills: Optional[List[Optional[Dict[str, float]]]] = None
+    top_k: int = 5
+    domain: Optional[Union[str, List[str]]] = None
 
 class VisualizationResponse(BaseModel):
     user_2d: List[float]
@@ -307,9 +710,8 @@ def extract_user_skills_for_recommendation(
     user_skills_dict = normalize_user_skills(provided_skills)
 
     if user_skills_dict and len(user_skills_dict) > 0:
-        print(f"[SKILL_GAP] Using provided user_skills: {user_skills_dict}")
-        print(f"[SKILL_GAP] Number of user skills: {len(user_skills_dict)}")
-        print(f"[SKILL_GAP] User skill values: {[(k, f'{v:.2f}') for k, v in user_skills_dict.items()]}")
+        if debug_enabled(logger):
+            logger.debug("[SKILL_GAP] Using %d provided user_skills: %s", len(user_skills_dict), user_skills_dict)
         return user_skills_dict
 
     # Extract from combined_vector (skills are at indices 6-15)
@@ -318,63 +720,130 @@ def extract_user_skills_for_recommendation(
         if idx < len(skill_vector):
             user_skills_dict[skill_name] = float(skill_vector[idx])
 
-    print(f"[SKILL_GAP] Extracted from vector (fallback): {user_skills_dict}")
-    print(f"[SKILL_GAP] WARNING: Using fallback extraction - user_skills from request was: {provided_skills}")
+    if debug_enabled(logger):
+        logger.debug(
+            "[SKILL_GAP] Using fallback extraction from vector: %s (user_skills from request was: %s)",
+            user_skills_dict, provided_skills
+        )
     return user_skills_dict
 
 
+def validate_domain_filter(domain: Optional[Union[str, List[str]]]) -> None:
+    """Reject domain filters that match no partition of the career catalog."""
+    if domain is None:
+        return
+    requested = [domain] if isinstance(domain, str) else domain
+    known = {d.strip().lower() for d in similarity_engine.domains}
+    unknown = [d for d in requested if d.strip().lower() not in known]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown domain(s): {unknown}. Available domains: {similarity_engine.domains}"
+        )
+
+
+def record_drift(cluster_id: int, vector: np.ndarray, distance: Optional[float] = None) -> None:
+    """Feed one live assignment to the drift monitor."""
+    monitor = drift_monitor
+    if monitor is not None:
+        monitor.update(cluster_id, vector, distance)
+
+
+def build_cluster_payload(vector: np.ndarray, active_algorithm: str) -> Dict[str, Any]:
+    """Assign a profile vector to a cluster with one centroid-distance pass."""
+    assignment = clusterer.assign(vector)
+    record_drift(assignment["cluster_id"], vector, assignment["distances"][assignment["cluster_id"]])
+    return {
+        "cluster_id": assignment["cluster_id"],
+        "cluster_name": assignment["cluster_name"],
+        "algorithm_used": active_algorithm,
+        "cluster_probabilities": {
+            clusterer.get_cluster_name(i): float(prob)
+            for i, prob in enumerate(assignment["probabilities"])
+        },
+        "cluster_distances": {
+            clusterer.get_cluster_name(i): float(distance)
+            for i, distance in enumerate(assignment["distances"])
+        },
+    }
+
+
+# Accept header value that switches /recommend to streamed NDJSON output
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
 def build_recommendation_response(
     user_vector: np.ndarray,
     user_skills: Optional[Dict[str, float]],
     top_k: int = 5,
+    domain: Optional[Union[str, List[str]]] = None,
 ) -> List[RecommendationResponse]:
-    recommendations = similarity_engine.recommend_careers(
-        user_vector,
-        careers_data,
-        top_k
+    indices, scores = similarity_engine.rank_careers(user_vector, top_k, domains=domain)
+    return list(iter_recommendations(similarity_engine, indices, scores, user_vector, user_skills))
+
+
+def stream_recommendation_response(
+    user_vector: np.ndarray,
+    user_skills: Optional[Dict[str, float]],
+    top_k: int = 5,
+    domain: Optional[Union[str, List[str]]] = None,
+) -> StreamingResponse:
+    """Stream ranked recommendations as NDJSON, one career per line in rank order."""
+    # Rank up front so scoring errors still surface as a 500 before streaming starts;
+    # the engine is captured so a catalog reload mid-stream cannot mix catalogs.
+    engine = similarity_engine
+    indices, scores = engine.rank_careers(user_vector, top_k, domains=domain)
+    lines = (
+        recommendation.model_dump_json() + "\n"
+        for recommendation in iter_recommendations(engine, indices, scores, user_vector, user_skills)
     )
+    return StreamingResponse(lines, media_type=NDJSON_MEDIA_TYPE)
+
 
+def iter_recommendations(
+    engine: SimilarityEngine,
+    indices: np.ndarray,
+    scores: np.ndarray,
+    user_vector: np.ndarray,
+    user_skills: Optional[Dict[str, float]],
+) -> Iterator[RecommendationResponse]:
+    """Compute skill gaps for ranked catalog rows and yield response models in rank order."""
     user_skills_dict = extract_user_skills_for_recommendation(user_vector, user_skills)
 
     if len(user_skills_dict) == 0:
-        print(f"[SKILL_GAP ERROR] user_skills_dict is EMPTY! Cannot calculate gaps.")
-        print(f"[SKILL_GAP ERROR] user_skills input was: {user_skills}")
-        print(f"[SKILL_GAP ERROR] user_skills type: {type(user_skills)}")
-        print(f"[SKILL_GAP ERROR] This will cause all skill gaps to be 0.8 (required - 0)")
+        logger.warning(
+            "[SKILL_GAP] user_skills_dict is EMPTY, skill gaps cannot be calculated (input was %r)",
+            user_skills
+        )
 
-    result: List[RecommendationResponse] = []
-    for rec in recommendations:
-        career_skills_list = rec.get('skills', [])
+    debug = debug_enabled(logger)
+    for index, score in zip(indices, scores):
+        rec: CareerRecord = engine.careers[index]
+        career_skills_list = rec.skills
 
         required_skills = {}
         for skill_name in career_skills_list:
             required_skills[skill_name] = 0.8
 
-        print(f"[SKILL_GAP] Computing gaps for {rec['title']}")
-        print(f"[SKILL_GAP] Required skills: {required_skills}")
-        skill_gaps = similarity_engine.compute_skill_gap(user_skills_dict, required_skills)
+        skill_gaps = engine.compute_skill_gap(user_skills_dict, required_skills)
 
-        if len(skill_gaps) > 0:
-            print(f"[SKILL_GAP] {rec['title']}: {len(skill_gaps)} gaps calculated")
-            for skill, gap in skill_gaps.items():
-                print(f"[SKILL_GAP]   - {skill}: {gap:.2f} ({int(gap*100)}%)")
-        else:
-            print(f"[SKILL_GAP] {rec['title']}: No gaps (all skills matched or below threshold)")
-            print(f"[SKILL_GAP]   Required: {list(required_skills.keys())}")
-            print(f"[SKILL_GAP]   User has: {list(user_skills_dict.keys())}")
-
-        result.append(RecommendationResponse(
-            career_id=rec['id'],
-            title=rec['title'],
-            description=rec['description'],
-            similarity_score=rec['similarity_score'],
-            domain=rec.get('domain', 'Unknown'),
-            salary_range=rec.get('salary_range', 'N/A'),
+        if debug:
+            logger.debug(
+                "[SKILL_GAP] %s: %d gaps %s (required: %s, user has: %s)",
+                rec.title, len(skill_gaps), skill_gaps,
+                list(required_skills.keys()), list(user_skills_dict.keys())
+            )
+
+        yield RecommendationResponse(
+            career_id=rec.id,
+            title=rec.title,
+            description=rec.description,
+            similarity_score=float(score),
+            domain=rec.domain,
+            salary_range=rec.salary_range,
             required_skills=career_skills_list,
             skill_gaps=skill_gaps
-        ))
-
-    return result
+        )
 
 
 @app.get("/")
@@ -386,8 +855,15 @@ async def root():
 async def health():
     return {
         "status": "ok",
-        "models_ready": embedding_reducer.pca_2d is not None and embedding_reducer.umap_3d is not None,
+        "models_ready": embedding_reducer.has_pca_2d() and embedding_reducer.has_umap_3d(),
         "cache_ready": visualization_cache.get("ready", False),
+        "warmup": warmup_state,
+        "assess_cache": assess_cache.stats(),
+        "catalog": {
+            "n_careers": len(career_store),
+            "reloading": catalog_reload_lock.locked(),
+            "last_reload": catalog_state["last_reload"],
+        },
     }
 
 
@@ -411,52 +887,63 @@ async def get_cluster(request: ClusterRequest):
     try:
         vector = np.array(request.combined_vector)
         # Check if model is trained
-        active_algorithm = clusterer.get_active_algorithm()
-        if active_algorithm == 'kmeans_plus' or active_algorithm == 'kmeans':
-            active_model = clusterer.kmeans_plus
-        elif active_algorithm == 'kmeans_random':
-            active_model = clusterer.kmeans_random
-        else:
-            active_model = None
-            
-        if active_model is None:
+        active_algorithm = get_active_cluster_algorithm()
+        if active_algorithm is None:
             # Return default cluster if model not trained
             return {
                 "cluster_id": 0,
                 "cluster_name": "Not Classified (Model not trained)",
                 "algorithm_used": None
             }
-        cluster_id, cluster_name = clusterer.predict(vector)
-        
-        # Get probability distribution (hard assignment for KMeans)
-        cluster_probs = None
-        probs = clusterer.predict_proba(vector)
-        if probs is not None:
-            cluster_probs = {
-                clusterer.cluster_names[i]: float(prob) 
-                for i, prob in enumerate(probs)
-            }
-        
-        result = {
-            "cluster_id": int(cluster_id),
-            "cluster_name": cluster_name,
-            "algorithm_used": active_algorithm
-        }
-        
-        if cluster_probs:
-            result["cluster_probabilities"] = cluster_probs
-        
-        return result
+        return build_cluster_payload(vector, active_algorithm)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.post("/recommend", response_model=List[RecommendationResponse])
-async def recommend_careers(request: RecommendRequest):
-    """Get career recommendations based on similarity."""
+async def recommend_careers(request: RecommendRequest, accept: Optional[str] = Header(default=None)):
+    """
+    Get career recommendations based on similarity.
+    Send `Accept: application/x-ndjson` to stream results in rank order.
+    """
+    sample_request_debug(logger)
+    validate_domain_filter(request.domain)
     try:
         user_vector = np.array(request.combined_vector)
-        return build_recommendation_response(user_vector, request.user_skills, request.top_k)
+        if accept and NDJSON_MEDIA_TYPE in accept:
+            return stream_recommendation_response(user_vector, request.user_skills, request.top_k, request.domain)
+        return build_recommendation_response(user_vector, request.user_skills, request.top_k, request.domain)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/recommend/batch", response_model=List[List[RecommendationResponse]])
+async def recommend_careers_batch(request: BatchRecommendRequest):
+    """Get career recommendations for many profile vectors in one call."""
+    sample_request_debug(logger)
+    if request.user_skills is not None and len(request.user_skills) != len(request.combined_vectors):
+        raise HTTPException(
+            status_code=400,
+            detail="user_skills must have one entry per combined_vector"
+        )
+    validate_domain_filter(request.domain)
+    if len(request.combined_vectors) == 0:
+        return []
+
+    try:
+        user_vectors = np.array(request.combined_vectors, dtype=float)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="All combined_vectors must have the same length")
+
+    try:
+        indices, scores = similarity_engine.rank_careers_batch(
+            user_vectors, request.top_k, domains=request.domain
+        )
+        user_skills_list = request.user_skills or [None] * len(indices)
+        return [
+            list(iter_recommendations(similarity_engine, indices[i], scores[i], user_vectors[i], user_skills_list[i]))
+            for i in range(len(indices))
+        ]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -464,6 +951,26 @@ async def recommend_careers(request: RecommendRequest):
 @app.post("/assess", response_model=AssessResponse)
 async def assess_profile(request: AssessRequest):
     """Process questionnaire, assign cluster, and return recommendations in one call."""
+    sample_request_debug(logger)
+    validate_domain_filter(request.domain)
+    cache_key = ResponseCache.make_key(
+        {
+            "riasec": request.riasec_responses,
+            "skills": request.skill_responses,
+            "subjects": request.subject_preferences,
+            "top_k": request.top_k,
+            "domain": request.domain,
+        },
+        model_version
+    )
+    cached = assess_cache.get(cache_key)
+    if cached is not None:
+        response, drift_observation = cached
+        # A cached answer is still a live assignment for drift monitoring
+        if drift_observation is not None:
+            record_drift(*drift_observation)
+        return response
+
     try:
         profile = profile_processor.process_profile(
             request.riasec_responses,
@@ -475,39 +982,37 @@ async def assess_profile(request: AssessRequest):
         if vector.size == 0:
             raise HTTPException(status_code=400, detail="Profile generation failed: combined_vector is empty")
 
-        active_model, active_algorithm = get_active_cluster_model()
-        if active_model is None:
+        active_algorithm = get_active_cluster_algorithm()
+        drift_observation = None
+        if active_algorithm is None:
             cluster_payload = {
                 "cluster_id": 0,
                 "cluster_name": "Not Classified (Model not trained)",
                 "algorithm_used": None
             }
         else:
-            cluster_id, cluster_name = clusterer.predict(vector)
-            cluster_payload = {
-                "cluster_id": int(cluster_id),
-                "cluster_name": cluster_name,
-                "algorithm_used": active_algorithm
-            }
-
-            probs = clusterer.predict_proba(vector)
-            if probs is not None:
-                cluster_payload["cluster_probabilities"] = {
-                    clusterer.cluster_names[i]: float(prob)
-                    for i, prob in enumerate(probs)
-                }
+            cluster_payload = build_cluster_payload(vector, active_algorithm)
+            # Replayed on cache hits; the monitor recomputes the centroid distance
+            drift_observation = (cluster_payload["cluster_id"], vector, None)
 
         recommendations = build_recommendation_response(
             vector,
             profile.get("skills") or request.skill_responses,
-            request.top_k
+            request.top_k,
+            request.domain
         )
 
-        return AssessResponse(
+        response = AssessResponse(
             profile=ProfileResponse(**profile),
             cluster=cluster_payload,
             recommendations=recommendations
         )
+        # The key carries model_version (model file + catalog), so a retrain or
+        # catalog reload never serves old answers; an unclassified answer is
+        # not cached at all, so it disappears as soon as a model is available.
+        if active_algorithm is not None:
+            assess_cache.set(cache_key, (response, drift_observation))
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -515,22 +1020,25 @@ async def assess_profile(request: AssessRequest):
 @app.post("/visualize", response_model=VisualizationResponse)
 async def get_visualization_data(request: VisualizationRequest):
     """Get 2D and 3D coordinates for visualization."""
+    sample_request_debug(logger)
     try:
         user_vector = np.array(request.combined_vector).reshape(1, -1)
         
         # Check if models are trained
-        if embedding_reducer.pca_2d is None or embedding_reducer.umap_3d is None:
+        if not embedding_reducer.has_pca_2d() or not embedding_reducer.has_umap_3d():
             raise HTTPException(
                 status_code=503,
                 detail="Visualization models not trained. Please run train_models.py first."
             )
 
         if not visualization_cache.get("ready"):
-            build_visualization_cache()
+            # Tens of seconds on first use (UMAP): keep the event loop free
+            await asyncio.get_running_loop().run_in_executor(None, ensure_visualization_cache)
         
         # Get user coordinates (user vector is 20D, models expect 20D)
         user_2d = embedding_reducer.transform_2d(user_vector)[0].tolist()
-        user_3d = embedding_reducer.transform_3d(user_vector)[0].tolist()
+        # Neighbour interpolation over the training embedding instead of a per-request UMAP.transform
+        user_3d = embedding_reducer.project_3d(user_vector)[0].tolist()
 
         careers_2d = visualization_cache.get("careers_2d", [])
         careers_3d = visualization_cache.get("careers_3d", [])
@@ -544,20 +1052,22 @@ async def get_visualization_data(request: VisualizationRequest):
 
         recommended_career_indices = None
         if request.recommended_career_ids:
-            print(f"[VISUALIZE] Looking for {len(request.recommended_career_ids)} recommended career IDs: {request.recommended_career_ids}")
-            print(f"[VISUALIZE] Cached career data has {len(career_ids)} careers")
-            
             requested_ids = set(str(req_id) for req_id in request.recommended_career_ids)
             recommended_career_indices = []
             for i, career_id_str in enumerate(career_ids):
                 if career_id_str is not None and career_id_str in requested_ids:
                     recommended_career_indices.append(i)
-                    print(f"[VISUALIZE] Matched career '{career_titles[i]}' (index {i}) with ID {career_id_str}")
-            
+
             if len(recommended_career_indices) == 0:
-                print(f"[VISUALIZE] WARNING: No career IDs matched! Available career IDs: {career_ids[:5]}")
-            else:
-                print(f"[VISUALIZE] ✓ Found {len(recommended_career_indices)} matching careers at indices: {recommended_career_indices}")
+                logger.warning(
+                    "[VISUALIZE] No career IDs matched %d requested IDs (available: %s)",
+                    len(requested_ids), career_ids[:5]
+                )
+            elif debug_enabled(logger):
+                logger.debug(
+                    "[VISUALIZE] Matched %d of %d recommended career IDs at indices %s",
+                    len(recommended_career_indices), len(requested_ids), recommended_career_indices
+                )
         
         return VisualizationResponse(
             user_2d=user_2d,
@@ -583,15 +1093,76 @@ async def get_visualization_data(request: VisualizationRequest):
 @app.get("/careers")
 async def get_all_careers():
     """Get all available careers."""
-    return careers_data
+    return career_store.to_dicts()
+
+
+@app.get("/monitoring/drift")
+async def get_cluster_drift():
+    """Running statistics of live cluster assignments and their drift from the training clusters."""
+    monitor = drift_monitor
+    if monitor is None:
+        raise HTTPException(status_code=503, detail="Clustering model not trained")
+    return {
+        "model_version": model_version,
+        "algorithm": clusterer.get_active_algorithm(),
+        **monitor.snapshot(clusterer.cluster_names)
+    }
+
+
+@app.post("/admin/reload-careers")
+async def reload_careers(x_admin_token: Optional[str] = Header(default=None)):
+    """Reload data/careers.json without restarting the engine."""
+    require_admin_token(x_admin_token)
+    if catalog_reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Career catalog reload already in progress")
+    try:
+        result = await reload_careers_catalog()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Career catalog reload failed: {e}")
+    return {"status": "reloaded", **result}
+
+
+@app.post("/admin/reload-models")
+async def reload_models(x_admin_token: Optional[str] = Header(default=None)):
+    """Swap in models retrained on disk without restarting the engine."""
+    require_admin_token(x_admin_token)
+    if model_reload_lock.locked():
+        raise HTTPException(status_code=409, detail="Model reload already in progress")
+    async with model_reload_lock:
+        try:
+            reloaded = await reload_models_if_changed()
+        except Exception as e:
+            # Possibly a half-written file; the loaded models keep serving
+            raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+    return {"status": "reloaded" if reloaded else "unchanged", "model_version": model_version}
 
 
 @app.get("/model-statistics")
-async def get_model_statistics():
-    """Get comprehensive model statistics and metrics for unsupervised learning evaluation."""
-    print(f"[STATS] ========== MODEL STATISTICS REQUEST ==========")
-    print(f"[STATS] Students data count: {len(students_data)}")
-    print(f"[STATS] Active algorithm: {clusterer.get_active_algorithm()}")
+async def get_model_statistics(if_none_match: Optional[str] = Header(default=None)):
+    """
+    Get comprehensive model statistics and metrics for unsupervised learning evaluation.
+    Served from the precomputed snapshot; repeat views with a matching
+    If-None-Match get 304 Not Modified.
+    """
+    snapshot = await ensure_model_statistics_snapshot()
+    headers = {"ETag": snapshot["etag"], "Cache-Control": "no-cache"}
+    if if_none_match and (
+        if_none_match.strip() == "*"
+        or snapshot["etag"] in [tag.strip() for tag in if_none_match.split(",")]
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot["body"], media_type="application/json", headers=headers)
+
+
+def build_model_statistics() -> Dict[str, Any]:
+    """Compute the full model statistics payload (used to build the snapshot)."""
+    # Heavy metric imports stay off the startup path
+    from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score
+
+    logger.info(
+        "[STATS] Building model statistics snapshot: students=%d, algorithm=%s",
+        len(students_data), clusterer.get_active_algorithm()
+    )
     try:
         stats = {
             "model_info": {
@@ -603,8 +1174,9 @@ async def get_model_statistics():
                 "kmeans_random_available": clusterer.kmeans_random is not None,
                 "comparison_metrics": clusterer.get_metrics(),
                 "dimensionality_reduction": {
-                    "pca_2d": embedding_reducer.pca_2d is not None,
-                    "umap_3d": embedding_reducer.umap_3d is not None
+                    "pca_2d": embedding_reducer.has_pca_2d(),
+                    "umap_3d": embedding_reducer.has_umap_3d(),
+                    "projection_3d": embedding_reducer.projection_3d.stats if embedding_reducer.projection_3d is not None else None
                 }
             },
             "cluster_info": {
@@ -633,7 +1205,7 @@ async def get_model_statistics():
             },
             "data_info": {
                 "n_students": len(students_data),
-                "n_careers": len(careers_data),
+                "n_careers": len(career_store),
                 "feature_dimension": None
             }
         }
@@ -658,16 +1230,9 @@ async def get_model_statistics():
         
         cluster_labels = None  # Initialize outside the if block
         if active_model is not None and student_vectors is not None and len(student_vectors) > clusterer.n_clusters:
-            print(f"[STATS] ✅ Calculating metrics for {len(student_vectors)} student vectors with {clusterer.n_clusters} clusters")
+            logger.debug("[STATS] Calculating metrics for %d student vectors with %d clusters", len(student_vectors), clusterer.n_clusters)
             # Get cluster assignments using active algorithm
-            if active_algorithm == 'kmeans_plus' or active_algorithm == 'kmeans':
-                cluster_labels = clusterer.kmeans_plus.predict(student_vectors)
-            elif active_algorithm == 'kmeans_random':
-                cluster_labels = clusterer.kmeans_random.predict(student_vectors)
-            else:
-                cluster_labels = None
-            
-            print(f"[STATS] ✅ Cluster labels generated: {len(cluster_labels) if cluster_labels is not None else 0} labels")
+            cluster_labels = clusterer.predict_labels(student_vectors)
             
             # Cluster sizes
             if cluster_labels is not None:
@@ -712,8 +1277,10 @@ async def get_model_statistics():
             
             # If metrics don't have both algorithms, we need to retrain or they're from old model
             if not deployment_metrics or 'kmeans_plus' not in deployment_metrics or 'kmeans_random' not in deployment_metrics:
-                print("[WARNING] Deployment metrics not found in saved model. Models may need retraining.")
-                print("[INFO] Run 'python scripts/train_models.py' to generate deployment metrics.")
+                logger.warning(
+                    "[STATS] Deployment metrics not found in saved model. "
+                    "Run 'python scripts/train_models.py' to generate deployment metrics."
+                )
             
             if deployment_metrics and 'kmeans_plus' in deployment_metrics and 'kmeans_random' in deployment_metrics:
                 selected_algo = deployment_metrics.get('selected', active_algorithm)
@@ -725,7 +1292,8 @@ async def get_model_statistics():
                             "silhouette": round(deployment_metrics['kmeans_plus'].get('silhouette', 0), 4),
                             "calinski_harabasz": round(deployment_metrics['kmeans_plus'].get('calinski_harabasz', 0), 2),
                             "davies_bouldin": round(deployment_metrics['kmeans_plus'].get('davies_bouldin', float('inf')), 4),
-                            "dunn_index": round(deployment_metrics['kmeans_plus'].get('dunn_index', 0), 4)
+                            "dunn_index": round(deployment_metrics['kmeans_plus'].get('dunn_index', 0), 4),
+                            "silhouette_mode": deployment_metrics['kmeans_plus'].get('silhouette_mode', 'exact')
                         },
                         "performance": {
                             "training_time_seconds": round(deployment_metrics['kmeans_plus'].get('training_time', 0), 3),
@@ -743,7 +1311,8 @@ async def get_model_statistics():
                             "silhouette": round(deployment_metrics['kmeans_random'].get('silhouette', 0), 4),
                             "calinski_harabasz": round(deployment_metrics['kmeans_random'].get('calinski_harabasz', 0), 2),
                             "davies_bouldin": round(deployment_metrics['kmeans_random'].get('davies_bouldin', float('inf')), 4),
-                            "dunn_index": round(deployment_metrics['kmeans_random'].get('dunn_index', 0), 4)
+                            "dunn_index": round(deployment_metrics['kmeans_random'].get('dunn_index', 0), 4),
+                            "silhouette_mode": deployment_metrics['kmeans_random'].get('silhouette_mode', 'exact')
                         },
                         "performance": {
                             "training_time_seconds": round(deployment_metrics['kmeans_random'].get('training_time', 0), 3),
@@ -782,7 +1351,9 @@ async def get_model_statistics():
                     
                     stats["metrics"]["silhouette_score"] = {
                         "value": round(float(sil_score), 4),
-                        "interpretation": "Excellent" if sil_score > 0.7 else "Good" if sil_score > 0.5 else "Fair" if sil_score > 0.25 else "Poor"
+                        "interpretation": "Excellent" if sil_score > 0.7 else "Good" if sil_score > 0.5 else "Fair" if sil_score > 0.25 else "Poor",
+                        # Models trained before sampling was added scored every student
+                        "mode": algo_metrics.get('silhouette_mode', 'exact')
                     }
                     stats["metrics"]["calinski_harabasz_score"] = {
                         "value": round(float(ch_score), 2),
@@ -796,13 +1367,16 @@ async def get_model_statistics():
                 # Fallback: Calculate from active algorithm if deployment_metrics not available
                 # Silhouette Score (-1 to 1, higher is better)
                 try:
-                    sil_score = silhouette_score(student_vectors, cluster_labels)
+                    silhouette = calculate_silhouette(student_vectors, cluster_labels)
+                    sil_score = silhouette["value"]
                     stats["metrics"]["silhouette_score"] = {
                         "value": round(float(sil_score), 4),
-                        "interpretation": "Excellent" if sil_score > 0.7 else "Good" if sil_score > 0.5 else "Fair" if sil_score > 0.25 else "Poor"
+                        "interpretation": "Excellent" if sil_score > 0.7 else "Good" if sil_score > 0.5 else "Fair" if sil_score > 0.25 else "Poor",
+                        "mode": silhouette["mode"],
+                        "n_samples": silhouette["n_samples"]
                     }
                 except Exception as e:
-                    print(f"Could not calculate silhouette score: {e}")
+                    logger.warning("Could not calculate silhouette score: %s", e)
                 
                 # Calinski-Harabasz Index (higher is better)
                 try:
@@ -812,7 +1386,7 @@ async def get_model_statistics():
                         "interpretation": "Higher values indicate better-defined clusters"
                     }
                 except Exception as e:
-                    print(f"Could not calculate Calinski-Harabasz score: {e}")
+                    logger.warning("Could not calculate Calinski-Harabasz score: %s", e)
                 
                 # Davies-Bouldin Index (lower is better)
                 try:
@@ -822,49 +1396,47 @@ async def get_model_statistics():
                         "interpretation": "Good" if db_score < 1 else "Fair" if db_score < 2 else "Poor"
                     }
                 except Exception as e:
-                    print(f"Could not calculate Davies-Bouldin score: {e}")
+                    logger.warning("Could not calculate Davies-Bouldin score: %s", e)
                 
                 # Dunn Index (higher is better)
                 try:
-                    dunn_score = calculate_dunn_index(student_vectors, cluster_labels)
+                    dunn_score = calculate_dunn_index(student_vectors, cluster_labels, sample_size=DUNN_SAMPLE_SIZE)
                     stats["metrics"]["dunn_index"] = {
                         "value": round(float(dunn_score), 4),
                         "interpretation": "Excellent" if dunn_score > 1.0 else "Good" if dunn_score > 0.5 else "Fair" if dunn_score > 0.2 else "Poor"
                     }
                 except Exception as e:
-                    print(f"Could not calculate Dunn Index: {e}")
+                    logger.warning("Could not calculate Dunn Index: %s", e)
         
         # External Validation Metrics (using RIASEC-based pseudo-ground truth)
         # IMPORTANT: Calculate this OUTSIDE the deployment_metrics conditional so it ALWAYS runs
         # Only use students that have combined_vector (for clustering) - first 6 elements are RIASEC
         if cluster_labels is not None and len(cluster_labels) > 0:
-            print(f"[STATS] ========== EXTERNAL METRICS CALCULATION START ==========")
             try:
                 # Filter students to only those used in clustering (have combined_vector)
                 students_with_vectors = [s for s in students_data if 'combined_vector' in s and s.get('combined_vector')]
-                print(f"[METRICS] Attempting to create ground truth from {len(students_with_vectors)} students (those with combined_vector)")
-                
                 if len(students_with_vectors) == 0:
-                    print(f"[METRICS] No students with combined_vector found")
-                else:
-                    # Show sample student structure for debugging
-                    sample_student = students_with_vectors[0]
-                    print(f"[METRICS] Sample student keys: {list(sample_student.keys())[:15]}")
-                    if 'riasec_profile' in sample_student:
-                        print(f"[METRICS] Sample student has riasec_profile: {type(sample_student['riasec_profile'])}")
-                    elif 'profile' in sample_student:
-                        print(f"[METRICS] Sample student has profile: {type(sample_student['profile'])}")
-                        if isinstance(sample_student['profile'], dict):
-                            print(f"[METRICS] Profile keys: {list(sample_student['profile'].keys())[:10]}")
+                    logger.warning("[METRICS] No students with combined_vector found")
+                elif debug_enabled(logger):
+                    logger.debug(
+                        "[METRICS] Creating ground truth from %d students (sample keys: %s)",
+                        len(students_with_vectors), list(students_with_vectors[0].keys())[:15]
+                    )
                 
-                ground_truth_labels = create_riasec_ground_truth(students_with_vectors)
-                print(f"[METRICS] Ground truth labels created: {ground_truth_labels is not None}, length: {len(ground_truth_labels) if ground_truth_labels is not None else 0}")
-                print(f"[METRICS] Cluster labels length: {len(cluster_labels)}")
+                # Reuse the student matrix for the vectorized path when its rows line up
+                ground_truth_labels = create_riasec_ground_truth(
+                    students_with_vectors,
+                    student_vectors if student_vectors is not None and len(student_vectors) == len(students_with_vectors) else None
+                )
                 
                 if ground_truth_labels is not None and len(ground_truth_labels) == len(cluster_labels):
-                    print(f"[METRICS] Calculating external metrics...")
                     external_metrics = calculate_external_metrics(cluster_labels, ground_truth_labels)
-                    print(f"[METRICS] External metrics calculated: ARI={external_metrics.get('adjusted_rand_index')}, NMI={external_metrics.get('normalized_mutual_info')}, FMI={external_metrics.get('fowlkes_mallows_index')}")
+                    logger.debug(
+                        "[METRICS] External metrics calculated: ARI=%s, NMI=%s, FMI=%s",
+                        external_metrics.get('adjusted_rand_index'),
+                        external_metrics.get('normalized_mutual_info'),
+                        external_metrics.get('fowlkes_mallows_index')
+                    )
                     
                     stats["external_metrics"] = {
                         "adjusted_rand_index": {
@@ -897,16 +1469,13 @@ async def get_model_statistics():
                         "ground_truth_type": "RIASEC Dominant Dimension"
                     }
                 else:
-                    print(f"[METRICS] ❌ Cannot calculate external metrics:")
-                    print(f"  - Ground truth exists: {ground_truth_labels is not None}")
-                    print(f"  - Ground truth length: {len(ground_truth_labels) if ground_truth_labels is not None else 0}")
-                    print(f"  - Cluster labels length: {len(cluster_labels)}")
-                    print(f"  - Students with vectors: {len(students_with_vectors)}")
-                    if ground_truth_labels is None:
-                        print(f"  - Reason: Ground truth creation failed")
-                        print(f"  - Solution: Ensure students have combined_vector (first 6 elements are RIASEC)")
-                    elif len(ground_truth_labels) != len(cluster_labels):
-                        print(f"  - Reason: Length mismatch - need to filter students_with_vectors to match cluster_labels")
+                    logger.warning(
+                        "[METRICS] Cannot calculate external metrics: ground truth length=%s, "
+                        "cluster labels=%d, students with vectors=%d",
+                        len(ground_truth_labels) if ground_truth_labels is not None else None,
+                        len(cluster_labels), len(students_with_vectors)
+                    )
+                    if ground_truth_labels is not None and len(ground_truth_labels) != len(cluster_labels):
                         # Try to match by filtering students_with_vectors to only those that were actually clustered
                         # This happens if some students don't have valid combined_vector
                         try:
@@ -917,11 +1486,10 @@ async def get_model_statistics():
                                     filtered_students.append(s)
                             
                             if len(filtered_students) == len(cluster_labels):
-                                print(f"[METRICS] Retrying with filtered students ({len(filtered_students)})...")
+                                logger.debug("[METRICS] Retrying with filtered students (%d)", len(filtered_students))
                                 ground_truth_labels = create_riasec_ground_truth(filtered_students)
                                 if ground_truth_labels is not None and len(ground_truth_labels) == len(cluster_labels):
                                     external_metrics = calculate_external_metrics(cluster_labels, ground_truth_labels)
-                                    print(f"[METRICS] ✅ External metrics calculated on retry!")
                                     stats["external_metrics"] = {
                                         "adjusted_rand_index": {
                                             "value": round(external_metrics['adjusted_rand_index'], 4) if external_metrics['adjusted_rand_index'] is not None else None,
@@ -953,14 +1521,11 @@ async def get_model_statistics():
                                         "ground_truth_type": "RIASEC Dominant Dimension"
                                     }
                         except Exception as retry_err:
-                            print(f"[METRICS] Retry also failed: {retry_err}")
+                            logger.warning("[METRICS] Retry also failed: %s", retry_err)
             except Exception as e:
-                print(f"[METRICS] ❌ Error calculating external metrics: {e}")
-                import traceback
-                traceback.print_exc()
-            print(f"[STATS] ========== EXTERNAL METRICS CALCULATION END ==========")
+                logger.exception("[METRICS] Error calculating external metrics: %s", e)
         else:
-            print(f"[STATS] ⚠️ Skipping external metrics: cluster_labels={cluster_labels is not None}, len={len(cluster_labels) if cluster_labels is not None else 0}")
+            logger.debug("[STATS] Skipping external metrics: no cluster labels")
         
         # PCA explained variance
         if embedding_reducer.pca_2d is not None:
@@ -972,26 +1537,10 @@ async def get_model_statistics():
                 stats["pca_info"]["n_components"] = len(explained_var)
                 stats["pca_info"]["total_variance_explained"] = round(float(cumulative_var[-1]), 4)
             except Exception as e:
-                print(f"Could not get PCA variance info: {e}")
+                logger.warning("Could not get PCA variance info: %s", e)
         
-        # Calculate elbow data for different k values (if we have enough students)
-        if student_vectors is not None and len(student_vectors) > 10:
-            try:
-                from sklearn.cluster import KMeans
-                elbow_data = []
-                k_range = range(2, min(11, len(student_vectors)))
-                for k in k_range:
-                    km = KMeans(n_clusters=k, random_state=42, n_init=10)
-                    km.fit(student_vectors)
-                    elbow_data.append({
-                        "k": k,
-                        "inertia": float(km.inertia_),
-                        "silhouette": float(silhouette_score(student_vectors, km.labels_)) if k > 1 else 0
-                    })
-                stats["elbow_data"] = elbow_data
-            except Exception as e:
-                print(f"Could not calculate elbow data: {e}")
-                stats["elbow_data"] = None
+        # Elbow/silhouette sweep is computed at train time and stored with the model
+        stats["elbow_data"] = clusterer.elbow_data
         
         return stats
     except Exception as e:
@@ -2,23 +2,29 @@
 Core ML Engine Modules
 """
 
-from .riasec_scorer import RIASECScorer
-from .profile_processor import ProfileProcessor
-from .clustering import StudentClusterer
-from .embeddings import EmbeddingReducer, CareerEmbedder
-from .similarity import SimilarityEngine
-from .data_loader import DataLoader
-
-__all__ = [
-    'RIASECScorer',
-    'ProfileProcessor',
-    'StudentClusterer',
-    'EmbeddingReducer',
-    'CareerEmbedder',
-    'SimilarityEngine',
-    'DataLoader'
-]
+import importlib
 
+# Exports are imported on first access so `import core.x` does not load
+# every module (and its heavy dependencies) up front.
+_EXPORTS = {
+    'RIASECScorer': 'riasec_scorer',
+    'ProfileProcessor': 'profile_processor',
+    'StudentClusterer': 'clustering',
+    'EmbeddingReducer': 'embeddings',
+    'CareerEmbedder': 'embeddings',
+    'SimilarityEngine': 'similarity',
+    'CareerStore': 'career_store',
+    'CareerRecord': 'career_store',
+    'DataLoader': 'data_loader',
+    'ResponseCache': 'response_cache',
+    'DriftMonitor': 'drift_monitor',
+    'ServingArtifact': 'serving'
+}
 
+__all__ = list(_EXPORTS)
 
 
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,169 @@
+"""
+Career Store Module
+Compact career catalog: slotted metadata records plus one float32 embedding array.
+"""
+
+import hashlib
+import json
+import numpy as np
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class CareerRecord:
+    """
+    Career metadata without the embedding vector.
+    """
+
+    __slots__ = ('id', 'title', 'description', 'domain', 'salary_range', 'skills', 'extra', 'key_order')
+
+    def __init__(
+        self,
+        id: Any,
+        title: str = '',
+        description: str = '',
+        domain: str = 'Unknown',
+        salary_range: str = 'N/A',
+        skills: Optional[List[str]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+        key_order: Optional[tuple] = None
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.domain = domain
+        self.salary_range = salary_range
+        self.skills = skills if skills is not None else []
+        # Remaining catalog fields (riasec, skills_vector, ...) kept as-is
+        self.extra = extra if extra is not None else {}
+        # Key order of the source entry, so to_dict() reproduces it
+        self.key_order = key_order
+
+    @classmethod
+    def from_dict(cls, career: Dict) -> 'CareerRecord':
+        """Build a record from a careers.json entry, dropping its embedding."""
+        extra = {
+            key: value for key, value in career.items()
+            if key not in cls.__slots__ and key != 'embedding'
+        }
+        return cls(
+            id=career.get('id'),
+            title=career.get('title', ''),
+            description=career.get('description', ''),
+            domain=career.get('domain', 'Unknown'),
+            salary_range=career.get('salary_range', 'N/A'),
+            skills=list(career.get('skills', [])),
+            extra=extra,
+            key_order=tuple(career)
+        )
+
+    def to_dict(self, embedding: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        Get the record as a career dictionary in the key order of its source entry.
+
+        Args:
+            embedding: Embedding to include under 'embedding' (omitted if None)
+
+        Returns:
+            Career dictionary
+        """
+        career = {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'domain': self.domain,
+            'salary_range': self.salary_range,
+            'skills': self.skills
+        }
+        career.update(self.extra)
+        if embedding is not None:
+            career['embedding'] = embedding
+        if self.key_order is None:
+            return career
+        ordered = {key: career.pop(key) for key in self.key_order if key in career}
+        ordered.update(career)
+        return ordered
+
+
+class CareerStore:
+    """
+    Career catalog backed by slotted records and one float32 embedding array.
+
+    Embeddings are stored back to back without padding, so catalogs mixing
+    short and long embeddings pay only for their real length: career i spans
+    `vectors[offsets[i]:offsets[i + 1]]` and `dims[i]` is its length (0 if the
+    career has no embedding).
+    """
+
+    def __init__(self, careers: Iterable[Dict] = ()):
+        """
+        Build the store from career dictionaries.
+
+        Args:
+            careers: Career dictionaries, optionally with an 'embedding' key
+        """
+        careers = list(careers)
+        self.records: List[CareerRecord] = [CareerRecord.from_dict(career) for career in careers]
+        self.dims = np.array([len(career.get('embedding') or []) for career in careers], dtype=np.intp)
+        self.offsets = np.zeros(len(careers) + 1, dtype=np.intp)
+        np.cumsum(self.dims, out=self.offsets[1:])
+        self.vectors = np.empty(int(self.offsets[-1]), dtype=np.float32)
+        for i, career in enumerate(careers):
+            if self.dims[i]:
+                self.vectors[self.offsets[i]:self.offsets[i + 1]] = career['embedding']
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, index: int) -> CareerRecord:
+        return self.records[index]
+
+    def __iter__(self) -> Iterator[CareerRecord]:
+        return iter(self.records)
+
+    def embedding(self, index: int) -> np.ndarray:
+        """Get a career's embedding as a read-only view into the embedding array."""
+        view = self.vectors[self.offsets[index]:self.offsets[index + 1]]
+        view.flags.writeable = False
+        return view
+
+    def rows(self, indices: np.ndarray, dim: int) -> np.ndarray:
+        """
+        Gather embeddings into a new (len(indices), dim) float32 matrix.
+
+        Args:
+            indices: Career rows, each with an embedding of at least `dim` values
+            dim: Leading embedding values to keep per career
+
+        Returns:
+            Row-major float32 matrix
+        """
+        return self.vectors[self.offsets[indices][:, np.newaxis] + np.arange(dim)]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Expand the catalog back to career dictionaries with 'embedding' lists.
+        Values are written as the shortest decimals that round-trip through
+        float32, so catalog values with up to 7 significant digits come back
+        exactly as loaded.
+        """
+        return [
+            record.to_dict(self._embedding_list(i) if self.dims[i] else None)
+            for i, record in enumerate(self.records)
+        ]
+
+    def _embedding_list(self, index: int) -> List[float]:
+        """Embedding as Python floats via the shortest float32 decimal repr."""
+        return self.embedding(index).astype(str).astype(np.float64).tolist()
+
+    def fingerprint(self) -> str:
+        """Content hash of the catalog metadata and embeddings."""
+        digest = hashlib.blake2b(digest_size=8)
+        metadata = [record.to_dict() for record in self.records]
+        digest.update(json.dumps(metadata, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(self.dims.tobytes())
+        digest.update(self.vectors.tobytes())
+        return digest.hexdigest()
+
+    def nbytes(self) -> int:
+        """Approximate bytes held by the embedding arrays."""
+        return int(self.vectors.nbytes + self.offsets.nbytes + self.dims.nbytes)
@@ -7,12 +7,22 @@ Supports KMeans with k-means++ initialization as the default runtime model.
 import numpy as np
 import joblib
 import time
-from sklearn.cluster import KMeans
-from sklearn.metrics import silhouette_score, calinski_harabasz_score, davies_bouldin_score
-from core.metrics import calculate_dunn_index
-from typing import List, Tuple, Optional, Dict
+from core.metrics import calculate_dunn_index, calculate_silhouette, get_silhouette_mode, DUNN_SAMPLE_SIZE
+from typing import TYPE_CHECKING, List, Tuple, Optional, Dict, Callable, Iterable
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+import threading
+from threadpoolctl import threadpool_limits
+from core.serving import SERVING_ARTIFACT_NAME, ServingArtifact, file_signature
+from core.logger import get_logger
+
+# sklearn.cluster is imported where models are built: serving from the NumPy
+# artifact never needs it, and unpickling a saved model imports it itself.
+if TYPE_CHECKING:
+    from sklearn.cluster import KMeans
+
+logger = get_logger(__name__)
 
 # Calculate pairwise distances using numpy
 def _pairwise_distances(centers):
@@ -26,12 +36,145 @@ def _pairwise_distances(centers):
     return distances
 
 
+def resolve_n_jobs(n_jobs: int) -> int:
+    """Number of worker processes for a CPU budget (n_jobs <= 0 means all CPUs)."""
+    cpu_count = os.cpu_count() or 1
+    return cpu_count if n_jobs <= 0 else min(n_jobs, cpu_count)
+
+
+def _elbow_point(student_vectors: np.ndarray, k: int, n_threads: Optional[int] = None) -> Dict:
+    """Fit KMeans for one k and score it within a thread budget (None = no limit)."""
+    from sklearn.cluster import KMeans
+
+    with threadpool_limits(limits=n_threads):
+        km = KMeans(n_clusters=k, random_state=42, n_init=10)
+        km.fit(student_vectors)
+        return {
+            "k": k,
+            "inertia": float(km.inertia_),
+            "silhouette": calculate_silhouette(student_vectors, km.labels_)['value']
+        }
+
+
+def compute_elbow_data(student_vectors: np.ndarray, k_max: int = 10, n_jobs: int = 1) -> List[Dict]:
+    """
+    Elbow/silhouette sweep over k = 2..k_max.
+    
+    Args:
+        student_vectors: Array of shape (n_students, n_features)
+        k_max: Largest number of clusters to try
+        n_jobs: Worker processes (1 runs in-process, <= 0 uses all CPUs)
+    
+    Returns:
+        List of {'k', 'inertia', 'silhouette'} dictionaries ordered by k
+    """
+    k_values = list(range(2, min(k_max + 1, len(student_vectors))))
+    workers = min(resolve_n_jobs(n_jobs), len(k_values))
+    if workers <= 1:
+        return [_elbow_point(student_vectors, k) for k in k_values]
+    # One BLAS/OpenMP thread per worker so parallel k values do not oversubscribe cores
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_elbow_point, [student_vectors] * len(k_values), k_values, [1] * len(k_values)))
+
+
+def _fit_model(model: 'KMeans', student_vectors: np.ndarray, n_threads: Optional[int]) -> Tuple['KMeans', float]:
+    """Fit an unfitted KMeans within a thread budget; returns (model, seconds)."""
+    with threadpool_limits(limits=n_threads):
+        start = time.time()
+        model.fit(student_vectors)
+        return model, time.time() - start
+
+
+def _score_metric(name: str, student_vectors: np.ndarray, labels: np.ndarray, n_threads: Optional[int] = 1) -> float:
+    """Compute one internal clustering metric within a thread budget (None = no limit)."""
+    # sklearn.metrics is only needed at training/evaluation time, not for serving
+    from sklearn.metrics import calinski_harabasz_score, davies_bouldin_score
+
+    with threadpool_limits(limits=n_threads):
+        if name == 'silhouette':
+            return calculate_silhouette(student_vectors, labels)['value']
+        if name == 'calinski_harabasz':
+            return calinski_harabasz_score(student_vectors, labels)
+        if name == 'davies_bouldin':
+            return davies_bouldin_score(student_vectors, labels)
+        if name == 'dunn_index':
+            try:
+                return calculate_dunn_index(student_vectors, labels, sample_size=DUNN_SAMPLE_SIZE)
+            except Exception as e:
+                logger.warning("Could not calculate Dunn Index: %s", e)
+                return 0.0
+        raise ValueError(f"Unknown metric: {name}")
+
+
+# Internal quality metrics computed for every fitted model
+QUALITY_METRICS = ('silhouette', 'calinski_harabasz', 'davies_bouldin', 'dunn_index')
+
+
+class CentroidPredictor:
+    """
+    Nearest-centroid predictor over fitted KMeans centers.
+    Plain NumPy, so single-vector calls skip sklearn's validation overhead.
+    """
+    
+    def __init__(self, cluster_centers: np.ndarray):
+        """
+        Initialize predictor.
+        
+        Args:
+            cluster_centers: Fitted centers of shape (n_clusters, n_features)
+        """
+        self.centers = np.ascontiguousarray(cluster_centers, dtype=np.float64)
+        self.center_sq_norms = np.einsum('ij,ij->i', self.centers, self.centers)
+    
+    def squared_distances(self, vectors: np.ndarray) -> np.ndarray:
+        """Squared Euclidean distances of shape (n_vectors, n_clusters)."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        vector_sq_norms = np.einsum('ij,ij->i', vectors, vectors)[:, np.newaxis]
+        squared = vector_sq_norms - 2.0 * (vectors @ self.centers.T) + self.center_sq_norms
+        return np.maximum(squared, 0.0, out=squared)
+    
+    def distances(self, vector: np.ndarray) -> np.ndarray:
+        """Euclidean distances from a single vector to every center."""
+        diff = self.centers - np.asarray(vector, dtype=np.float64).ravel()
+        return np.sqrt(np.einsum('ij,ij->i', diff, diff))
+    
+    def predict(self, vectors: np.ndarray) -> np.ndarray:
+        """Nearest-center labels for one vector or a batch."""
+        return np.argmin(self.squared_distances(vectors), axis=1)
+
+
+class _SavedModelAttribute:
+    """
+    StudentClusterer attribute that only exists in the joblib model. While the
+    clusterer serves from the NumPy artifact, reading one loads the model.
+    """
+    
+    def __set_name__(self, owner, name):
+        self.attribute = f"_{name}"
+    
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        if obj._serving_only:
+            obj._load_deferred_model()
+        return getattr(obj, self.attribute)
+    
+    def __set__(self, obj, value):
+        setattr(obj, self.attribute, value)
+
+
 class StudentClusterer:
     """
     Clusters students using KMeans variants.
     """
     
-    def __init__(self, n_clusters: int = 5, algorithm: str = 'kmeans_plus', model_path: Optional[str] = None):
+    kmeans_plus = _SavedModelAttribute()
+    kmeans_random = _SavedModelAttribute()
+    metrics = _SavedModelAttribute()
+    training_mode = _SavedModelAttribute()
+    elbow_data = _SavedModelAttribute()
+    
+    def __init__(self, n_clusters: int = 5, algorithm: str = 'kmeans_plus', model_path: Optional[str] = None, n_jobs: int = 1):
         """
         Initialize clusterer.
         
@@ -39,8 +182,19 @@ class StudentClusterer:
             n_clusters: Number of clusters (default: 5)
             algorithm: 'kmeans_plus', 'kmeans_random', or 'auto' (default: 'kmeans_plus')
             model_path: Path to saved model (optional)
+            n_jobs: CPU budget for training-time work such as the elbow sweep
+                (1 runs in-process, <= 0 uses all CPUs)
         """
+        # True while predictions come from serving_artifact and the joblib
+        # model (sklearn estimators, metrics, elbow data) is not loaded yet.
+        # _state_lock guards the flag and the swap to the loaded models;
+        # _load_lock keeps concurrent readers from unpickling twice.
+        self._serving_only = False
+        self._state_lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self.serving_artifact = None
         self.n_clusters = n_clusters
+        self.n_jobs = n_jobs
         self.algorithm = algorithm
         base_dir = Path(__file__).resolve().parents[1]
         if model_path is None:
@@ -59,25 +213,74 @@ class StudentClusterer:
             "Practical/Realistic"
         ]
         self.metrics = {}  # Store evaluation metrics
+        self.training_mode = 'full'  # 'full' (KMeans) or 'minibatch' (fit_streaming)
+        self.elbow_data = None  # k-sweep computed at train time, served by /model-statistics
+        self._predictor = None  # CentroidPredictor for the active model
+        self._predictor_model = None  # KMeans the predictor was built from
         self.requested_algorithm = algorithm
         
         # Create model directory if it doesn't exist
         os.makedirs(os.path.dirname(self.model_path), exist_ok=True)
         
-        # Load existing model if available
+        # Load existing model if available. A current serving artifact for
+        # the same active algorithm is enough to predict, so the joblib model
+        # is then only unpickled when one of its attributes is read.
         if os.path.exists(self.model_path):
-            self.load_model()
-            # Keep constructor choice authoritative.
-            self.algorithm = self.requested_algorithm
+            if not self._use_serving_artifact():
+                self.load_model()
+                # Keep constructor choice authoritative.
+                self.algorithm = self.requested_algorithm
+    
+    def _use_serving_artifact(self) -> bool:
+        """Serve from the exported artifact if it matches the saved model."""
+        serving_path = os.path.join(os.path.dirname(self.model_path), SERVING_ARTIFACT_NAME)
+        if not os.path.exists(serving_path):
+            return False
+        artifact = ServingArtifact.load(serving_path)
+        if artifact is None or artifact.model_signature != file_signature(self.model_path):
+            return False
+        if (artifact.best_algorithm or self.algorithm) != artifact.algorithm:
+            return False
+        self.serving_artifact = artifact
+        self.best_algorithm = artifact.best_algorithm
+        self.n_clusters = len(artifact.centroids)
+        self.cluster_names = artifact.cluster_names
+        self._predictor = CentroidPredictor(artifact.centroids)
+        self._serving_only = True
+        return True
+    
+    def _load_deferred_model(self):
+        """
+        Load the joblib model that serving from the artifact skipped.
+        Predictions keep using the artifact until every attribute is assigned.
+        """
+        with self._load_lock:
+            if self._serving_only:
+                self._apply_model_data(joblib.load(self.model_path), algorithm=self.requested_algorithm)
+    
+    def is_fitted(self) -> bool:
+        """Whether the active algorithm can predict, without loading a deferred model."""
+        with self._state_lock:
+            if self._serving_only:
+                return True
+            try:
+                self._active_model()
+            except ValueError:
+                return False
+            return True
     
-    def fit(self, student_vectors: np.ndarray):
+    def fit(self, student_vectors: np.ndarray, compute_elbow: bool = True):
         """
         Fit clustering model(s) on student vectors.
         If algorithm='auto', fits both KMeans++ and KMeans (random) and selects the best.
         
         Args:
             student_vectors: Array of shape (n_students, n_features)
+            compute_elbow: Also run and store the elbow sweep served by
+                /model-statistics (nine extra KMeans fits)
         """
+        # Refitting replaces everything the serving artifact stood in for
+        self._serving_only = False
         if self.algorithm == 'auto':
             # Fit both algorithms and compare
             self._fit_and_compare(student_vectors)
@@ -104,45 +307,176 @@ class StudentClusterer:
         else:
             raise ValueError(f"Unknown algorithm: {self.algorithm}. Use 'kmeans_plus', 'kmeans_random', or 'auto'")
         
+        self.training_mode = 'full'
+        self.elbow_data = compute_elbow_data(student_vectors, n_jobs=self.n_jobs) if compute_elbow else None
         self.save_model()
+        self.get_predictor()
     
-    def _fit_kmeans_plus(self, student_vectors: np.ndarray):
-        """Fit KMeans model with k-means++ initialization."""
-        self.kmeans_plus = KMeans(
+    def fit_streaming(
+        self,
+        make_chunks: Callable[[], Iterable[np.ndarray]],
+        n_epochs: int = 3,
+        eval_sample_size: int = 2000,
+        compute_elbow: bool = True
+    ) -> np.ndarray:
+        """
+        Fit KMeans++ with mini-batch updates over chunks of student vectors.
+        Memory stays bounded by the chunk size plus the evaluation sample, so
+        datasets that do not fit in memory can be clustered. The saved artifact
+        has the same layout as fit() with algorithm='kmeans_plus'.
+        
+        Args:
+            make_chunks: Callable returning a fresh iterable of (n_rows, n_features)
+                chunks for each epoch (e.g. DataLoader.iter_student_vectors)
+            n_epochs: Passes over the data
+            eval_sample_size: Size of the uniform reservoir sample kept from the
+                first epoch for evaluation metrics
+            compute_elbow: Also run and store the elbow sweep on the evaluation sample
+        
+        Returns:
+            The evaluation sample (usable for fitting the PCA/UMAP reducers)
+        """
+        from sklearn.cluster import MiniBatchKMeans
+
+        self._serving_only = False
+        model = MiniBatchKMeans(
             n_clusters=self.n_clusters,
             init='k-means++',
-            n_init=20,
-            max_iter=300,
+            n_init=3,
             random_state=42  # Fixed seed for reproducibility
         )
-        self.kmeans_plus.fit(student_vectors)
+        rng = np.random.default_rng(42)
+        sample = None
+        n_seen = 0
+        
+        start = time.time()
+        for epoch in range(n_epochs):
+            for chunk in make_chunks():
+                chunk = np.asarray(chunk, dtype=np.float64)
+                if len(chunk) == 0:
+                    continue
+                model.partial_fit(chunk)
+                if epoch > 0:
+                    continue
+                
+                # Reservoir sampling (Algorithm R), vectorized per chunk
+                if sample is None:
+                    sample = np.empty((eval_sample_size, chunk.shape[1]))
+                fill = max(0, min(eval_sample_size - n_seen, len(chunk)))
+                sample[n_seen:n_seen + fill] = chunk[:fill]
+                if fill < len(chunk):
+                    positions = np.arange(n_seen + fill, n_seen + len(chunk))
+                    slots = (rng.random(len(positions)) * (positions + 1)).astype(np.int64)
+                    keep = slots < eval_sample_size
+                    # Later rows win on slot collisions, as in the sequential algorithm
+                    sample[slots[keep]] = chunk[fill:][keep]
+                n_seen += len(chunk)
+        training_time = time.time() - start
+        
+        if n_seen < self.n_clusters:
+            raise ValueError(f"Need at least {self.n_clusters} student vectors, got {n_seen}")
+        sample = sample[:min(n_seen, eval_sample_size)]
+        
+        self.kmeans_plus = model
+        self.kmeans_random = None
+        self.best_algorithm = 'kmeans_plus'
+        metrics = self._evaluate_model_comprehensive(sample, 'kmeans_plus', training_time)
+        # partial_fit only tracks the last batch's inertia; report the sample's instead
+        metrics['inertia'] = float(np.sum(np.min(model.transform(sample), axis=1) ** 2))
+        metrics['n_samples'] = n_seen
+        metrics['evaluation_sample_size'] = len(sample)
+        metrics['n_epochs'] = n_epochs
+        self.metrics = {
+            'kmeans_plus': metrics,
+            'selected': self.best_algorithm
+        }
+        
+        self.training_mode = 'minibatch'
+        self.elbow_data = compute_elbow_data(sample, n_jobs=self.n_jobs) if compute_elbow else None
+        self.save_model()
+        self.get_predictor()
+        return sample
     
-    def _fit_kmeans_random(self, student_vectors: np.ndarray):
-        """Fit KMeans model with random initialization."""
-        self.kmeans_random = KMeans(
+    def _make_kmeans(self, algorithm: str) -> 'KMeans':
+        """Unfitted KMeans configured for 'kmeans_plus' or 'kmeans_random'."""
+        from sklearn.cluster import KMeans
+
+        if algorithm == 'kmeans_plus':
+            return KMeans(
+                n_clusters=self.n_clusters,
+                init='k-means++',
+                n_init=20,
+                max_iter=300,
+                random_state=42  # Fixed seed for reproducibility
+            )
+        return KMeans(
             n_clusters=self.n_clusters,
             init='random',
             n_init=20,
             max_iter=300,
             random_state=789  # Different fixed seed to show variation from k-means++
         )
+    
+    def _fit_kmeans_plus(self, student_vectors: np.ndarray):
+        """Fit KMeans model with k-means++ initialization."""
+        self.kmeans_plus = self._make_kmeans('kmeans_plus')
+        self.kmeans_plus.fit(student_vectors)
+    
+    def _fit_kmeans_random(self, student_vectors: np.ndarray):
+        """Fit KMeans model with random initialization."""
+        self.kmeans_random = self._make_kmeans('kmeans_random')
         self.kmeans_random.fit(student_vectors)
     
     def _fit_and_compare(self, student_vectors: np.ndarray):
         """
         Fit both KMeans++ and KMeans (random), then select the best based on comprehensive deployment metrics.
+        With n_jobs > 1 both fits, then all eight quality metrics, run in parallel worker processes.
         """
-        print(f"[CLUSTERING] Fitting KMeans++ (k-means++ initialization)...")
-        kmeans_plus_start = time.time()
-        self._fit_kmeans_plus(student_vectors)
-        kmeans_plus_train_time = time.time() - kmeans_plus_start
-        kmeans_plus_metrics = self._evaluate_model_comprehensive(student_vectors, 'kmeans_plus', kmeans_plus_train_time)
-        
-        print(f"[CLUSTERING] Fitting KMeans (random initialization)...")
-        kmeans_random_start = time.time()
-        self._fit_kmeans_random(student_vectors)
-        kmeans_random_train_time = time.time() - kmeans_random_start
-        kmeans_random_metrics = self._evaluate_model_comprehensive(student_vectors, 'kmeans_random', kmeans_random_train_time)
+        workers = resolve_n_jobs(self.n_jobs)
+        if workers <= 1:
+            print(f"[CLUSTERING] Fitting KMeans++ (k-means++ initialization)...")
+            kmeans_plus_start = time.time()
+            self._fit_kmeans_plus(student_vectors)
+            kmeans_plus_train_time = time.time() - kmeans_plus_start
+            kmeans_plus_metrics = self._evaluate_model_comprehensive(student_vectors, 'kmeans_plus', kmeans_plus_train_time)
+            
+            print(f"[CLUSTERING] Fitting KMeans (random initialization)...")
+            kmeans_random_start = time.time()
+            self._fit_kmeans_random(student_vectors)
+            kmeans_random_train_time = time.time() - kmeans_random_start
+            kmeans_random_metrics = self._evaluate_model_comprehensive(student_vectors, 'kmeans_random', kmeans_random_train_time)
+        else:
+            print(f"[CLUSTERING] Fitting KMeans++ and KMeans (random) in parallel ({workers} CPUs)...")
+            algorithms = ('kmeans_plus', 'kmeans_random')
+            with ProcessPoolExecutor(max_workers=min(workers, len(algorithms) * len(QUALITY_METRICS))) as executor:
+                # Each fit gets half of the CPU budget for its OpenMP/BLAS threads
+                fit_threads = max(1, workers // len(algorithms))
+                fit_futures = {
+                    algorithm: executor.submit(_fit_model, self._make_kmeans(algorithm), student_vectors, fit_threads)
+                    for algorithm in algorithms
+                }
+                self.kmeans_plus, kmeans_plus_train_time = fit_futures['kmeans_plus'].result()
+                self.kmeans_random, kmeans_random_train_time = fit_futures['kmeans_random'].result()
+                
+                labels = {
+                    'kmeans_plus': self.kmeans_plus.predict(student_vectors),
+                    'kmeans_random': self.kmeans_random.predict(student_vectors)
+                }
+                metric_threads = max(1, workers // (len(algorithms) * len(QUALITY_METRICS)))
+                metric_futures = {
+                    (algorithm, name): executor.submit(_score_metric, name, student_vectors, labels[algorithm], metric_threads)
+                    for algorithm in algorithms for name in QUALITY_METRICS
+                }
+                quality = {
+                    algorithm: {name: metric_futures[(algorithm, name)].result() for name in QUALITY_METRICS}
+                    for algorithm in algorithms
+                }
+            kmeans_plus_metrics = self._evaluate_model_comprehensive(
+                student_vectors, 'kmeans_plus', kmeans_plus_train_time, quality['kmeans_plus']
+            )
+            kmeans_random_metrics = self._evaluate_model_comprehensive(
+                student_vectors, 'kmeans_random', kmeans_random_train_time, quality['kmeans_random']
+            )
         
         # Compare and select best
         self.best_algorithm = self._select_best_algorithm(kmeans_plus_metrics, kmeans_random_metrics)
@@ -161,10 +495,17 @@ class StudentClusterer:
         """Evaluate clustering model and return basic metrics (backward compatibility)."""
         return self._evaluate_model_comprehensive(student_vectors, algorithm, 0.0)
     
-    def _evaluate_model_comprehensive(self, student_vectors: np.ndarray, algorithm: str, training_time: float) -> dict:
+    def _evaluate_model_comprehensive(
+        self,
+        student_vectors: np.ndarray,
+        algorithm: str,
+        training_time: float,
+        quality: Optional[Dict[str, float]] = None
+    ) -> dict:
         """
         Comprehensive deployment-level evaluation of clustering model.
         Returns metrics including performance, complexity, stability, and efficiency.
+        `quality` holds QUALITY_METRICS already computed elsewhere (e.g. in parallel workers).
         """
         if algorithm == 'kmeans_plus' and self.kmeans_plus is not None:
             labels = self.kmeans_plus.predict(student_vectors)
@@ -181,17 +522,13 @@ class StudentClusterer:
                 'intra_cluster_variance': float('inf'), 'cluster_stability': 0
             }
         
-        # Basic clustering metrics
-        silhouette = silhouette_score(student_vectors, labels)
-        calinski_harabasz = calinski_harabasz_score(student_vectors, labels)
-        davies_bouldin = davies_bouldin_score(student_vectors, labels)
-        
-        # Dunn Index (internal metric - no ground truth needed)
-        try:
-            dunn_index = calculate_dunn_index(student_vectors, labels)
-        except Exception as e:
-            print(f"Could not calculate Dunn Index: {e}")
-            dunn_index = 0.0
+        # Basic clustering metrics, plus Dunn Index (internal metric - no ground truth needed)
+        if quality is None:
+            quality = {name: _score_metric(name, student_vectors, labels, n_threads=None) for name in QUALITY_METRICS}
+        silhouette = quality['silhouette']
+        calinski_harabasz = quality['calinski_harabasz']
+        davies_bouldin = quality['davies_bouldin']
+        dunn_index = quality['dunn_index']
         
         # Prediction time (average over 100 predictions)
         prediction_times = []
@@ -228,6 +565,7 @@ class StudentClusterer:
         # For KMeans, we use inertia (within-cluster sum of squares) as complexity measure
         metrics = {
             'silhouette': silhouette,
+            'silhouette_mode': get_silhouette_mode(len(student_vectors)),
             'calinski_harabasz': calinski_harabasz,
             'davies_bouldin': davies_bouldin,
             'dunn_index': dunn_index,
@@ -245,7 +583,8 @@ class StudentClusterer:
             metrics['inertia'] = float(model.inertia_)
             # Lower inertia is better (tighter clusters)
             # Also add number of iterations to show convergence differences
-            metrics['n_iter'] = int(model.n_iter_)
+            # Mini-batch models fitted by fit_streaming() count steps, not Lloyd iterations
+            metrics['n_iter'] = int(getattr(model, 'n_iter_', getattr(model, 'n_steps_', 0)))
         
         return metrics
     
@@ -327,65 +666,115 @@ class StudentClusterer:
         
         return 'kmeans_plus' if kmeans_plus_total > kmeans_random_total else 'kmeans_random'
     
-    def predict(self, vector: np.ndarray) -> Tuple[int, str]:
-        """
-        Predict cluster for a single vector using the best algorithm.
-        
-        Args:
-            vector: Profile vector (1D array)
-        
-        Returns:
-            Tuple of (cluster_id, cluster_name)
-        """
+    def _active_model(self) -> 'KMeans':
+        """Get the fitted KMeans model of the active algorithm."""
         algorithm = self.best_algorithm or self.algorithm
         
         if algorithm == 'kmeans_plus' or algorithm == 'kmeans':
             if self.kmeans_plus is None:
                 raise ValueError("KMeans++ model not fitted. Call fit() first or load a saved model.")
-            cluster_id = self.kmeans_plus.predict(vector.reshape(1, -1))[0]
+            return self.kmeans_plus
         elif algorithm == 'kmeans_random':
             if self.kmeans_random is None:
                 raise ValueError("KMeans (random) model not fitted. Call fit() first or load a saved model.")
-            cluster_id = self.kmeans_random.predict(vector.reshape(1, -1))[0]
+            return self.kmeans_random
         else:
             raise ValueError(f"Unknown algorithm: {algorithm}")
+    
+    def get_predictor(self) -> CentroidPredictor:
+        """Get the NumPy predictor for the active model, rebuilding it if the model changed."""
+        with self._state_lock:
+            if self._serving_only:
+                return self._predictor
+            model = self._active_model()
+            if self._predictor is None or self._predictor_model is not model:
+                self._predictor = CentroidPredictor(model.cluster_centers_)
+                self._predictor_model = model
+            return self._predictor
+    
+    def predict_labels(self, student_vectors: np.ndarray) -> np.ndarray:
+        """
+        Predict clusters for many vectors with the active model.
+        
+        Args:
+            student_vectors: Array of shape (n_students, n_features)
+        
+        Returns:
+            Cluster ids of shape (n_students,)
+        """
+        return self.get_predictor().predict(student_vectors)
+    
+    def get_cluster_name(self, cluster_id: int) -> str:
+        """Get the display name of a cluster."""
+        return self.cluster_names[cluster_id] if cluster_id < len(self.cluster_names) else f"Cluster {cluster_id}"
+    
+    def assign(self, vector: np.ndarray, fuzziness: float = 2.0) -> Dict:
+        """
+        Assign a single vector to a cluster in one pass over the centroids.
+        
+        Args:
+            vector: Profile vector (1D array)
+            fuzziness: Fuzzy c-means exponent m > 1 for soft membership
+                (larger values spread probability more evenly)
         
-        cluster_name = self.cluster_names[cluster_id] if cluster_id < len(self.cluster_names) else f"Cluster {cluster_id}"
-        return cluster_id, cluster_name
+        Returns:
+            Dictionary with 'cluster_id', 'cluster_name', 'distances'
+            (Euclidean distance to every centroid) and 'probabilities'
+            (fuzzy c-means membership, proportional to d^(-2/(m-1)))
+        """
+        distances = self.get_predictor().distances(vector)
+        cluster_id = int(np.argmin(distances))
+        
+        if distances[cluster_id] == 0:
+            # Vector sits on a centroid: full membership
+            probabilities = np.zeros(len(distances))
+            probabilities[cluster_id] = 1.0
+        else:
+            # Relative to the closest centroid to keep the powers bounded
+            weights = (distances[cluster_id] / distances) ** (2.0 / (fuzziness - 1.0))
+            probabilities = weights / weights.sum()
+        
+        return {
+            'cluster_id': cluster_id,
+            'cluster_name': self.get_cluster_name(cluster_id),
+            'distances': distances,
+            'probabilities': probabilities
+        }
+    
+    def predict(self, vector: np.ndarray) -> Tuple[int, str]:
+        """
+        Predict cluster for a single vector using the best algorithm.
+        
+        Args:
+            vector: Profile vector (1D array)
+        
+        Returns:
+            Tuple of (cluster_id, cluster_name)
+        """
+        assignment = self.assign(vector)
+        return assignment['cluster_id'], assignment['cluster_name']
     
     def predict_proba(self, vector: np.ndarray) -> Optional[np.ndarray]:
         """
         Get probability distribution across clusters.
-        For KMeans, returns hard assignment (1.0 for assigned cluster, 0.0 for others).
+        Memberships are fuzzy c-means weights (see assign()); use assign() directly
+        when the cluster id is needed too.
         
         Args:
             vector: Profile vector (1D array)
         
         Returns:
-            Array of probabilities for each cluster (hard assignment for KMeans)
+            Array of probabilities for each cluster, or None if no model is fitted
         """
-        algorithm = self.best_algorithm or self.algorithm
-        
-        if algorithm == 'kmeans_plus' or algorithm == 'kmeans':
-            if self.kmeans_plus is None:
-                return None
-            cluster_id = self.kmeans_plus.predict(vector.reshape(1, -1))[0]
-            # Return hard assignment (1.0 for assigned cluster, 0.0 for others)
-            probs = np.zeros(self.n_clusters)
-            probs[cluster_id] = 1.0
-            return probs
-        elif algorithm == 'kmeans_random':
-            if self.kmeans_random is None:
-                return None
-            cluster_id = self.kmeans_random.predict(vector.reshape(1, -1))[0]
-            # Return hard assignment
-            probs = np.zeros(self.n_clusters)
-            probs[cluster_id] = 1.0
-            return probs
-        return None
+        if not self.is_fitted():
+            return None
+        return self.assign(vector)['probabilities']
     
     def get_cluster_centers(self) -> np.ndarray:
         """Get cluster centers from the active algorithm."""
+        with self._state_lock:
+            if self._serving_only:
+                return self.serving_artifact.centroids
         algorithm = self.best_algorithm or self.algorithm
         
         if algorithm == 'kmeans_plus' or algorithm == 'kmeans':
@@ -419,14 +808,26 @@ class StudentClusterer:
             'algorithm': self.algorithm,
             'n_clusters': self.n_clusters,
             'cluster_names': self.cluster_names,
-            'metrics': self.metrics
+            'metrics': self.metrics,
+            'training_mode': self.training_mode,
+            'elbow_data': self.elbow_data
         }
         joblib.dump(model_data, self.model_path)
     
     def load_model(self):
         """Load model(s) from disk."""
         if os.path.exists(self.model_path):
-            model_data = joblib.load(self.model_path)
+            with self._load_lock:
+                self._apply_model_data(joblib.load(self.model_path))
+            # Extract centers into the NumPy predictor at load time
+            try:
+                self.get_predictor()
+            except ValueError:
+                self._predictor = None
+    
+    def _apply_model_data(self, model_data: Dict, algorithm: Optional[str] = None):
+        """Assign a loaded model and stop serving from the artifact, as one step."""
+        with self._state_lock:
             # Try new names first, fall back to old names for backward compatibility
             self.kmeans_plus = model_data.get('kmeans_plus') or model_data.get('kmeans')
             self.kmeans_random = model_data.get('kmeans_random')
@@ -435,10 +836,13 @@ class StudentClusterer:
             if old_gmm is not None:
                 print("[WARNING] Old GMM model found. Please retrain models to use KMeans++ vs KMeans (random) comparison.")
             self.best_algorithm = model_data.get('best_algorithm')
-            self.algorithm = model_data.get('algorithm', self.algorithm)
+            self.algorithm = algorithm or model_data.get('algorithm', self.algorithm)
             self.n_clusters = model_data.get('n_clusters', 5)
             self.cluster_names = model_data.get('cluster_names', self.cluster_names)
             self.metrics = model_data.get('metrics', {})
+            self.training_mode = model_data.get('training_mode', 'full')
+            self.elbow_data = model_data.get('elbow_data')
+            self._serving_only = False
 
 
 if __name__ == "__main__":
@@ -3,11 +3,80 @@ Data Loader
 Loads and manages career and student datasets.
 """
 
+import csv
 import json
-from typing import List, Dict, Optional
+import numpy as np
+from typing import List, Dict, Optional, Iterator
 import os
 from pathlib import Path
 
+# CSV column prefixes that make up a student's combined_vector, in order
+STUDENT_VECTOR_PREFIXES = ('riasec_', 'skill_', 'subject_')
+
+
+def iter_json_array(filepath: str, read_size: int = 1 << 16) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+    Only the element being decoded and one read buffer are held in memory,
+    so large files such as students.json are never materialized whole.
+    
+    Args:
+        filepath: Path to a file holding a JSON array
+        read_size: Characters read from the file per refill
+    
+    Yields:
+        Decoded array elements in file order
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    expect = '['  # '[', 'value', 'value_or_end' or 'separator_or_end'
+    with open(filepath, 'r', encoding='utf-8') as f:
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos == len(buffer) or expect in ('value', 'value_or_end') and buffer[pos] != ']':
+                needs_more = pos == len(buffer)
+                if not needs_more:
+                    try:
+                        element, end = decoder.raw_decode(buffer, pos)
+                        # Only accept an element once its ',' or ']' is buffered: a
+                        # number cut at the buffer edge decodes as a shorter number
+                        follow = end
+                        while follow < len(buffer) and buffer[follow].isspace():
+                            follow += 1
+                        needs_more = not eof and (follow == len(buffer) or buffer[follow] not in ',]')
+                    except json.JSONDecodeError:
+                        if eof:
+                            raise
+                        needs_more = True
+                if needs_more:
+                    if eof:
+                        raise ValueError(f"Unexpected end of JSON array in {filepath}")
+                    chunk = f.read(read_size)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                pos = end
+                expect = 'separator_or_end'
+                yield element
+                continue
+            
+            char = buffer[pos]
+            pos += 1
+            if expect == '[':
+                if char != '[':
+                    raise ValueError(f"Expected a JSON array in {filepath}")
+                expect = 'value_or_end'
+            elif char == ']' and expect != 'value':
+                return
+            elif char == ',' and expect == 'separator_or_end':
+                expect = 'value'
+            else:
+                raise ValueError(f"Unexpected {char!r} in JSON array in {filepath}")
+
 
 class DataLoader:
     """
@@ -63,6 +132,54 @@ class DataLoader:
         else:
             return []
     
+    def iter_student_vectors(self, chunk_size: int = 10000, filepath: Optional[str] = None) -> Iterator[np.ndarray]:
+        """
+        Stream student combined vectors in chunks.
+        CSV files (as written by generate_students.py) are read row by row and
+        JSON files are decoded one student at a time, so memory is bounded by
+        the chunk size.
+        
+        Args:
+            chunk_size: Rows per chunk
+            filepath: Path to a students CSV or JSON file (optional; defaults to
+                students.json, the file load_students() reads)
+        
+        Yields:
+            Arrays of shape (n_rows, n_features), n_rows <= chunk_size
+        """
+        if filepath is None:
+            filepath = os.path.join(self.data_dir, "students.json")
+        
+        if filepath.endswith('.csv'):
+            with open(filepath, 'r', encoding='utf-8', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                columns = [
+                    i for prefix in STUDENT_VECTOR_PREFIXES
+                    for i, name in enumerate(header) if name.startswith(prefix)
+                ]
+                rows = []
+                for row in reader:
+                    rows.append([float(row[i]) for i in columns])
+                    if len(rows) == chunk_size:
+                        yield np.array(rows)
+                        rows = []
+                if rows:
+                    yield np.array(rows)
+            return
+        
+        if not os.path.exists(filepath):
+            return
+        rows = []
+        for student in iter_json_array(filepath):
+            if student.get('combined_vector'):
+                rows.append(student['combined_vector'])
+                if len(rows) == chunk_size:
+                    yield np.array(rows)
+                    rows = []
+        if rows:
+            yield np.array(rows)
+    
     def save_careers(self, careers: List[Dict], filepath: Optional[str] = None):
         """Save careers to JSON file."""
         if filepath is None:
@@ -0,0 +1,166 @@
+"""
+Drift Monitor
+Running per-cluster statistics of live assignments compared against the training clusters.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.clustering import CentroidPredictor
+
+
+class DriftMonitor:
+    """
+    Thread-safe running statistics of assigned profile vectors per cluster.
+
+    Each update is O(d) (Welford mean/variance for the assigned cluster plus
+    its running mean distance), and snapshots are O(k * d), so the monitor
+    can sit on the request path without re-running any clustering metric.
+    """
+
+    def __init__(
+        self,
+        cluster_centers: np.ndarray,
+        baseline_mean_distances: Optional[np.ndarray] = None,
+        baseline_shares: Optional[np.ndarray] = None,
+        drift_threshold: float = 0.5
+    ):
+        """
+        Initialize monitor.
+
+        Args:
+            cluster_centers: Fitted centers of shape (n_clusters, n_features)
+            baseline_mean_distances: Mean training distance to the centroid per
+                cluster, used to scale drift scores (defaults to 1.0)
+            baseline_shares: Fraction of training students in each cluster
+            drift_threshold: Drift score above which a cluster is flagged
+        """
+        self.centers = np.array(cluster_centers, dtype=np.float64)
+        n_clusters, n_features = self.centers.shape
+        self.baseline_mean_distances = (
+            np.ones(n_clusters) if baseline_mean_distances is None
+            else np.asarray(baseline_mean_distances, dtype=np.float64)
+        )
+        self.baseline_shares = None if baseline_shares is None else np.asarray(baseline_shares, dtype=np.float64)
+        self.drift_threshold = drift_threshold
+        self.started_at = time.time()
+        self.counts = np.zeros(n_clusters, dtype=np.int64)
+        self.means = np.zeros((n_clusters, n_features))
+        self._m2 = np.zeros((n_clusters, n_features))
+        self.mean_distances = np.zeros(n_clusters)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_training(cls, cluster_centers: np.ndarray, training_vectors: np.ndarray, **kwargs) -> 'DriftMonitor':
+        """
+        Build a monitor whose baselines come from the training vectors.
+
+        Args:
+            cluster_centers: Fitted centers of shape (n_clusters, n_features)
+            training_vectors: Vectors the clustering model was trained on
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            DriftMonitor with baseline mean distances and cluster shares
+        """
+        squared = CentroidPredictor(cluster_centers).squared_distances(training_vectors)
+        labels = np.argmin(squared, axis=1)
+        distances = np.sqrt(squared[np.arange(len(labels)), labels])
+        n_clusters = len(cluster_centers)
+        counts = np.bincount(labels, minlength=n_clusters)
+        distance_sums = np.bincount(labels, weights=distances, minlength=n_clusters)
+        # Empty training clusters keep a neutral scale of 1.0
+        baseline_mean_distances = np.divide(
+            distance_sums, counts, out=np.ones(n_clusters), where=(counts > 0) & (distance_sums > 0)
+        )
+        return cls(
+            cluster_centers,
+            baseline_mean_distances=baseline_mean_distances,
+            baseline_shares=counts / max(len(labels), 1),
+            **kwargs
+        )
+
+    def update(self, cluster_id: int, vector: np.ndarray, distance: Optional[float] = None) -> None:
+        """
+        Record one assignment.
+
+        Args:
+            cluster_id: Assigned cluster
+            vector: Assigned profile vector
+            distance: Distance to the assigned centroid (computed if omitted)
+        """
+        vector = np.asarray(vector, dtype=np.float64).ravel()
+        if distance is None:
+            distance = float(np.linalg.norm(vector - self.centers[cluster_id]))
+        with self._lock:
+            n = self.counts[cluster_id] + 1
+            self.counts[cluster_id] = n
+            delta = vector - self.means[cluster_id]
+            self.means[cluster_id] += delta / n
+            self._m2[cluster_id] += delta * (vector - self.means[cluster_id])
+            self.mean_distances[cluster_id] += (distance - self.mean_distances[cluster_id]) / n
+
+    def snapshot(self, cluster_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get current statistics with drift scores.
+
+        A cluster's drift score is the distance between the running mean of
+        its live vectors and its training centroid, in units of the training
+        mean distance to that centroid; the distance ratio compares live and
+        training spread the same way.
+
+        Args:
+            cluster_names: Optional display names indexed by cluster id
+
+        Returns:
+            Dictionary with per-cluster statistics and overall drift
+        """
+        with self._lock:
+            counts = self.counts.copy()
+            means = self.means.copy()
+            m2 = self._m2.copy()
+            mean_distances = self.mean_distances.copy()
+
+        total = int(counts.sum())
+        centroid_shift = np.linalg.norm(means - self.centers, axis=1)
+        drift_scores = centroid_shift / self.baseline_mean_distances
+        distance_ratios = mean_distances / self.baseline_mean_distances
+        variances = m2.mean(axis=1) / np.maximum(counts - 1, 1)
+        shares = counts / total if total else np.zeros(len(counts))
+
+        clusters = []
+        for i in range(len(counts)):
+            observed = counts[i] > 0
+            clusters.append({
+                'cluster_id': i,
+                'cluster_name': cluster_names[i] if cluster_names and i < len(cluster_names) else f"Cluster {i}",
+                'count': int(counts[i]),
+                'share': float(shares[i]),
+                'baseline_share': float(self.baseline_shares[i]) if self.baseline_shares is not None else None,
+                'mean_distance': float(mean_distances[i]) if observed else None,
+                'baseline_mean_distance': float(self.baseline_mean_distances[i]),
+                'distance_ratio': float(distance_ratios[i]) if observed else None,
+                'mean_variance': float(variances[i]) if counts[i] > 1 else None,
+                'centroid_shift': float(centroid_shift[i]) if observed else None,
+                'drift_score': float(drift_scores[i]) if observed else None,
+                'drifting': bool(observed and drift_scores[i] > self.drift_threshold)
+            })
+
+        # Count-weighted centroid drift and total variation distance of cluster shares
+        overall_drift = float(np.dot(shares, drift_scores)) if total else None
+        share_shift = (
+            float(0.5 * np.abs(shares - self.baseline_shares).sum())
+            if total and self.baseline_shares is not None else None
+        )
+        return {
+            'observations': total,
+            'since': self.started_at,
+            'drift_threshold': self.drift_threshold,
+            'overall_drift_score': overall_drift,
+            'cluster_share_shift': share_shift,
+            'drifting': any(cluster['drifting'] for cluster in clusters),
+            'clusters': clusters
+        }
@@ -3,13 +3,92 @@ Embedding Module
 Handles dimensionality reduction (PCA, UMAP) and career embeddings.
 """
 
+import hashlib
 import numpy as np
 import joblib
-from sklearn.decomposition import PCA
-from umap import UMAP
-from typing import List, Dict, Tuple, Optional
 import os
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+from core.serving import SERVING_ARTIFACT_NAME, ServingArtifact, file_signature
+
+# The workqueue threading layer (see configure_numba) does not allow concurrent
+# launches, so every UMAP call goes through this lock (shared by all reducers,
+# e.g. across a model hot reload).
+_UMAP_LOCK = threading.RLock()
+
+
+def configure_numba():
+    """
+    Numba defaults for the ML engine's entry points (app.py, train_models.py).
+    Must run before numba is first imported; umap is imported lazily, on the
+    first fit/load of the UMAP model. Values already set in the environment
+    are kept.
+    """
+    # Numba only reuses compiled UMAP/pynndescent kernels (cache=True functions)
+    # if it can write its cache; keep it in the user cache directory (outside
+    # the source tree) so later boots skip recompilation.
+    os.environ.setdefault(
+        "NUMBA_CACHE_DIR",
+        str(Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "ml-engine" / "numba")
+    )
+    # UMAP first runs in the app's warm-up thread; the TBB/OpenMP layers hang
+    # the interpreter at exit when started off the main thread, workqueue does not.
+    os.environ.setdefault("NUMBA_THREADING_LAYER", "workqueue")
+
+
+class NeighborProjector:
+    """
+    Fast stand-in for UMAP.transform: places a vector at the distance-weighted
+    mean of the 3D coordinates of its nearest training vectors.
+    """
+    
+    def __init__(self, vectors: np.ndarray, coords: np.ndarray, n_neighbors: int = 10):
+        """
+        Initialize projector.
+        
+        Args:
+            vectors: Training vectors UMAP was fitted on (n_samples, n_features)
+            coords: Their UMAP embedding (n_samples, 3)
+            n_neighbors: Neighbours averaged per projected vector
+        """
+        self.vectors = np.ascontiguousarray(vectors, dtype=np.float64)
+        self.coords = np.asarray(coords, dtype=np.float64)
+        self.sq_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        self.n_neighbors = min(n_neighbors, len(self.vectors))
+        # Filled in by EmbeddingReducer.fit_projection_3d
+        self.stats: Dict = {}
+    
+    def transform(self, vectors: np.ndarray, exclude_self: bool = False) -> np.ndarray:
+        """
+        Project vectors to 3D.
+        
+        Args:
+            vectors: Vectors to project (n_vectors, n_features)
+            exclude_self: Skip each vector's closest training match (used for
+                leave-one-out evaluation on training vectors)
+        
+        Returns:
+            Coordinates of shape (n_vectors, 3)
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        squared = np.einsum('ij,ij->i', vectors, vectors)[:, np.newaxis] - 2.0 * (vectors @ self.vectors.T) + self.sq_norms
+        distances = np.sqrt(np.maximum(squared, 0.0, out=squared))
+        k = min(self.n_neighbors + int(exclude_self), len(self.vectors))
+        
+        rows = np.arange(len(vectors))[:, np.newaxis]
+        neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        if exclude_self:
+            nearest = np.argmin(distances[rows, neighbors], axis=1)
+            neighbors = np.delete(neighbors, nearest + np.arange(len(vectors)) * k).reshape(len(vectors), k - 1)
+        neighbor_distances = distances[rows, neighbors]
+        
+        weights = 1.0 / np.maximum(neighbor_distances, 1e-12)
+        weights /= weights.sum(axis=1, keepdims=True)
+        return np.einsum('ij,ijk->ik', weights, self.coords[neighbors])
 
 
 class EmbeddingReducer:
@@ -26,32 +105,138 @@ class EmbeddingReducer:
             self.model_dir = str(model_path if model_path.is_absolute() else (base_dir / model_path))
         os.makedirs(self.model_dir, exist_ok=True)
         
-        self.pca_2d = None
-        self.umap_3d = None
+        self._pca_2d = None
+        self._umap_3d = None
+        self.projection_3d = None
+        # Serving artifact whose PCA arrays match pca_2d.joblib (see core.serving)
+        self.serving = None
         self.pca_path = os.path.join(self.model_dir, "pca_2d.joblib")
         self.umap_path = os.path.join(self.model_dir, "umap_3d.joblib")
+        self.projection_path = os.path.join(self.model_dir, "projection_3d.joblib")
+        self.serving_path = os.path.join(self.model_dir, SERVING_ARTIFACT_NAME)
         
-        # Load existing models if available
+        # Load existing models if available. With a current serving artifact
+        # the PCA object is only unpickled if something asks for it.
         if os.path.exists(self.pca_path):
-            self.pca_2d = joblib.load(self.pca_path)
-        if os.path.exists(self.umap_path):
-            self.umap_3d = joblib.load(self.umap_path)
+            artifact = ServingArtifact.load(self.serving_path) if os.path.exists(self.serving_path) else None
+            if artifact is not None and artifact.pca_signature == file_signature(self.pca_path):
+                self.serving = artifact
+            else:
+                self._pca_2d = joblib.load(self.pca_path)
+        if os.path.exists(self.projection_path):
+            self.projection_3d = joblib.load(self.projection_path)
+        # UMAP is loaded on first access (see umap_3d): unpickling it imports
+        # umap/pynndescent/numba, which takes seconds.
+    
+    @property
+    def pca_2d(self):
+        """Fitted PCA model, loaded from disk on first access when serving from the artifact."""
+        if self._pca_2d is None and self.serving is not None:
+            self._pca_2d = joblib.load(self.pca_path)
+        return self._pca_2d
+    
+    @pca_2d.setter
+    def pca_2d(self, model):
+        self._pca_2d = model
+        # A newly fitted PCA invalidates the exported arrays
+        self.serving = None
+    
+    def has_pca_2d(self) -> bool:
+        """Whether a 2D projection is available, without loading the PCA model."""
+        return self.serving is not None or self._pca_2d is not None
+    
+    @property
+    def umap_3d(self):
+        """Fitted UMAP model, loaded from disk on first access (None if not trained)."""
+        if self._umap_3d is None and os.path.exists(self.umap_path):
+            with _UMAP_LOCK:
+                if self._umap_3d is None:
+                    self._umap_3d = joblib.load(self.umap_path)
+        return self._umap_3d
+    
+    @umap_3d.setter
+    def umap_3d(self, model):
+        self._umap_3d = model
+    
+    def has_umap_3d(self) -> bool:
+        """Whether a UMAP model is loaded or saved, without loading it."""
+        return self._umap_3d is not None or os.path.exists(self.umap_path)
     
     def fit_pca_2d(self, vectors: np.ndarray):
         """Fit PCA for 2D reduction."""
+        from sklearn.decomposition import PCA
+
         self.pca_2d = PCA(n_components=2, random_state=42)
         self.pca_2d.fit(vectors)
         joblib.dump(self.pca_2d, self.pca_path)
     
     def fit_umap_3d(self, vectors: np.ndarray):
         """Fit UMAP for 3D reduction."""
+        from umap import UMAP
+
         # n_jobs=1 is required when random_state is set for reproducibility
-        self.umap_3d = UMAP(n_components=3, random_state=42, n_neighbors=15, min_dist=0.1, n_jobs=1)
-        self.umap_3d.fit(vectors)
+        umap_3d = UMAP(n_components=3, random_state=42, n_neighbors=15, min_dist=0.1, n_jobs=1)
+        with _UMAP_LOCK:
+            umap_3d.fit(vectors)
+        self.umap_3d = umap_3d
         joblib.dump(self.umap_3d, self.umap_path)
+        self.fit_projection_3d(vectors)
+    
+    def fit_projection_3d(self, training_vectors: np.ndarray, n_neighbors: int = 10, eval_size: int = 500) -> Dict:
+        """
+        Build the fast 3D projector from the fitted UMAP and measure how far
+        it places vectors from UMAP.transform.
+        
+        Args:
+            training_vectors: The vectors the UMAP model was fitted on, in the
+                same order (row i is placed at umap_3d.embedding_[i])
+            n_neighbors: Neighbours averaged per projected vector
+            eval_size: Training vectors used for the leave-one-out comparison
+        
+        Returns:
+            Displacement and timing statistics (also kept in projector.stats)
+        """
+        if self.umap_3d is None:
+            raise ValueError("UMAP model not fitted. Call fit_umap_3d() first.")
+        training_vectors = np.asarray(training_vectors, dtype=float)
+        coords = self.umap_3d.embedding_
+        if len(training_vectors) != len(coords):
+            raise ValueError(
+                f"UMAP model was fitted on {len(coords)} vectors, got {len(training_vectors)} training vectors"
+            )
+        projector = NeighborProjector(training_vectors, coords, n_neighbors=n_neighbors)
+        
+        # Leave-one-out placement of training vectors vs. UMAP's own placement of them
+        rng = np.random.default_rng(42)
+        sample = rng.choice(len(training_vectors), size=min(eval_size, len(training_vectors)), replace=False)
+        expected = self.transform_3d(training_vectors[sample])
+        projected = projector.transform(training_vectors[sample], exclude_self=True)
+        displacement = np.linalg.norm(projected - expected, axis=1)
+        spread = float(np.sqrt(np.mean(np.sum((coords - coords.mean(axis=0)) ** 2, axis=1))))
+        
+        start = time.perf_counter()
+        for vector in training_vectors[sample[:100]]:
+            projector.transform(vector)
+        projection_ms = (time.perf_counter() - start) / min(100, len(sample)) * 1000
+        
+        projector.stats = {
+            'n_neighbors': projector.n_neighbors,
+            'n_training_vectors': len(training_vectors),
+            'n_evaluated': len(sample),
+            'mean_displacement': float(displacement.mean()),
+            'median_displacement': float(np.median(displacement)),
+            # Displacement relative to the RMS radius of the training embedding
+            'relative_displacement': float(displacement.mean() / spread) if spread > 0 else None,
+            'projection_time_ms': projection_ms
+        }
+        self.projection_3d = projector
+        joblib.dump(projector, self.projection_path)
+        return projector.stats
     
     def transform_2d(self, vectors: np.ndarray) -> np.ndarray:
-        """Transform vectors to 2D using PCA."""
+        """Transform vectors to 2D using PCA (exported arrays when available)."""
+        if self.serving is not None:
+            return self.serving.transform_2d(vectors)
         if self.pca_2d is None:
             raise ValueError("PCA model not fitted. Call fit_pca_2d() first.")
         return self.pca_2d.transform(vectors)
@@ -60,20 +245,147 @@ class EmbeddingReducer:
         """Transform vectors to 3D using UMAP."""
         if self.umap_3d is None:
             raise ValueError("UMAP model not fitted. Call fit_umap_3d() first.")
-        return self.umap_3d.transform(vectors)
+        with _UMAP_LOCK:
+            return self.umap_3d.transform(vectors)
+    
+    def project_3d(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Fast approximate 3D placement for request-time vectors.
+        Uses the neighbour projector when built, otherwise UMAP.transform.
+        """
+        if self.projection_3d is None:
+            return self.transform_3d(vectors)
+        return self.projection_3d.transform(vectors)
 
 
 class CareerEmbedder:
     """
     Creates embeddings for careers using sentence transformers.
+    
+    Career texts are encoded in batches, and text embeddings are cached on
+    disk keyed by the model name and text, so re-running ingestion only
+    encodes new or changed careers. The cache keeps the most recently used
+    max_cache_entries embeddings and is written every flush_every new
+    entries; call save_cache() when done to persist the rest.
     """
     
-    def __init__(self):
-        from sentence_transformers import SentenceTransformer
-
+    def __init__(
+        self,
+        model_name: str = 'all-MiniLM-L6-v2',
+        batch_size: Optional[int] = None,
+        cache_path: Optional[str] = None,
+        encoder=None,
+        max_cache_entries: Optional[int] = None,
+        flush_every: int = 1024
+    ):
+        """
+        Initialize embedder.
+        
+        Args:
+            model_name: SentenceTransformer model (also part of every cache key)
+            batch_size: Texts per encode batch (default: CAREER_EMBED_BATCH_SIZE or 64)
+            cache_path: .npz text-embedding cache (default: model/career_text_embeddings.npz;
+                empty string disables the cache)
+            encoder: Object with SentenceTransformer's encode(); loaded from
+                model_name on first use when omitted
+            max_cache_entries: Cached embeddings kept, least recently used
+                evicted first (default: CAREER_EMBED_CACHE_SIZE or 20000)
+            flush_every: New cache entries that trigger a write of the cache file
+        """
         # Use a lightweight model for faster inference
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model_name = model_name
         self.embedding_dim = 384  # MiniLM output dimension
+        self.batch_size = batch_size or int(os.getenv("CAREER_EMBED_BATCH_SIZE", 64))
+        if cache_path is None:
+            cache_path = str(Path(__file__).resolve().parents[1] / "model" / "career_text_embeddings.npz")
+        self.cache_path = cache_path
+        self.max_cache_entries = max_cache_entries or int(os.getenv("CAREER_EMBED_CACHE_SIZE", 20000))
+        self.flush_every = flush_every
+        self._model = encoder
+        self._cache: 'OrderedDict[str, np.ndarray]' = self._load_cache()
+        self._evict()
+        self._unsaved = 0
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def model(self):
+        """Text encoder, loaded on first access."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+            
+            self._model = SentenceTransformer(self.model_name)
+        return self._model
+    
+    @staticmethod
+    def career_text(career_data: Dict) -> str:
+        """Text that is encoded for a career."""
+        return f"{career_data.get('title', '')} {career_data.get('description', '')}"
+    
+    def cache_key(self, text: str) -> str:
+        """Cache key for a text under the current model."""
+        return hashlib.blake2b(f"{self.model_name}|{text}".encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_cache(self) -> 'OrderedDict[str, np.ndarray]':
+        # Saved least recently used first, so the LRU order survives a reload
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return OrderedDict()
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                return OrderedDict(zip(data['keys'].tolist(), data['vectors']))
+        except (OSError, KeyError, ValueError):
+            return OrderedDict()
+    
+    def _evict(self):
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+    
+    def save_cache(self):
+        """Write the text-embedding cache (atomically replaced)."""
+        if not self.cache_path or not self._cache:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp.npz"
+        np.savez(tmp_path, keys=np.array(list(self._cache)), vectors=np.stack(list(self._cache.values())))
+        os.replace(tmp_path, self.cache_path)
+        self._unsaved = 0
+    
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Text embeddings, encoding only texts missing from the cache.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Array of shape (n_texts, text_dim)
+        """
+        keys = [self.cache_key(text) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in self._cache:
+                self._cache.move_to_end(key)
+            else:
+                missing.setdefault(key, text)
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        
+        if missing:
+            encoded = self.model.encode(
+                list(missing.values()), batch_size=self.batch_size, convert_to_numpy=True
+            )
+            self._cache.update(zip(missing, encoded))
+            self._unsaved += len(missing)
+        
+        if not keys:
+            return np.empty((0, self.embedding_dim))
+        # Stacked before eviction, which may drop rows of this call if it
+        # alone holds more than max_cache_entries texts
+        embeddings = np.stack([self._cache[key] for key in keys])
+        self._evict()
+        if self._unsaved >= self.flush_every:
+            self.save_cache()
+        return embeddings
     
     def embed_career(self, career_data: Dict) -> np.ndarray:
         """
@@ -85,27 +397,28 @@ class CareerEmbedder:
         Returns:
             Combined embedding vector
         """
-        # Combine text description
-        text = f"{career_data.get('title', '')} {career_data.get('description', '')}"
-        
-        # Get text embedding
-        text_embedding = self.model.encode(text, convert_to_numpy=True)
+        return self.embed_batch([career_data])[0]
+    
+    def embed_batch(self, careers: List[Dict]) -> np.ndarray:
+        """
+        Embed multiple careers with batched text encoding.
         
-        # Combine with RIASEC scores (6D) and skills (normalized)
-        riasec = np.array(career_data.get('riasec', [0, 0, 0, 0, 0, 0]))
-        skills = np.array(career_data.get('skills_vector', [0] * 10))  # 10 skill dimensions
+        Args:
+            careers: Career dictionaries (see embed_career)
         
-        # Normalize and combine
-        combined = np.concatenate([
-            text_embedding,  # 384D
-            riasec,          # 6D
-            skills           # 10D
-        ])
+        Returns:
+            Array of combined vectors, one row per career
+        """
+        text_embeddings = self.embed_texts([self.career_text(career) for career in careers])
         
-        return combined
-    
-    def embed_batch(self, careers: List[Dict]) -> np.ndarray:
-        """Embed multiple careers."""
-        embeddings = [self.embed_career(career) for career in careers]
+        # Combine with RIASEC scores (6D) and skills (normalized)
+        embeddings = []
+        for career_data, text_embedding in zip(careers, text_embeddings):
+            riasec = np.array(career_data.get('riasec', [0, 0, 0, 0, 0, 0]))
+            skills = np.array(career_data.get('skills_vector', [0] * 10))  # 10 skill dimensions
+            embeddings.append(np.concatenate([
+                text_embedding,  # 384D
+                riasec,          # 6D
+                skills           # 10D
+            ]))
         return np.array(embeddings)
-
@@ -0,0 +1,44 @@
+"""
+Logging Utilities
+Level-gated logging with per-request sampling of debug output.
+"""
+
+import logging
+import os
+import random
+from contextvars import ContextVar
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fraction of requests that emit debug output when LOG_LEVEL=DEBUG
+DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 1.0))
+
+_debug_sampled: ContextVar[bool] = ContextVar("debug_sampled", default=True)
+
+
+def configure_logging():
+    """Configure the root logger once for the ML engine process."""
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL, logging.INFO),
+        format="%(asctime)s %(levelname)s [%(name)s] %(message)s"
+    )
+    # Numba's JIT logs are far too chatty at DEBUG for request tracing
+    logging.getLogger("numba").setLevel(logging.WARNING)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a module logger."""
+    return logging.getLogger(name)
+
+
+def sample_request_debug(logger: logging.Logger):
+    """
+    Decide once per request whether debug output is emitted.
+    Does nothing unless the logger is enabled for DEBUG.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        _debug_sampled.set(DEBUG_SAMPLE_RATE >= 1.0 or random.random() < DEBUG_SAMPLE_RATE)
+
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """Whether debug output should be produced for the current request."""
+    return logger.isEnabledFor(logging.DEBUG) and _debug_sampled.get()
@@ -1,63 +1,266 @@
 """
 Advanced Clustering Metrics
-Includes Dunn Index and external validation metrics (ARI, NMI, FMI) using pseudo-ground truth.
+Includes Dunn Index, bounded-memory silhouette and external validation metrics (ARI, NMI, FMI) using pseudo-ground truth.
 """
 
+import os
 import numpy as np
-from sklearn.metrics import (
-    adjusted_rand_score,
-    normalized_mutual_info_score,
-    fowlkes_mallows_score
-)
-from typing import Tuple, Optional
+from typing import Any, Dict, Tuple, Optional
+from core.logger import get_logger
 
+logger = get_logger(__name__)
 
-def calculate_dunn_index(vectors: np.ndarray, labels: np.ndarray) -> float:
+
+# Rows per block for the pairwise-distance kernels; a block pair holds
+# DISTANCE_BLOCK_SIZE ** 2 float64 distances (32 MB at 2048).
+DISTANCE_BLOCK_SIZE = 2048
+
+# Clusters larger than this use the sampled diameter in evaluation code paths
+DUNN_SAMPLE_SIZE = 5000
+
+
+def _block_sq_distances(a: np.ndarray, b: np.ndarray, a_sq: np.ndarray, b_sq: np.ndarray) -> np.ndarray:
+    """Squared Euclidean distances between two row blocks (||a||^2 + ||b||^2 - 2ab)."""
+    d2 = a_sq[:, None] + b_sq[None, :] - 2.0 * (a @ b.T)
+    return np.maximum(d2, 0.0, out=d2)
+
+
+def _max_intra_distance(points: np.ndarray, block_size: int = DISTANCE_BLOCK_SIZE) -> float:
+    """Exact diameter of a point set, scanning the upper triangle block by block."""
+    sq_norms = np.einsum('ij,ij->i', points, points)
+    max_d2 = 0.0
+    for i in range(0, len(points), block_size):
+        block_i = points[i:i + block_size]
+        for j in range(i, len(points), block_size):
+            d2 = _block_sq_distances(block_i, points[j:j + block_size], sq_norms[i:i + block_size], sq_norms[j:j + block_size])
+            max_d2 = max(max_d2, float(d2.max()))
+    return float(np.sqrt(max_d2))
+
+
+def _max_distance_from(anchors: np.ndarray, points: np.ndarray, block_size: int = DISTANCE_BLOCK_SIZE) -> Tuple[float, int]:
+    """Largest anchor-to-point distance and the index of the point that attains it."""
+    anchor_sq = np.einsum('ij,ij->i', anchors, anchors)
+    sq_norms = np.einsum('ij,ij->i', points, points)
+    max_d2, farthest = 0.0, 0
+    for a in range(0, len(anchors), block_size):
+        for j in range(0, len(points), block_size):
+            d2 = _block_sq_distances(anchors[a:a + block_size], points[j:j + block_size], anchor_sq[a:a + block_size], sq_norms[j:j + block_size])
+            flat = int(d2.argmax())
+            if d2.flat[flat] > max_d2:
+                max_d2, farthest = float(d2.flat[flat]), j + flat % d2.shape[1]
+    return float(np.sqrt(max_d2)), farthest
+
+
+def _approximate_intra_distance(
+    points: np.ndarray,
+    sample_size: int,
+    rng: np.random.Generator,
+    block_size: int = DISTANCE_BLOCK_SIZE
+) -> float:
+    """
+    Lower bound on a cluster's diameter from sampled anchor points.
+
+    Distances are taken from `sample_size` random anchors to every point in
+    the cluster, then once more from the farthest point found (a double sweep),
+    which usually lands on or very near the true diameter.
+    """
+    anchors = points[rng.choice(len(points), size=sample_size, replace=False)]
+    diameter, farthest = _max_distance_from(anchors, points, block_size)
+    sweep, _ = _max_distance_from(points[farthest:farthest + 1], points, block_size)
+    return max(diameter, sweep)
+
+
+def calculate_dunn_index(
+    vectors: np.ndarray,
+    labels: np.ndarray,
+    sample_size: Optional[int] = None,
+    block_size: int = DISTANCE_BLOCK_SIZE,
+    random_state: int = 42
+) -> float:
     """
     Calculate Dunn Index - ratio of minimum inter-cluster distance to maximum intra-cluster distance.
     Higher values indicate better clustering.
-    
+
+    Inter-cluster distance is measured between cluster centers; intra-cluster
+    distance is the largest distance between two points of the same cluster,
+    computed on blocked pairwise-distance kernels so memory stays bounded
+    by block_size ** 2 regardless of n.
+
     Args:
         vectors: Feature vectors (n_samples, n_features)
         labels: Cluster assignments (n_samples,)
-    
+        sample_size: If set, clusters larger than this use the sampled
+            approximation (O(sample_size * n) instead of O(n^2)); the
+            diameter can only be underestimated, so the index can only
+            be overestimated. None computes the exact index.
+        block_size: Rows per block in the distance kernels
+        random_state: Seed for the anchor sample
+
     Returns:
         Dunn Index value
     """
-    if len(np.unique(labels)) < 2:
+    vectors = np.asarray(vectors, dtype=np.float64)
+    cluster_ids, inverse = np.unique(labels, return_inverse=True)
+    if len(cluster_ids) < 2:
         return 0.0
-    
-    n_clusters = len(np.unique(labels))
-    clusters = [vectors[labels == i] for i in range(n_clusters)]
-    
-    # Calculate minimum inter-cluster distance
-    min_inter_cluster_dist = float('inf')
-    for i in range(n_clusters):
-        for j in range(i + 1, n_clusters):
-            if len(clusters[i]) > 0 and len(clusters[j]) > 0:
-                # Distance between cluster centers
-                center_i = np.mean(clusters[i], axis=0)
-                center_j = np.mean(clusters[j], axis=0)
-                dist = np.linalg.norm(center_i - center_j)
-                min_inter_cluster_dist = min(min_inter_cluster_dist, dist)
-    
-    # Calculate maximum intra-cluster distance
+
+    # Group rows by cluster once; cluster c is sorted_vectors[bounds[c]:bounds[c + 1]]
+    counts = np.bincount(inverse)
+    bounds = np.concatenate([[0], np.cumsum(counts)])
+    sorted_vectors = vectors[np.argsort(inverse, kind='stable')]
+
+    # Minimum inter-cluster distance between cluster centers
+    centers = np.add.reduceat(sorted_vectors, bounds[:-1], axis=0) / counts[:, None]
+    center_sq = np.einsum('ij,ij->i', centers, centers)
+    center_dists = np.sqrt(_block_sq_distances(centers, centers, center_sq, center_sq))
+    min_inter_cluster_dist = float(center_dists[np.triu_indices(len(cluster_ids), k=1)].min())
+
+    # Maximum intra-cluster distance (cluster diameter)
+    rng = np.random.default_rng(random_state)
     max_intra_cluster_dist = 0.0
-    for i in range(n_clusters):
-        if len(clusters[i]) > 1:
-            # Maximum distance between points in same cluster
-            for k in range(len(clusters[i])):
-                for l in range(k + 1, len(clusters[i])):
-                    dist = np.linalg.norm(clusters[i][k] - clusters[i][l])
-                    max_intra_cluster_dist = max(max_intra_cluster_dist, dist)
-    
+    for c in range(len(cluster_ids)):
+        points = sorted_vectors[bounds[c]:bounds[c + 1]]
+        if len(points) < 2:
+            continue
+        if sample_size is not None and len(points) > sample_size:
+            diameter = _approximate_intra_distance(points, sample_size, rng, block_size)
+        else:
+            diameter = _max_intra_distance(points, block_size)
+        max_intra_cluster_dist = max(max_intra_cluster_dist, diameter)
+
     if max_intra_cluster_dist == 0:
         return 0.0
-    
+
     return min_inter_cluster_dist / max_intra_cluster_dist
 
 
-def create_riasec_ground_truth(students_data: list) -> Optional[np.ndarray]:
+# Silhouette is O(n^2): above this many samples it is estimated on a seeded
+# uniform sample of this size instead (same approach as sklearn's sample_size).
+SILHOUETTE_SAMPLE_SIZE = int(os.getenv("SILHOUETTE_SAMPLE_SIZE", 10000))
+
+
+def get_silhouette_mode(n_samples: int, sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE) -> str:
+    """'sampled' if calculate_silhouette will subsample n_samples rows, else 'exact'."""
+    return 'sampled' if sample_size is not None and n_samples > sample_size else 'exact'
+
+
+def _chunked_silhouette(vectors: np.ndarray, labels: np.ndarray, block_size: int = DISTANCE_BLOCK_SIZE) -> float:
+    """
+    Exact mean silhouette coefficient without materializing the distance matrix.
+
+    Each row block accumulates its distance sums to every cluster one
+    column block at a time, so memory stays at block_size ** 2 distances.
+    """
+    cluster_ids, inverse = np.unique(labels, return_inverse=True)
+    n_clusters = len(cluster_ids)
+    if not 2 <= n_clusters <= len(vectors) - 1:
+        raise ValueError(f"Number of labels is {n_clusters}. Valid values are 2 to n_samples - 1 (inclusive)")
+
+    counts = np.bincount(inverse).astype(np.float64)
+    membership = np.eye(n_clusters)[inverse]
+    sq_norms = np.einsum('ij,ij->i', vectors, vectors)
+    coefficients = np.empty(len(vectors))
+    for i in range(0, len(vectors), block_size):
+        rows = slice(i, i + block_size)
+        cluster_sums = np.zeros((len(vectors[rows]), n_clusters))
+        for j in range(0, len(vectors), block_size):
+            cols = slice(j, j + block_size)
+            d = np.sqrt(_block_sq_distances(vectors[rows], vectors[cols], sq_norms[rows], sq_norms[cols]))
+            if i == j:
+                np.fill_diagonal(d, 0.0)
+            cluster_sums += d @ membership[cols]
+
+        own = inverse[rows]
+        own_counts = counts[own]
+        # Mean distance to the rest of the own cluster (a) and to the nearest other cluster (b)
+        a = cluster_sums[np.arange(len(own)), own] / np.maximum(own_counts - 1, 1)
+        other_means = cluster_sums / counts
+        other_means[np.arange(len(own)), own] = np.inf
+        b = other_means.min(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            s = (b - a) / np.maximum(a, b)
+        # Singleton clusters score 0, as in sklearn
+        coefficients[rows] = np.where(own_counts > 1, np.nan_to_num(s), 0.0)
+    return float(np.mean(coefficients))
+
+
+def calculate_silhouette(
+    vectors: np.ndarray,
+    labels: np.ndarray,
+    sample_size: Optional[int] = SILHOUETTE_SAMPLE_SIZE,
+    random_state: int = 42,
+    block_size: int = DISTANCE_BLOCK_SIZE
+) -> Dict[str, Any]:
+    """
+    Calculate the mean silhouette coefficient with bounded time and memory.
+
+    Args:
+        vectors: Feature vectors (n_samples, n_features)
+        labels: Cluster assignments (n_samples,)
+        sample_size: Above this many samples, score a seeded uniform sample
+            of this size; None always computes the exact (chunked) value
+        random_state: Seed for the sample
+        block_size: Rows per block in the distance kernels
+
+    Returns:
+        {'value': silhouette, 'mode': 'exact' or 'sampled', 'n_samples': rows scored}
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    labels = np.asarray(labels)
+    mode = get_silhouette_mode(len(vectors), sample_size)
+    if mode == 'sampled':
+        indices = np.random.default_rng(random_state).choice(len(vectors), size=sample_size, replace=False)
+        vectors, labels = vectors[indices], labels[indices]
+    return {
+        'value': _chunked_silhouette(vectors, labels, block_size),
+        'mode': mode,
+        'n_samples': len(vectors)
+    }
+
+
+def _has_riasec_prefix(vector) -> bool:
+    """Whether a stored vector is long enough to carry the six RIASEC values."""
+    return isinstance(vector, (list, np.ndarray)) and len(vector) >= 6
+
+
+def _dominant_riasec_from_fields(student: dict) -> Optional[int]:
+    """
+    Dominant RIASEC dimension from riasec_vector or riasec_profile.
+    Used for students whose combined_vector is missing or all-zero in RIASEC.
+    """
+    # PRIORITY 2: riasec_vector
+    riasec_vec = student.get('riasec_vector')
+    if _has_riasec_prefix(riasec_vec):
+        riasec_values = np.array(riasec_vec[:6])
+        if np.sum(riasec_values) > 0:
+            return int(np.argmax(riasec_values))
+
+    # PRIORITY 3: riasec_profile (dict format)
+    riasec = None
+    if 'riasec_profile' in student:
+        riasec = student['riasec_profile']
+    elif 'profile' in student and isinstance(student['profile'], dict):
+        riasec = student['profile'].get('riasec_profile')
+
+    if isinstance(riasec, dict):
+        riasec_values = np.array([
+            float(riasec.get('R', riasec.get('r', 0))),
+            float(riasec.get('I', riasec.get('i', 0))),
+            float(riasec.get('A', riasec.get('a', 0))),
+            float(riasec.get('S', riasec.get('s', 0))),
+            float(riasec.get('E', riasec.get('e', 0))),
+            float(riasec.get('C', riasec.get('c', 0)))
+        ])
+    elif _has_riasec_prefix(riasec):
+        riasec_values = np.array(riasec[:6])
+    else:
+        return None
+    if np.sum(riasec_values) > 0:
+        return int(np.argmax(riasec_values))
+    return None
+
+
+def create_riasec_ground_truth(students_data: list, student_vectors: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
     """
     Create pseudo-ground truth labels based on dominant RIASEC dimension.
     This allows us to calculate external validation metrics.
@@ -67,87 +270,63 @@ def create_riasec_ground_truth(students_data: list) -> Optional[np.ndarray]:
     2. riasec_vector - Direct RIASEC vector
     3. riasec_profile - Dict format
     
+    Priority 1 is resolved for all students at once with a single argmax over
+    the student matrix; the per-student dictionary lookups only run for rows
+    without a usable combined vector.
+    
     Args:
         students_data: List of student dictionaries with riasec_profile
+        student_vectors: Optional combined-vector matrix already built from
+            students_data (one row per student, first 6 columns are RIASEC)
     
     Returns:
         Ground truth labels array or None
     """
     if not students_data:
-        print("[METRICS] No students data provided")
+        logger.warning("[METRICS] No students data provided")
         return None
     
-    labels = []
-    valid_count = 0
-    skipped_count = 0
+    n_students = len(students_data)
+    if student_vectors is not None:
+        student_vectors = np.asarray(student_vectors)
+        if len(student_vectors) != n_students or student_vectors.ndim != 2 or student_vectors.shape[1] < 6:
+            raise ValueError("student_vectors must have one row per student and at least 6 columns")
+        rows = np.arange(n_students)
+        riasec_matrix = student_vectors[:, :6]
+    else:
+        rows = np.array(
+            [idx for idx, student in enumerate(students_data) if _has_riasec_prefix(student.get('combined_vector'))],
+            dtype=np.intp
+        )
+        riasec_matrix = np.array(
+            [students_data[idx]['combined_vector'][:6] for idx in rows], dtype=np.float64
+        ).reshape(len(rows), 6)
     
-    for idx, student in enumerate(students_data):
-        riasec_values = None
-        
-        # PRIORITY 1: combined_vector (first 6 elements are RIASEC: R, I, A, S, E, C)
-        if 'combined_vector' in student:
-            combined_vec = student['combined_vector']
-            if isinstance(combined_vec, (list, np.ndarray)) and len(combined_vec) >= 6:
-                riasec_values = np.array(combined_vec[:6])
-                if np.sum(riasec_values) > 0:  # Check not all zeros
-                    dominant_idx = int(np.argmax(riasec_values))
-                    labels.append(dominant_idx)
-                    valid_count += 1
-                    continue
-        
-        # PRIORITY 2: riasec_vector
-        if 'riasec_vector' in student:
-            riasec_vec = student['riasec_vector']
-            if isinstance(riasec_vec, (list, np.ndarray)) and len(riasec_vec) >= 6:
-                riasec_values = np.array(riasec_vec[:6])
-                if np.sum(riasec_values) > 0:
-                    dominant_idx = int(np.argmax(riasec_values))
-                    labels.append(dominant_idx)
-                    valid_count += 1
-                    continue
-        
-        # PRIORITY 3: riasec_profile (dict format)
-        riasec = None
-        if 'riasec_profile' in student:
-            riasec = student['riasec_profile']
-        elif 'profile' in student and isinstance(student['profile'], dict):
-            riasec = student['profile'].get('riasec_profile')
-        
-        if riasec is not None:
-            if isinstance(riasec, dict):
-                riasec_values = np.array([
-                    float(riasec.get('R', riasec.get('r', 0))),
-                    float(riasec.get('I', riasec.get('i', 0))),
-                    float(riasec.get('A', riasec.get('a', 0))),
-                    float(riasec.get('S', riasec.get('s', 0))),
-                    float(riasec.get('E', riasec.get('e', 0))),
-                    float(riasec.get('C', riasec.get('c', 0)))
-                ])
-                if np.sum(riasec_values) > 0:
-                    dominant_idx = int(np.argmax(riasec_values))
-                    labels.append(dominant_idx)
-                    valid_count += 1
-                    continue
-            elif isinstance(riasec, (list, np.ndarray)) and len(riasec) >= 6:
-                riasec_values = np.array(riasec[:6])
-                if np.sum(riasec_values) > 0:
-                    dominant_idx = int(np.argmax(riasec_values))
-                    labels.append(dominant_idx)
-                    valid_count += 1
-                    continue
+    # PRIORITY 1: combined_vector (first 6 elements are RIASEC: R, I, A, S, E, C)
+    labels = np.full(n_students, -1, dtype=np.intp)
+    has_riasec = riasec_matrix.sum(axis=1) > 0  # Check not all zeros
+    labels[rows[has_riasec]] = np.argmax(riasec_matrix[has_riasec], axis=1)
+    
+    # PRIORITY 2/3 only for the remaining rows
+    skipped_count = 0
+    for idx in np.flatnonzero(labels < 0):
+        dominant_idx = _dominant_riasec_from_fields(students_data[idx])
+        if dominant_idx is not None:
+            labels[idx] = dominant_idx
+            continue
         
         # If we get here, couldn't extract RIASEC
         skipped_count += 1
-        if idx < 3:  # Only log first 3 for debugging
-            print(f"[METRICS] Student {idx} missing RIASEC. Keys: {list(student.keys())[:10]}")
+        if skipped_count <= 3:  # Only log first 3 for debugging
+            logger.debug("[METRICS] Student %d missing RIASEC. Keys: %s", idx, list(students_data[idx].keys())[:10])
     
+    valid_count = n_students - skipped_count
     if valid_count == 0:
-        print(f"[METRICS] ❌ No valid RIASEC data found in {len(students_data)} students")
-        print(f"[METRICS] Skipped: {skipped_count}, Valid: {valid_count}")
+        logger.warning("[METRICS] No valid RIASEC data found in %d students", n_students)
         return None
     
-    print(f"[METRICS] ✅ Created ground truth from {valid_count}/{len(students_data)} students (skipped {skipped_count})")
-    return np.array(labels)
+    logger.debug("[METRICS] Created ground truth from %d/%d students (skipped %d)", valid_count, n_students, skipped_count)
+    return labels[labels >= 0]
 
 
 def calculate_external_metrics(
@@ -164,6 +343,8 @@ def calculate_external_metrics(
     Returns:
         Dictionary with ARI, NMI, FMI scores
     """
+    from sklearn.metrics import adjusted_rand_score, normalized_mutual_info_score, fowlkes_mallows_score
+
     try:
         ari = adjusted_rand_score(ground_truth_labels, predicted_labels)
         nmi = normalized_mutual_info_score(ground_truth_labels, predicted_labels)
@@ -175,7 +356,7 @@ def calculate_external_metrics(
             'fowlkes_mallows_index': float(fmi)
         }
     except Exception as e:
-        print(f"Error calculating external metrics: {e}")
+        logger.warning("Error calculating external metrics: %s", e)
         return {
             'adjusted_rand_index': None,
             'normalized_mutual_info': None,
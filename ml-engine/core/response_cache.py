@@ -0,0 +1,93 @@
+"""
+Response Cache
+Bounded LRU cache with TTL for deterministic endpoint responses.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache whose entries expire after a fixed TTL.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Maximum number of entries (0 disables caching)
+            ttl_seconds: Seconds an entry stays valid after it is stored
+            clock: Monotonic time source in seconds (injectable for tests)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(payload: Dict[str, Any], version: str = "") -> str:
+        """
+        Build a canonical key for a JSON-serializable payload.
+
+        Args:
+            payload: Request fields that determine the response
+            version: Model/catalog version stamp the response depends on
+
+        Returns:
+            Hex digest that is identical for equal payloads regardless of key order
+        """
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+        return hashlib.blake2b(f"{version}|{canonical}".encode('utf-8'), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < self._clock():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store value under key, evicting the least recently used entry if full."""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries (e.g. after a model or catalog change)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit/miss counters."""
+        return {
+            "enabled": self.max_size > 0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,133 @@
+"""
+Serving Artifact Module
+Plain NumPy export of the PCA and centroid models used on the request path.
+"""
+
+import os
+from typing import List, Optional
+
+import numpy as np
+
+SERVING_ARTIFACT_NAME = "serving_model.npz"
+
+
+def file_signature(path: str) -> Optional[str]:
+    """Modification time and size of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class ServingArtifact:
+    """
+    PCA mean/components and active cluster centroids as plain arrays.
+
+    Serving only needs these, so transforms are one subtract and one matmul
+    and loading reads a few small arrays instead of unpickling sklearn
+    objects. Each part records the signature of the joblib file it was
+    exported from, so a model retrained without re-exporting is detected
+    and the engine falls back to the joblib models.
+    """
+
+    def __init__(
+        self,
+        pca_mean: np.ndarray,
+        pca_components: np.ndarray,
+        centroids: np.ndarray,
+        cluster_names: List[str],
+        algorithm: str,
+        best_algorithm: Optional[str] = None,
+        pca_signature: Optional[str] = None,
+        model_signature: Optional[str] = None
+    ):
+        """
+        Initialize artifact.
+
+        Args:
+            pca_mean: PCA mean vector (n_features,)
+            pca_components: PCA projection (2, n_features), whitening folded in
+            centroids: Centers of the active clustering model (n_clusters, n_features)
+            cluster_names: Display names indexed by cluster id
+            algorithm: Active clustering algorithm the centroids belong to
+            best_algorithm: Selected algorithm saved with the clustering model
+            pca_signature: file_signature() of pca_2d.joblib at export
+            model_signature: file_signature() of clustering_model.joblib at export
+        """
+        self.pca_mean = np.ascontiguousarray(pca_mean, dtype=np.float64)
+        self.pca_components = np.ascontiguousarray(pca_components, dtype=np.float64)
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float64)
+        self.cluster_names = list(cluster_names)
+        self.algorithm = algorithm
+        self.best_algorithm = best_algorithm
+        self.pca_signature = pca_signature
+        self.model_signature = model_signature
+
+    @classmethod
+    def from_models(cls, clusterer, reducer) -> 'ServingArtifact':
+        """
+        Export the fitted models of a StudentClusterer and EmbeddingReducer.
+
+        Args:
+            clusterer: Fitted and saved StudentClusterer
+            reducer: EmbeddingReducer with a fitted and saved PCA
+
+        Returns:
+            ServingArtifact for the active clustering algorithm
+        """
+        pca = reducer.pca_2d
+        if pca is None:
+            raise ValueError("PCA model not fitted. Call fit_pca_2d() first.")
+        components = pca.components_
+        if getattr(pca, 'whiten', False):
+            components = components / np.sqrt(pca.explained_variance_)[:, np.newaxis]
+        return cls(
+            pca_mean=pca.mean_,
+            pca_components=components,
+            centroids=clusterer.get_cluster_centers(),
+            cluster_names=clusterer.cluster_names,
+            algorithm=clusterer.get_active_algorithm(),
+            best_algorithm=clusterer.best_algorithm,
+            pca_signature=file_signature(reducer.pca_path),
+            model_signature=file_signature(clusterer.model_path)
+        )
+
+    def save(self, path: str):
+        """Write the artifact as an uncompressed .npz (atomically replaced)."""
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            pca_mean=self.pca_mean,
+            pca_components=self.pca_components,
+            centroids=self.centroids,
+            cluster_names=np.array(self.cluster_names, dtype=str),
+            algorithm=np.array(self.algorithm),
+            best_algorithm=np.array(self.best_algorithm or ''),
+            pca_signature=np.array(self.pca_signature or ''),
+            model_signature=np.array(self.model_signature or '')
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional['ServingArtifact']:
+        """Load an artifact, or None if the file is missing or unreadable."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return cls(
+                    pca_mean=data['pca_mean'],
+                    pca_components=data['pca_components'],
+                    centroids=data['centroids'],
+                    cluster_names=[str(name) for name in data['cluster_names']],
+                    algorithm=str(data['algorithm']),
+                    best_algorithm=str(data['best_algorithm']) or None,
+                    pca_signature=str(data['pca_signature']) or None,
+                    model_signature=str(data['model_signature']) or None
+                )
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def transform_2d(self, vectors: np.ndarray) -> np.ndarray:
+        """Project vectors to 2D exactly like the exported PCA."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+        return (vectors - self.pca_mean) @ self.pca_components.T
@@ -4,8 +4,106 @@ Computes cosine similarity between user and career vectors.
 """
 
 import numpy as np
-from typing import List, Dict, Tuple
-from sklearn.metrics.pairwise import cosine_similarity
+from typing import List, Dict, Tuple, Optional, Union
+from core.career_store import CareerStore
+from core.logger import get_logger, debug_enabled
+
+logger = get_logger(__name__)
+
+
+# Comprehensive skill name mapping for matching career skills to user skills
+SKILL_NAME_MAPPING = {
+    'programming': ['programming', 'coding', 'python', 'java', 'javascript', 'software development', 'development'],
+    'problem_solving': ['problem_solving', 'problem solving', 'algorithms', 'data structures', 'logical thinking', 'critical thinking'],
+    'communication': ['communication', 'writing', 'verbal communication', 'presentation', 'interpersonal', 'people skills', 'patience', 'teaching', 'subject knowledge', 'people'],
+    'creativity': ['creativity', 'creative', 'innovation', 'creative thinking', 'content creation', 'content'],
+    'leadership': ['leadership', 'management', 'team management', 'organization', 'organizational', 'strategy', 'strategic', 'organizing'],
+    'analytical': ['analytical', 'analytical thinking', 'data analysis', 'machine learning', 'analytics', 'statistical analysis', 'marketing', 'market'],
+    'mathematics': ['mathematics', 'math', 'statistics', 'quantitative'],
+    'design': ['design', 'prototyping', 'ui/ux', 'user experience', 'ux'],
+    'research': ['research', 'user research', 'data research', 'psychology', 'empathy', 'psychological'],
+    'teamwork': ['teamwork', 'team work', 'collaboration', 'working in teams', 'collaborative']
+}
+
+# Canonical user skill keys, in questionnaire order
+DEFAULT_SKILL_KEYS = tuple(SKILL_NAME_MAPPING.keys())
+
+# Upper bound on memoized resolution tables for non-canonical skill key sets
+MAX_SKILL_KEY_TABLES = 64
+
+# Users scored per matrix product in batch ranking, bounding the
+# (users x careers) score block for school-wide batches
+BATCH_BLOCK_SIZE = 256
+
+
+def _normalize_skill_name(name: str) -> str:
+    """Normalize a skill name to snake_case for matching."""
+    return name.lower().strip().replace(' ', '_').replace('-', '_').replace('/', '_')
+
+
+# Variations pre-normalized once: (user_key, [(normalized, lowercase, words)])
+_SKILL_VARIATIONS = [
+    (
+        user_key,
+        [
+            (variation.lower().replace(' ', '_').replace('-', '_').replace('/', '_'),
+             variation.lower(),
+             variation.lower().split())
+            for variation in variations
+        ]
+    )
+    for user_key, variations in SKILL_NAME_MAPPING.items()
+]
+
+
+def _domain_key(domain: str) -> str:
+    """Normalize a domain name for case-insensitive filtering."""
+    return str(domain).strip().lower()
+
+
+def resolve_skill_key(career_skill_name: str, user_skill_keys: Tuple[str, ...]) -> Optional[str]:
+    """
+    Find the matching user skill key for a career skill name.
+    
+    Args:
+        career_skill_name: Skill name as listed on the career
+        user_skill_keys: Skill keys available in the user's profile
+    
+    Returns:
+        Matching user skill key, or None if the skill was not assessed
+    """
+    normalized = _normalize_skill_name(career_skill_name)
+    
+    # Direct match first
+    if normalized in user_skill_keys:
+        return normalized
+    
+    normalized_words = normalized.split('_')
+    for user_key, variations in _SKILL_VARIATIONS:
+        if user_key not in user_skill_keys:
+            continue
+        
+        # Check if normalized name matches any variation exactly
+        for var_normalized, _, _ in variations:
+            if normalized == var_normalized:
+                return user_key
+        
+        # Check if normalized name contains or is contained in any variation
+        for var_normalized, _, _ in variations:
+            if normalized in var_normalized or var_normalized in normalized:
+                return user_key
+        
+        # Check if any variation word is in the normalized name
+        for _, var_lower, var_words in variations:
+            if any(word in normalized for word in var_words) or any(word in var_lower for word in normalized_words):
+                return user_key
+    
+    # Try partial match with user skill keys
+    for user_key in user_skill_keys:
+        if normalized in user_key or user_key in normalized:
+            return user_key
+    
+    return None
 
 
 class SimilarityEngine:
@@ -13,8 +111,315 @@ class SimilarityEngine:
     Computes similarity scores between user profiles and careers.
     """
     
-    def __init__(self):
-        pass
+    def __init__(self, ann_cells: int = 0, ann_probe: int = 4):
+        """
+        Initialize similarity engine.
+        
+        Args:
+            ann_cells: Number of IVF cells for approximate career search
+                (0 disables the index and always scores the full catalog)
+            ann_probe: Number of closest cells scanned per query (>= 1);
+                higher values trade latency for recall
+        """
+        self.ann_cells = ann_cells
+        self.ann_probe = self._check_probe(ann_probe)
+        # Dimension of the user vectors queried against the IVF index
+        self.query_dim: Optional[int] = None
+        self.careers = CareerStore()
+        # Catalog object last passed to set_careers (for identity checks)
+        self._source: Optional[Union[CareerStore, List[Dict]]] = None
+        # Careers are grouped by embedding length so mixed catalogs keep the
+        # per-pair trimming semantics of compute_similarity(). Within a group
+        # rows are ordered by domain so every domain is a contiguous slice.
+        self._groups: List[Dict] = []
+        self.domains: List[str] = []
+        # user skill keys -> {career skill name -> user skill key or None}
+        self._skill_key_tables: Dict[Tuple[str, ...], Dict[str, Optional[str]]] = {}
+    
+    def set_careers(self, careers: Union[CareerStore, List[Dict]], query_dim: Optional[int] = None):
+        """
+        Build the scoring matrices for a career catalog.
+        
+        Args:
+            careers: CareerStore, or list of career dictionaries with
+                'embedding' key (converted to a CareerStore)
+            query_dim: Dimension of the user vectors that will be queried;
+                the IVF index is only built for it (defaults to each
+                group's full embedding length)
+        """
+        source = careers
+        if not isinstance(careers, CareerStore):
+            careers = CareerStore(careers)
+        
+        domains: List[str] = []
+        rows_by_dim: Dict[int, Dict[str, List[int]]] = {}
+        for idx, record in enumerate(careers):
+            dim = int(careers.dims[idx])
+            if dim == 0:
+                continue
+            domain = record.domain
+            if domain not in domains:
+                domains.append(domain)
+            rows_by_dim.setdefault(dim, {}).setdefault(_domain_key(domain), []).append(idx)
+        
+        groups = []
+        for dim, rows_by_domain in rows_by_dim.items():
+            indices = []
+            domain_slices = {}
+            for domain_key, domain_rows in rows_by_domain.items():
+                domain_slices[domain_key] = (len(indices), len(indices) + len(domain_rows))
+                indices.extend(domain_rows)
+            groups.append({
+                'dim': dim,
+                'indices': np.array(indices, dtype=np.intp),
+                'domain_slices': domain_slices,  # domain key -> (start, end) rows
+                'normalized': {},  # trimmed dim -> L2-normalized matrix
+                'ann': {}  # trimmed dim -> IVF index
+            })
+        
+        self.careers = careers
+        self._source = source
+        self._groups = groups
+        self.domains = domains
+        self.query_dim = query_dim
+        if self.ann_cells > 0:
+            self.build_ann_index(query_dim)
+        self._skill_key_tables = {DEFAULT_SKILL_KEYS: self._compile_skill_keys(careers, DEFAULT_SKILL_KEYS)}
+    
+    @staticmethod
+    def _compile_skill_keys(careers: CareerStore, user_skill_keys: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+        """Resolve every career skill name in the catalog to a user skill key."""
+        table: Dict[str, Optional[str]] = {}
+        for record in careers:
+            for skill_name in record.skills:
+                if skill_name not in table:
+                    table[skill_name] = resolve_skill_key(skill_name, user_skill_keys)
+        return table
+    
+    def _skill_key_table(self, user_skill_keys: Tuple[str, ...]) -> Dict[str, Optional[str]]:
+        """Get the memoized resolution table for a set of user skill keys."""
+        table = self._skill_key_tables.get(user_skill_keys)
+        if table is None:
+            if len(self._skill_key_tables) >= MAX_SKILL_KEY_TABLES:
+                self._skill_key_tables = {
+                    DEFAULT_SKILL_KEYS: self._skill_key_tables.get(DEFAULT_SKILL_KEYS, {})
+                }
+            table = {}
+            self._skill_key_tables[user_skill_keys] = table
+        return table
+    
+    def _normalized_matrix(self, group: Dict, dim: int) -> np.ndarray:
+        """Get the group's float32 rows trimmed to `dim` columns and L2-normalized."""
+        normalized = group['normalized'].get(dim)
+        if normalized is None:
+            trimmed = self.careers.rows(group['indices'], dim)
+            norms = np.linalg.norm(trimmed, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            trimmed /= norms
+            normalized = np.ascontiguousarray(trimmed)
+            group['normalized'][dim] = normalized
+        return normalized
+    
+    def build_ann_index(self, query_dim: Optional[int] = None):
+        """
+        Partition career vectors into IVF cells with KMeans.
+        
+        Args:
+            query_dim: Dimension of the user vectors that will be queried
+                (defaults to each group's full embedding length)
+        """
+        for group in self._groups:
+            dim = min(query_dim, group['dim']) if query_dim else group['dim']
+            group['ann'][dim] = self._build_ann_index(self._normalized_matrix(group, dim))
+    
+    def _build_ann_index(self, normalized: np.ndarray) -> Optional[Dict]:
+        """Cluster normalized career rows into cells stored as contiguous blocks."""
+        n_cells = min(self.ann_cells, len(normalized))
+        if n_cells < 2:
+            return None
+        from sklearn.cluster import KMeans
+        
+        kmeans = KMeans(
+            n_clusters=n_cells,
+            init='k-means++',
+            n_init=1,
+            max_iter=100,
+            random_state=42
+        )
+        labels = kmeans.fit_predict(normalized)
+        centroids = kmeans.cluster_centers_
+        centroid_norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroid_norms[centroid_norms == 0] = 1.0
+        
+        order = np.argsort(labels, kind='stable')
+        offsets = np.zeros(n_cells + 1, dtype=np.intp)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=n_cells))
+        return {
+            'centroids': np.ascontiguousarray(centroids / centroid_norms),
+            'order': order,
+            'offsets': offsets,
+            'matrix': np.ascontiguousarray(normalized[order])
+        }
+    
+    @staticmethod
+    def _ann_index(group: Dict, dim: int) -> Optional[Dict]:
+        """
+        Get the group's IVF index for a query dimension, or None.
+        Indexes are only built by set_careers()/build_ann_index(), never on the
+        request path; queries of another dimension are scored exactly.
+        """
+        return group['ann'].get(dim)
+    
+    @staticmethod
+    def _check_probe(n_probe: int) -> int:
+        """Validate an IVF probe count."""
+        if n_probe < 1:
+            raise ValueError(f"n_probe must be at least 1, got {n_probe}")
+        return n_probe
+    
+    @staticmethod
+    def _domain_keys(domains: Optional[Union[str, List[str]]]) -> Optional[List[str]]:
+        """Normalize a domain filter (one name or a list) to lookup keys."""
+        if domains is None:
+            return None
+        if isinstance(domains, str):
+            domains = [domains]
+        return list(dict.fromkeys(_domain_key(domain) for domain in domains))
+    
+    def _partitions(self, group: Dict, dim: int, domain_keys: Optional[List[str]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """(career indices, normalized rows) for each requested domain partition of a group."""
+        normalized = self._normalized_matrix(group, dim)
+        if domain_keys is None:
+            return [(group['indices'], normalized)]
+        partitions = []
+        for key in domain_keys:
+            if key in group['domain_slices']:
+                start, end = group['domain_slices'][key]
+                partitions.append((group['indices'][start:end], normalized[start:end]))
+        return partitions
+    
+    def score_careers(
+        self,
+        user_vector: np.ndarray,
+        n_probe: Optional[int] = None,
+        exact: bool = False,
+        domains: Optional[Union[str, List[str]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score indexed careers against a user vector.
+        
+        With the IVF index enabled only careers in the `n_probe` closest
+        cells are scored, so the result may be a subset of the catalog.
+        Domain-filtered queries score their partitions exactly.
+        
+        Args:
+            user_vector: User profile vector (1D array)
+            n_probe: Cells to scan (defaults to ann_probe)
+            exact: Score the full catalog even if the IVF index is enabled
+            domains: Domain name or list of names to restrict scoring to
+        
+        Returns:
+            Tuple of (career indices, cosine similarity scores)
+        """
+        user_vector = np.asarray(user_vector, dtype=np.float64).ravel()
+        if exact or self.ann_cells <= 0 or domains is not None:
+            indices, scores = self.score_careers_batch(user_vector.reshape(1, -1), domains=domains)
+            return indices, scores[0]
+        
+        n_probe = self.ann_probe if n_probe is None else self._check_probe(n_probe)
+        all_indices = []
+        all_scores = []
+        for group in self._groups:
+            dim = min(user_vector.shape[0], group['dim'])
+            user_trimmed = user_vector[:dim]
+            user_norm = np.linalg.norm(user_trimmed)
+            user_unit = (user_trimmed / user_norm if user_norm > 0 else user_trimmed).astype(np.float32)
+            
+            index = self._ann_index(group, dim)
+            if index is None or n_probe >= len(index['centroids']):
+                all_indices.append(group['indices'])
+                all_scores.append(self._normalized_matrix(group, dim) @ user_unit)
+                continue
+            
+            cell_scores = index['centroids'] @ user_unit
+            probe = np.argpartition(-cell_scores, n_probe - 1)[:n_probe]
+            offsets = index['offsets']
+            rows = np.concatenate([np.arange(offsets[c], offsets[c + 1]) for c in probe])
+            all_indices.append(group['indices'][index['order'][rows]])
+            all_scores.append(index['matrix'][rows] @ user_unit)
+        
+        if not all_indices:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float32)
+        if len(all_indices) == 1:
+            return all_indices[0], all_scores[0]
+        return np.concatenate(all_indices), np.concatenate(all_scores)
+    
+    def score_careers_batch(
+        self,
+        user_vectors: np.ndarray,
+        domains: Optional[Union[str, List[str]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score indexed careers against many user vectors at once.
+        
+        Args:
+            user_vectors: User profile vectors (n_users, n_features)
+            domains: Domain name or list of names to restrict scoring to
+        
+        Returns:
+            Tuple of (career indices, scores of shape (n_users, n_careers))
+        """
+        user_vectors = np.atleast_2d(np.asarray(user_vectors, dtype=np.float64))
+        domain_keys = self._domain_keys(domains)
+        all_indices = []
+        all_scores = []
+        for group in self._groups:
+            dim = min(user_vectors.shape[1], group['dim'])
+            users_trimmed = user_vectors[:, :dim]
+            user_norms = np.linalg.norm(users_trimmed, axis=1, keepdims=True)
+            user_norms[user_norms == 0] = 1.0
+            users_unit = (users_trimmed / user_norms).astype(np.float32)
+            for indices, rows in self._partitions(group, dim, domain_keys):
+                all_indices.append(indices)
+                all_scores.append(users_unit @ rows.T)
+        
+        if not all_indices:
+            return np.empty(0, dtype=np.intp), np.empty((user_vectors.shape[0], 0), dtype=np.float32)
+        if len(all_indices) == 1:
+            return all_indices[0], all_scores[0]
+        return np.concatenate(all_indices), np.concatenate(all_scores, axis=1)
+    
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int, keys: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Positions of the top-k scores in descending order (row-wise for 2D).
+        
+        Args:
+            scores: Scores of shape (n,) or (n_users, n)
+            top_k: Number of positions to return
+            keys: Tie-breakers of shape (n,), ascending (defaults to position);
+                pass catalog rows so ties rank in catalog order
+        
+        Returns:
+            Positions into the last axis of `scores`
+        """
+        scores = np.asarray(scores)
+        n = scores.shape[-1]
+        top_k = min(max(top_k, 0), n)
+        if top_k == 0:
+            return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+        keys = np.arange(n) if keys is None else np.asarray(keys)
+        candidates = None
+        if top_k < n:
+            candidates = np.argpartition(-scores, top_k - 1, axis=-1)[..., :top_k]
+            kth = np.take_along_axis(scores, candidates, axis=-1).min(axis=-1, keepdims=True)
+            if np.any(np.count_nonzero(scores >= kth, axis=-1) > top_k):
+                # Ties across the cut-off: argpartition kept arbitrary ones
+                candidates = None
+        if candidates is None:
+            candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+        order = np.lexsort((keys[candidates], -np.take_along_axis(scores, candidates, axis=-1)), axis=-1)
+        return np.take_along_axis(candidates, order[..., :top_k], axis=-1)
     
     def compute_similarity(self, user_vector: np.ndarray, career_vector: np.ndarray) -> float:
         """
@@ -36,43 +441,138 @@ class SimilarityEngine:
         user_trimmed = user_vector[:min_dim].reshape(1, -1)
         career_trimmed = career_vector[:min_dim].reshape(1, -1)
         
+        # Imported here so loading the engine does not pull in sklearn.metrics
+        from sklearn.metrics.pairwise import cosine_similarity
+
         similarity = cosine_similarity(user_trimmed, career_trimmed)[0][0]
         return float(similarity)
     
+    def rank_careers(
+        self,
+        user_vector: np.ndarray,
+        top_k: int = 5,
+        n_probe: Optional[int] = None,
+        domains: Optional[Union[str, List[str]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank careers for a user without materializing career dictionaries.
+        
+        Args:
+            user_vector: User profile vector
+            top_k: Number of careers to return
+            n_probe: IVF cells to scan when the index is enabled
+            domains: Domain name or list of names to rank within
+                (defaults to all domains)
+        
+        Returns:
+            Tuple of (catalog row indices, similarity scores) in rank order;
+            rows index into `self.careers`
+        """
+        indices, scores = self.score_careers(user_vector, n_probe=n_probe, domains=domains)
+        if len(scores) < top_k and self.ann_cells > 0 and domains is None:
+            # Probed cells held fewer careers than requested
+            indices, scores = self.score_careers(user_vector, exact=True)
+        
+        positions = self._top_k(scores, top_k, indices)
+        return indices[positions], scores[positions]
+    
+    def rank_careers_batch(
+        self,
+        user_vectors: np.ndarray,
+        top_k: int = 5,
+        domains: Optional[Union[str, List[str]]] = None,
+        block_size: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank careers for many users with one matrix product per block of users.
+        Batch scoring always covers the full catalog (no IVF probing).
+        
+        Args:
+            user_vectors: User profile vectors (n_users, n_features)
+            top_k: Number of careers per user
+            domains: Domain name or list of names to rank within
+            block_size: Users scored per matrix product (defaults to BATCH_BLOCK_SIZE)
+        
+        Returns:
+            Tuple of (catalog row indices, similarity scores), each of
+            shape (n_users, top_k) in rank order
+        """
+        user_vectors = np.atleast_2d(np.asarray(user_vectors, dtype=np.float64))
+        block_size = block_size or BATCH_BLOCK_SIZE
+        block_indices = []
+        block_scores = []
+        # At least one (possibly empty) block so zero users still get shaped output
+        for start in range(0, max(len(user_vectors), 1), block_size):
+            indices, scores = self.score_careers_batch(user_vectors[start:start + block_size], domains=domains)
+            positions = self._top_k(scores, top_k, indices)
+            block_indices.append(indices[positions])
+            block_scores.append(np.take_along_axis(scores, positions, axis=-1))
+        if len(block_indices) == 1:
+            return block_indices[0], block_scores[0]
+        return np.concatenate(block_indices), np.concatenate(block_scores)
+    
+    def _recommendation(self, index: int, score: float) -> Dict:
+        """Career dictionary (without embedding) for a ranked catalog row."""
+        career = self.careers[index].to_dict()
+        career['similarity_score'] = float(score)
+        return career
+    
+    def _sync_careers(self, careers: Optional[Union[CareerStore, List[Dict]]]):
+        """Rebuild the index if called with a catalog other than the current one."""
+        if careers is not None and careers is not self._source and careers is not self.careers:
+            self.set_careers(careers, self.query_dim)
+    
     def recommend_careers(
         self,
         user_vector: np.ndarray,
-        careers: List[Dict],
-        top_k: int = 5
+        careers: Optional[Union[CareerStore, List[Dict]]] = None,
+        top_k: int = 5,
+        n_probe: Optional[int] = None,
+        domains: Optional[Union[str, List[str]]] = None
     ) -> List[Dict]:
         """
         Recommend top-k careers based on similarity.
         
         Args:
             user_vector: User profile vector
-            careers: List of career dictionaries with 'embedding' key
+            careers: Career catalog (defaults to the one passed to set_careers)
             top_k: Number of recommendations
+            n_probe: IVF cells to scan when the index is enabled
+            domains: Domain name or list of names to recommend from
+                (defaults to all domains)
         
         Returns:
             List of career dictionaries with 'similarity_score' added
         """
-        recommendations = []
-        
-        for career in careers:
-            career_vector = np.array(career.get('embedding', []))
-            if len(career_vector) == 0:
-                continue
-            
-            similarity = self.compute_similarity(user_vector, career_vector)
-            
-            career_copy = career.copy()
-            career_copy['similarity_score'] = similarity
-            recommendations.append(career_copy)
+        self._sync_careers(careers)
+        indices, scores = self.rank_careers(user_vector, top_k, n_probe=n_probe, domains=domains)
+        return [self._recommendation(index, score) for index, score in zip(indices, scores)]
+    
+    def recommend_careers_batch(
+        self,
+        user_vectors: np.ndarray,
+        careers: Optional[Union[CareerStore, List[Dict]]] = None,
+        top_k: int = 5,
+        domains: Optional[Union[str, List[str]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Recommend top-k careers for many users with blocked matrix products.
         
-        # Sort by similarity (descending)
-        recommendations.sort(key=lambda x: x['similarity_score'], reverse=True)
+        Args:
+            user_vectors: User profile vectors (n_users, n_features)
+            careers: Career catalog (defaults to the one passed to set_careers)
+            top_k: Number of recommendations per user
+            domains: Domain name or list of names to recommend from
         
-        return recommendations[:top_k]
+        Returns:
+            One list of career dictionaries with 'similarity_score' per user
+        """
+        self._sync_careers(careers)
+        indices, scores = self.rank_careers_batch(user_vectors, top_k, domains=domains)
+        return [
+            [self._recommendation(index, score) for index, score in zip(row_indices, row_scores)]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
     
     def compute_skill_gap(
         self,
@@ -94,87 +594,45 @@ class SimilarityEngine:
         
         # Validate inputs
         if not user_skills or len(user_skills) == 0:
-            print(f"  [GAP_CALC ERROR] user_skills is empty! Cannot calculate gaps.")
+            logger.warning("[GAP_CALC] user_skills is empty! Cannot calculate gaps.")
             return {}
         
-        # Comprehensive skill name mapping for matching career skills to user skills
-        skill_name_mapping = {
-            'programming': ['programming', 'coding', 'python', 'java', 'javascript', 'software development', 'development'],
-            'problem_solving': ['problem_solving', 'problem solving', 'algorithms', 'data structures', 'logical thinking', 'critical thinking'],
-            'communication': ['communication', 'writing', 'verbal communication', 'presentation', 'interpersonal', 'people skills', 'patience', 'teaching', 'subject knowledge', 'people'],
-            'creativity': ['creativity', 'creative', 'innovation', 'creative thinking', 'content creation', 'content'],
-            'leadership': ['leadership', 'management', 'team management', 'organization', 'organizational', 'strategy', 'strategic', 'organizing'],
-            'analytical': ['analytical', 'analytical thinking', 'data analysis', 'machine learning', 'analytics', 'statistical analysis', 'marketing', 'market'],
-            'mathematics': ['mathematics', 'math', 'statistics', 'quantitative'],
-            'design': ['design', 'prototyping', 'ui/ux', 'user experience', 'ux'],
-            'research': ['research', 'user research', 'data research', 'psychology', 'empathy', 'psychological'],
-            'teamwork': ['teamwork', 'team work', 'collaboration', 'working in teams', 'collaborative']
-        }
-        
-        # Reverse mapping: from career skill name to user skill key
-        def find_user_skill_key(career_skill_name):
-            """Find the matching user skill key for a career skill name."""
-            normalized = career_skill_name.lower().strip().replace(' ', '_').replace('-', '_').replace('/', '_')
-            
-            # Direct match first
-            if normalized in user_skills:
-                return normalized
-            
-            # Check mapping - look for exact matches in variations
-            for user_key, variations in skill_name_mapping.items():
-                # Check if normalized name matches any variation exactly
-                for variation in variations:
-                    var_normalized = variation.lower().replace(' ', '_').replace('-', '_').replace('/', '_')
-                    if normalized == var_normalized:
-                        if user_key in user_skills:
-                            return user_key
-                
-                # Check if normalized name contains or is contained in any variation
-                for variation in variations:
-                    var_normalized = variation.lower().replace(' ', '_').replace('-', '_').replace('/', '_')
-                    if normalized in var_normalized or var_normalized in normalized:
-                        if user_key in user_skills:
-                            return user_key
-                
-                # Check if any variation word is in the normalized name
-                normalized_words = normalized.split('_')
-                for variation in variations:
-                    var_words = variation.lower().split()
-                    if any(word in normalized for word in var_words) or any(word in variation.lower() for word in normalized_words):
-                        if user_key in user_skills:
-                            return user_key
-            
-            # Try partial match with user skill keys
-            for user_key in user_skills.keys():
-                if normalized in user_key or user_key in normalized:
-                    return user_key
-            
-            return None
+        # Career skill names resolve through a table compiled at catalog load;
+        # names not seen before are fuzzy-matched once and memoized.
+        skill_keys = self._skill_key_table(tuple(user_skills))
+        debug = debug_enabled(logger)
         
         # Compute gaps for each required skill
-        print(f"  [GAP_CALC] Computing gaps for {len(required_skills)} required skills")
+        if debug:
+            logger.debug("[GAP_CALC] Computing gaps for %d required skills", len(required_skills))
         for skill_name, required_level in required_skills.items():
-            user_skill_key = find_user_skill_key(skill_name)
+            if skill_name in skill_keys:
+                user_skill_key = skill_keys[skill_name]
+            else:
+                user_skill_key = resolve_skill_key(skill_name, tuple(user_skills))
+                skill_keys[skill_name] = user_skill_key
             
             if user_skill_key and user_skill_key in user_skills:
                 user_level = user_skills[user_skill_key]
                 # Calculate gap (required - user, clamped to 0-1)
                 gap = max(0.0, min(1.0, required_level - user_level))
                 
-                print(f"  [GAP_CALC] {skill_name} -> {user_skill_key}: required={required_level:.2f}, user={user_level:.2f}, gap={gap:.2f}")
-                
                 # Only include skills with significant gaps (> 0.1 = 10%)
                 if gap > 0.1:
                     gaps[skill_name] = round(gap, 2)  # Round to 2 decimal places
-                    print(f"  [GAP_CALC]   ✓ Added gap: {skill_name} = {gap:.2f}")
-                else:
-                    print(f"  [GAP_CALC]   ✗ Skipped (gap {gap:.2f} <= 0.1)")
-            else:
+                if debug:
+                    logger.debug(
+                        "[GAP_CALC] %s -> %s: required=%.2f, user=%.2f, gap=%.2f (%s)",
+                        skill_name, user_skill_key, required_level, user_level, gap,
+                        "added" if gap > 0.1 else "skipped"
+                    )
+            elif debug:
                 if user_skill_key:
-                    print(f"  [GAP_CALC] {skill_name} -> {user_skill_key}: NOT FOUND in user_skills")
+                    logger.debug("[GAP_CALC] %s -> %s: NOT FOUND in user_skills", skill_name, user_skill_key)
                 else:
-                    print(f"  [GAP_CALC] {skill_name}: Could not map to user skill key")
+                    logger.debug("[GAP_CALC] %s: Could not map to user skill key", skill_name)
             # If skill doesn't map to user skills, don't show it (not assessed)
         
-        print(f"  [GAP_CALC] Final gaps: {gaps}")
+        if debug:
+            logger.debug("[GAP_CALC] Final gaps: %s", gaps)
         return gaps
@@ -0,0 +1,99 @@
+"""
+Benchmark the IVF career index against exact cosine search.
+Reports recall@k and per-query latency for several probe settings, on a
+clustered catalog (careers grouped by domain, as in practice) and on uniform
+random embeddings. IVF recall depends on that structure: with 32 cells,
+probing 4 found 0.6-0.7 of the exact top 10 on uniform data against about
+0.9 on the clustered catalog, so check recall on the real catalog before
+setting CAREER_ANN_PROBE.
+
+Usage: python scripts/benchmark_ann.py [n_careers] [n_cells]
+"""
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.similarity import SimilarityEngine
+
+
+def make_catalog(n_careers: int, dim: int = 20, seed: int = 42):
+    """Synthetic career catalog with clustered embeddings, like real domains."""
+    rng = np.random.default_rng(seed)
+    n_domains = 50
+    domain_centers = rng.random((n_domains, dim))
+    domains = rng.integers(0, n_domains, size=n_careers)
+    embeddings = np.clip(domain_centers[domains] + rng.normal(0, 0.15, (n_careers, dim)), 0, 1)
+    return [
+        {'id': f'career_{i + 1}', 'title': f'Career {i + 1}', 'embedding': embeddings[i].tolist()}
+        for i in range(n_careers)
+    ]
+
+
+def make_uniform_catalog(n_careers: int, dim: int = 20, seed: int = 42):
+    """Synthetic catalog with unstructured uniform random embeddings (IVF worst case)."""
+    embeddings = np.random.default_rng(seed).random((n_careers, dim))
+    return [
+        {'id': f'career_{i + 1}', 'title': f'Career {i + 1}', 'embedding': embeddings[i].tolist()}
+        for i in range(n_careers)
+    ]
+
+
+def time_queries(engine, queries, top_k, **kwargs):
+    """Run every query and return (results, mean latency in ms)."""
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        indices, scores = engine.score_careers(query, **kwargs)
+        results.append(indices[engine._top_k(scores, top_k)])
+    elapsed = time.perf_counter() - start
+    return results, elapsed / len(queries) * 1000
+
+
+def benchmark_catalog(name: str, careers, queries, n_cells: int, top_k: int):
+    """Print recall and latency of each probe setting against exact search."""
+    engine = SimilarityEngine(ann_cells=n_cells)
+    build_start = time.perf_counter()
+    engine.set_careers(careers, query_dim=queries.shape[1])
+    print(f"\n[{name}] Index build time: {time.perf_counter() - build_start:.2f}s")
+
+    exact_results, exact_ms = time_queries(engine, queries, top_k, exact=True)
+    print(f"\n  {'Mode':12s} | {'Probe':>5s} | {'Recall@' + str(top_k):>9s} | {'Latency (ms)':>12s} | {'Speedup':>7s}")
+    print("  " + "-" * 58)
+    print(f"  {'exact':12s} | {'-':>5s} | {1.0:9.4f} | {exact_ms:12.3f} | {1.0:6.1f}x")
+
+    for n_probe in [1, 2, 4, 8, 16, 32]:
+        if n_probe >= n_cells:
+            break
+        ann_results, ann_ms = time_queries(engine, queries, top_k, n_probe=n_probe)
+        recall = np.mean([
+            len(set(a.tolist()) & set(e.tolist())) / top_k
+            for a, e in zip(ann_results, exact_results)
+        ])
+        print(f"  {'ivf':12s} | {n_probe:5d} | {recall:9.4f} | {ann_ms:12.3f} | {exact_ms / ann_ms:6.1f}x")
+
+
+def main():
+    n_careers = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    n_cells = int(sys.argv[2]) if len(sys.argv) > 2 else int(np.sqrt(n_careers))
+    n_queries = 200
+    top_k = 10
+
+    print("=" * 70)
+    print(f"  IVF Career Index Benchmark ({n_careers} careers, {n_cells} cells)")
+    print("=" * 70)
+
+    queries = np.random.default_rng(7).random((n_queries, 20))
+    benchmark_catalog("clustered", make_catalog(n_careers), queries, n_cells, top_k)
+    benchmark_catalog("uniform", make_uniform_catalog(n_careers), queries, n_cells, top_k)
+
+    print("\nSet CAREER_ANN_CELLS / CAREER_ANN_PROBE to enable the index in app.py.")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
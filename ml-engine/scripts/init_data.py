@@ -22,13 +22,17 @@ def main():
     # Load careers
     careers = data_loader.load_careers()
     
-    # Generate embeddings
+    # Generate embeddings in batches; cached text embeddings are reused, so
+    # only new or changed careers are encoded
     print("Generating embeddings for careers...")
-    for career in careers:
-        if 'embedding' not in career:
-            embedding = career_embedder.embed_career(career)
-            career['embedding'] = embedding.tolist()
-            print(f"Generated embedding for: {career['title']}")
+    embeddings = career_embedder.embed_batch(careers)
+    career_embedder.save_cache()
+    for career, embedding in zip(careers, embeddings):
+        career['embedding'] = embedding.tolist()
+    print(
+        f"Encoded {career_embedder.misses} new or changed careers "
+        f"({career_embedder.hits} from cache in {career_embedder.cache_path})"
+    )
     
     # Save careers with embeddings
     data_loader.save_careers(careers)
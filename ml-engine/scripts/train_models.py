@@ -2,22 +2,104 @@
 Train clustering and embedding models.
 Run this after initializing data.
 
-Usage: python scripts/train_models.py
+Usage: python scripts/train_models.py [--minibatch [chunk_size]] [--data path] [--jobs n]
+
+--minibatch streams students in chunks and fits KMeans++ with mini-batch
+updates, for datasets too large for memory. It streams data/students.json
+(the file full training and the server read) one student at a time; pass
+--data to stream another JSON or CSV file, e.g. data/students.csv.
+--jobs sets the worker processes for the elbow sweep (default: all CPUs).
 """
 import numpy as np
+import os
 import sys
 from pathlib import Path
+from typing import Optional
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.data_loader import DataLoader
 from core.clustering import StudentClusterer
-from core.embeddings import EmbeddingReducer
+from core.embeddings import EmbeddingReducer, configure_numba
+from core.serving import ServingArtifact
+
+def get_option(name: str, default: int) -> int:
+    """Integer value following a command-line flag, or the default."""
+    if name in sys.argv:
+        index = sys.argv.index(name) + 1
+        if index < len(sys.argv) and sys.argv[index].lstrip('-').isdigit():
+            return int(sys.argv[index])
+    return default
+
+def get_path_option(name: str) -> Optional[str]:
+    """Path following a command-line flag, or None."""
+    if name in sys.argv:
+        index = sys.argv.index(name) + 1
+        if index < len(sys.argv) and not sys.argv[index].startswith('--'):
+            return sys.argv[index]
+    return None
+
+def print_projection_stats(reducer: EmbeddingReducer):
+    """Report how closely the fast 3D projector tracks UMAP.transform."""
+    stats = reducer.projection_3d.stats
+    print(
+        f"  3D projector: mean displacement {stats['mean_displacement']:.4f} "
+        f"({stats['relative_displacement']:.1%} of embedding radius), {stats['projection_time_ms']:.3f} ms/vector"
+    )
+
+def export_serving_artifact(clusterer: StudentClusterer, reducer: EmbeddingReducer):
+    """Write the PCA and centroid arrays the engine serves from."""
+    ServingArtifact.from_models(clusterer, reducer).save(reducer.serving_path)
+    print(f"[OK] Serving artifact exported to {reducer.serving_path}")
+
+def write_statistics_snapshot():
+    """Precompute /model-statistics so the first page view after a retrain is fast."""
+    # Importing the engine loads the models just saved, exactly as the server
+    # will, so the snapshot's signature matches what the server computes.
+    import app as engine
+    
+    engine.build_stats_snapshot()
+    print(f"[OK] Model statistics snapshot saved to {engine.MODEL_STATS_PATH}")
+
+def train_minibatch(data_loader: DataLoader, chunk_size: int, n_jobs: int, data_path: Optional[str] = None):
+    """Stream-train the clusterer, then fit reducers on its evaluation sample."""
+    data_path = data_path or os.path.join(data_loader.data_dir, "students.json")
+    if not os.path.exists(data_path):
+        print(f"No student data found at {data_path}. Please run init_data.py first.")
+        return
+    
+    print(f"Streaming student profiles from {data_path} in chunks of {chunk_size}...")
+    print("Training clustering model (mini-batch KMeans++)...")
+    clusterer = StudentClusterer(n_clusters=5, algorithm='kmeans_plus', n_jobs=n_jobs)
+    sample = clusterer.fit_streaming(lambda: data_loader.iter_student_vectors(chunk_size, data_path))
+    metrics = clusterer.get_metrics()['kmeans_plus']
+    print(f"[OK] Clustering model trained on {metrics['n_samples']} profiles and saved")
+    print(f"  Train: {metrics['training_time']:.2f}s, Silhouette (sample of {len(sample)}): {metrics['silhouette']:.4f}")
+    
+    print("Training PCA (2D)...")
+    reducer = EmbeddingReducer()
+    reducer.fit_pca_2d(sample)
+    print("[OK] PCA model trained and saved")
+    
+    print("Training UMAP (3D)...")
+    reducer.fit_umap_3d(sample)
+    print("[OK] UMAP model trained and saved")
+    print_projection_stats(reducer)
+    export_serving_artifact(clusterer, reducer)
+    write_statistics_snapshot()
+    
+    print("\nAll models trained successfully!")
 
 def main():
+    configure_numba()
     data_loader = DataLoader()
     
+    n_jobs = get_option("--jobs", -1)
+    if "--minibatch" in sys.argv:
+        train_minibatch(data_loader, get_option("--minibatch", 10000), n_jobs, get_path_option("--data"))
+        return
+    
     # Load students
     students = data_loader.load_students()
     
@@ -35,9 +117,11 @@ def main():
     
     # Train clusterer with fixed KMeans++ (no auto-selection).
     print("Training clustering model (KMeans++)...")
-    clusterer = StudentClusterer(n_clusters=5, algorithm='kmeans_plus')
+    clusterer = StudentClusterer(n_clusters=5, algorithm='kmeans_plus', n_jobs=n_jobs)
     clusterer.fit(student_vectors)
     print(f"[OK] Clustering model trained and saved")
+    if clusterer.elbow_data:
+        print(f"[OK] Elbow sweep stored for k=2..{clusterer.elbow_data[-1]['k']}")
     print("[OK] Active algorithm: KMeans++")
     metrics = clusterer.get_metrics()
     if metrics:
@@ -56,6 +140,9 @@ def main():
     print("Training UMAP (3D)...")
     reducer.fit_umap_3d(student_vectors)
     print("[OK] UMAP model trained and saved")
+    print_projection_stats(reducer)
+    export_serving_artifact(clusterer, reducer)
+    write_statistics_snapshot()
     
     print("\nAll models trained successfully!")
 
@@ -0,0 +1,402 @@
+"""
+Endpoint tests for the assess/recommend paths of the FastAPI app.
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# No background warm-up or catalog watcher while testing
+os.environ.setdefault("ML_WARMUP", "0")
+os.environ.setdefault("CAREERS_WATCH_INTERVAL", "0")
+
+import app as engine
+import core.similarity
+from core.clustering import StudentClusterer
+from core.drift_monitor import DriftMonitor
+
+
+def assess_body(seed: int = 0, **overrides):
+    rng = np.random.default_rng(seed)
+    body = {
+        'riasec_responses': {f'{d}{i}': int(rng.integers(1, 6)) for d in 'riasec' for i in range(1, 9)},
+        'skill_responses': {name: int(rng.integers(1, 6)) for name in engine.SKILL_NAMES},
+        'subject_preferences': {'stem': 4, 'arts': 2, 'business': 3, 'social_sciences': 5},
+        'top_k': 5,
+    }
+    body.update(overrides)
+    return body
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """App with a clusterer fitted on 20-D profile vectors and an empty cache."""
+    clusterer = StudentClusterer(n_clusters=3, model_path=str(tmp_path / "clustering_model.joblib"))
+    clusterer.fit(np.random.default_rng(0).random((60, 20)), compute_elbow=False)
+    monkeypatch.setattr(engine, "clusterer", clusterer)
+    monkeypatch.setattr(engine, "drift_monitor", DriftMonitor(clusterer.get_cluster_centers()))
+    engine.assess_cache.clear()
+    yield TestClient(engine.app)
+    engine.assess_cache.clear()
+
+
+def test_cached_assess_still_feeds_drift_monitor(client):
+    hits = engine.assess_cache.hits
+    first = client.post("/assess", json=assess_body())
+    second = client.post("/assess", json=assess_body())
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json()
+    assert engine.assess_cache.hits == hits + 1
+    snapshot = client.get("/monitoring/drift").json()
+    assert snapshot["observations"] == 2
+
+
+def test_unclassified_assessment_is_not_cached(client, monkeypatch, tmp_path):
+    unfitted = StudentClusterer(n_clusters=3, model_path=str(tmp_path / "unfitted" / "clustering_model.joblib"))
+    monkeypatch.setattr(engine, "clusterer", unfitted)
+    response = client.post("/assess", json=assess_body())
+    assert response.json()["cluster"]["cluster_name"] == "Not Classified (Model not trained)"
+    assert engine.assess_cache.stats()["size"] == 0
+
+
+class StubReducer:
+    """Reducer whose transforms are instant; the cache build is stubbed separately."""
+
+    def has_pca_2d(self):
+        return True
+
+    def has_umap_3d(self):
+        return True
+
+    def transform_2d(self, vectors):
+        return np.zeros((len(vectors), 2))
+
+    def transform_3d(self, vectors):
+        return np.zeros((len(vectors), 3))
+
+    def project_3d(self, vectors):
+        return np.zeros((len(vectors), 3))
+
+
+def test_first_visualize_builds_cache_once_off_the_event_loop(monkeypatch):
+    builds = []
+
+    def slow_build():
+        builds.append(threading.current_thread().name)
+        time.sleep(0.5)
+        engine.visualization_cache["ready"] = True
+
+    monkeypatch.setattr(engine, "embedding_reducer", StubReducer())
+    monkeypatch.setattr(engine, "_build_visualization_cache", slow_build)
+    monkeypatch.setitem(engine.visualization_cache, "ready", False)
+
+    async def scenario():
+        async with AsyncClient(transport=ASGITransport(app=engine.app), base_url="http://test") as http:
+            body = {"combined_vector": [0.5] * 20}
+            visualize = [asyncio.create_task(http.post("/visualize", json=body)) for _ in range(2)]
+            await asyncio.sleep(0.1)
+            started = time.perf_counter()
+            health = await http.get("/health")
+            health_seconds = time.perf_counter() - started
+            return [await task for task in visualize], health, health_seconds
+
+    responses, health, health_seconds = asyncio.run(scenario())
+    assert [r.status_code for r in responses] == [200, 200]
+    assert health.status_code == 200 and health_seconds < 0.3
+    assert len(builds) == 1 and builds[0] != threading.main_thread().name
+
+
+def test_admin_endpoints_are_disabled_without_a_token(monkeypatch):
+    client = TestClient(engine.app)
+    monkeypatch.setattr(engine, "ADMIN_TOKEN", None)
+    for path in ("/admin/reload-careers", "/admin/reload-models"):
+        assert client.post(path).status_code == 404
+        assert client.post(path, headers={"X-Admin-Token": ""}).status_code == 404
+
+    monkeypatch.setattr(engine, "ADMIN_TOKEN", "secret")
+    for path in ("/admin/reload-careers", "/admin/reload-models"):
+        assert client.post(path).status_code == 403
+        assert client.post(path, headers={"X-Admin-Token": "wrong"}).status_code == 403
+
+
+def keep_serving_state(monkeypatch):
+    """Enable the admin endpoints and restore every global a reload swaps."""
+    for name in ("career_store", "similarity_engine", "model_version", "clusterer", "embedding_reducer",
+                 "drift_monitor", "loaded_model_signature"):
+        monkeypatch.setattr(engine, name, getattr(engine, name))
+    monkeypatch.setattr(engine, "catalog_state", dict(engine.catalog_state))
+    monkeypatch.setattr(engine, "visualization_cache", {"ready": False})
+    monkeypatch.setattr(engine, "ADMIN_TOKEN", "secret")
+
+
+def test_catalog_reload_swaps_every_derived_structure_at_once(client, monkeypatch):
+    keep_serving_state(monkeypatch)
+    old_titles = {record.title for record in engine.career_store}
+    new_careers = [dict(career, title=f"{career['title']} II") for career in engine.data_loader.load_careers()[:6]]
+    new_titles = {career["title"] for career in new_careers}
+    load_started = threading.Event()
+
+    def slow_load():
+        load_started.set()
+        time.sleep(0.3)
+        return [dict(career) for career in new_careers]
+
+    monkeypatch.setattr(engine.data_loader, "load_careers", slow_load)
+    vector = np.random.default_rng(3).random(20).tolist()
+    assert client.post("/assess", json=assess_body()).status_code == 200
+    assert engine.assess_cache.stats()["size"] == 1
+    old_version = engine.model_version
+
+    async def scenario():
+        async with AsyncClient(transport=ASGITransport(app=engine.app), base_url="http://test") as http:
+            reload = asyncio.create_task(http.post("/admin/reload-careers", headers={"X-Admin-Token": "secret"}))
+            while not load_started.is_set():
+                await asyncio.sleep(0.01)
+            # Served while the new catalog is still being built
+            during = (await http.get("/careers"), await http.post("/recommend", json={"combined_vector": vector, "top_k": 50}))
+            return await reload, during
+
+    reloaded, (careers_during, recommend_during) = asyncio.run(scenario())
+    assert reloaded.status_code == 200 and reloaded.json()["n_careers"] == 6
+    assert {career["title"] for career in careers_during.json()} == old_titles
+    assert {r["title"] for r in recommend_during.json()} == old_titles
+
+    assert len(engine.career_store) == 6
+    assert engine.similarity_engine.careers is engine.career_store
+    assert engine.model_version == engine.compute_model_version() != old_version
+    assert engine.assess_cache.stats()["size"] == 0
+    assert {career["title"] for career in client.get("/careers").json()} == new_titles
+    response = client.post("/recommend", json={"combined_vector": vector, "top_k": 50}).json()
+    assert {r["title"] for r in response} == new_titles
+    assessed = client.post("/assess", json=assess_body()).json()
+    assert {r["title"] for r in assessed["recommendations"]} <= new_titles
+
+
+def test_model_reload_swaps_clusterer_version_and_cache(client, monkeypatch, tmp_path):
+    keep_serving_state(monkeypatch)
+    old_clusterer, old_monitor = engine.clusterer, engine.drift_monitor
+    model_path = old_clusterer.model_path
+    load_started = threading.Event()
+
+    def slow_load():
+        load_started.set()
+        time.sleep(0.3)
+        return StudentClusterer(model_path=model_path), StubReducer()
+
+    monkeypatch.setattr(engine, "loaded_model_signature", engine.get_model_file_signature())
+    monkeypatch.setattr(engine, "load_models_from_disk", slow_load)
+    monkeypatch.setattr(engine, "build_visualization_cache", lambda: None)
+    headers = {"X-Admin-Token": "secret"}
+    assert client.post("/admin/reload-models", headers=headers).json()["status"] == "unchanged"
+    assert not load_started.is_set()
+
+    assert client.post("/assess", json=assess_body()).status_code == 200
+    old_version = engine.model_version
+    # Retrain elsewhere and move the model into place, as a deploy would
+    staged = StudentClusterer(n_clusters=4, model_path=str(tmp_path / "staged" / "clustering_model.joblib"))
+    staged.fit(np.random.default_rng(1).random((60, 20)), compute_elbow=False)
+    os.replace(staged.model_path, model_path)
+
+    async def scenario():
+        async with AsyncClient(transport=ASGITransport(app=engine.app), base_url="http://test") as http:
+            reload = asyncio.create_task(http.post("/admin/reload-models", headers=headers))
+            while not load_started.is_set():
+                await asyncio.sleep(0.01)
+            # Assigned by the old model while the new one loads
+            during = await http.post("/assess", json=assess_body(1))
+            return await reload, during
+
+    reloaded, during = asyncio.run(scenario())
+    assert during.status_code == 200
+    assert reloaded.json() == {"status": "reloaded", "model_version": engine.model_version}
+    assert engine.model_version == engine.compute_model_version() != old_version
+    assert engine.clusterer is not old_clusterer and engine.clusterer.n_clusters == 4
+    assert engine.drift_monitor is not old_monitor
+    # Answers from the old model, including the in-flight one, are gone
+    assert engine.assess_cache.stats()["size"] == 0
+    assert client.post("/assess", json=assess_body(1)).json()["cluster"]["cluster_id"] in range(4)
+    assert engine.assess_cache.stats()["size"] == 1
+
+    assert client.post("/admin/reload-models", headers=headers).json() == {
+        "status": "unchanged",
+        "model_version": engine.model_version,
+    }
+
+
+def test_visualization_build_discards_entries_of_a_replaced_catalog(monkeypatch):
+    old_store, new_store = ["old"], ["new", "new"]
+    built_from = []
+
+    def build_entries(careers):
+        built_from.append(careers)
+        if len(built_from) == 1:
+            # A catalog reload lands while the first build is running
+            engine.career_store = new_store
+            engine.catalog_state["version"] += 1
+        return {"careers_2d": [[0.0, 0.0]] * len(careers), "career_titles": list(careers)}
+
+    monkeypatch.setattr(engine, "embedding_reducer", StubReducer())
+    monkeypatch.setattr(engine, "build_career_visualization", build_entries)
+    monkeypatch.setattr(engine, "career_store", old_store)
+    monkeypatch.setitem(engine.catalog_state, "version", 0)
+    monkeypatch.setattr(engine, "visualization_cache", {"ready": False})
+
+    engine.build_visualization_cache()
+    assert built_from == [old_store, new_store]
+    assert engine.visualization_cache["ready"]
+    assert engine.visualization_cache["career_titles"] == new_store
+
+
+def test_batch_recommendations_match_single_requests(monkeypatch):
+    # Several user blocks, the last one partial
+    monkeypatch.setattr(core.similarity, "BATCH_BLOCK_SIZE", 3)
+    client = TestClient(engine.app)
+    rng = np.random.default_rng(5)
+    vectors = rng.random((8, 20)).tolist()
+    skills = [{name: float(rng.random()) for name in engine.SKILL_NAMES} for _ in vectors]
+    batch = client.post("/recommend/batch", json={"combined_vectors": vectors, "user_skills": skills, "top_k": 4})
+    assert batch.status_code == 200
+    single = [
+        client.post("/recommend", json={"combined_vector": vector, "user_skills": user_skills, "top_k": 4}).json()
+        for vector, user_skills in zip(vectors, skills)
+    ]
+    assert len(batch.json()) == len(single)
+    for batch_row, single_row in zip(batch.json(), single):
+        # Matrix-matrix and matrix-vector float32 products may differ in the last bit
+        np.testing.assert_allclose(
+            [r.pop("similarity_score") for r in batch_row],
+            [r.pop("similarity_score") for r in single_row],
+            atol=1e-6,
+        )
+        assert batch_row == single_row
+
+
+def test_streamed_recommendations_are_ndjson_in_rank_order(monkeypatch):
+    keep_serving_state(monkeypatch)
+    client = TestClient(engine.app)
+    body = {"combined_vector": np.random.default_rng(4).random(20).tolist(), "top_k": 8}
+    expected = client.post("/recommend", json=body).json()
+
+    streaming_engine = engine.similarity_engine
+    replacement = engine.build_catalog(
+        [dict(career, title=f"{career['title']} II") for career in engine.data_loader.load_careers()[:3]]
+    )
+    compute_skill_gap = streaming_engine.compute_skill_gap
+    gap_calls = []
+
+    def reload_after_first_line(*args):
+        # A catalog reload lands once the stream has started
+        gap_calls.append(args)
+        engine.career_store = replacement["careers"]
+        engine.similarity_engine = replacement["engine"]
+        return compute_skill_gap(*args)
+
+    monkeypatch.setattr(streaming_engine, "compute_skill_gap", reload_after_first_line)
+    response = client.post("/recommend", json=body, headers={"Accept": engine.NDJSON_MEDIA_TYPE})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(engine.NDJSON_MEDIA_TYPE)
+    assert response.text.endswith("\n")
+    lines = response.text.split("\n")[:-1]
+    assert len(lines) == len(gap_calls) == 8
+    # One complete record per line, ranked by the engine captured before the reload
+    assert [json.loads(line) for line in lines] == expected
+    assert engine.similarity_engine is replacement["engine"]
+
+
+def test_recommend_domain_filter():
+    client = TestClient(engine.app)
+    domain = engine.similarity_engine.domains[0]
+    vector = np.random.default_rng(2).random(20).tolist()
+
+    response = client.post("/recommend", json={"combined_vector": vector, "top_k": 50, "domain": domain.upper()})
+    assert response.status_code == 200
+    expected = sum(1 for record in engine.career_store if record.domain == domain)
+    assert len(response.json()) == expected > 0
+    assert {r["domain"] for r in response.json()} == {domain}
+
+    assert client.post("/recommend", json={"combined_vector": vector, "domain": []}).json() == []
+    for path, body in (
+        ("/recommend", {"combined_vector": vector, "domain": "Astrology"}),
+        ("/recommend/batch", {"combined_vectors": [vector], "domain": [domain, "Astrology"]}),
+    ):
+        response = client.post(path, json=body)
+        assert response.status_code == 400
+        assert "Astrology" in response.json()["detail"]
+
+
+def test_model_statistics_etag_and_invalidation(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(engine, "MODEL_STATS_PATH", str(tmp_path / "model_statistics.json"))
+    monkeypatch.setattr(engine, "model_stats_snapshot", {})
+    builds = []
+    build_stats_snapshot = engine.build_stats_snapshot
+    monkeypatch.setattr(engine, "build_stats_snapshot", lambda: builds.append(1) or build_stats_snapshot())
+
+    first = client.get("/model-statistics")
+    assert first.status_code == 200 and len(builds) == 1
+    etag = first.headers["ETag"]
+    assert etag.startswith('"') and first.json()["model_info"]["n_clusters"] == 3
+
+    repeat = client.get("/model-statistics", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304 and repeat.headers["ETag"] == etag and repeat.content == b""
+    assert client.get("/model-statistics", headers={"If-None-Match": '"stale"'}).status_code == 200
+    assert len(builds) == 1
+
+    # The persisted snapshot is reused after a restart (empty in-memory snapshot)
+    monkeypatch.setattr(engine, "model_stats_snapshot", {})
+    assert client.get("/model-statistics").headers["ETag"] == etag
+    assert len(builds) == 1
+
+    # A retrained model file (new mtime) invalidates the snapshot
+    stat = os.stat(engine.clusterer.model_path)
+    os.utime(engine.clusterer.model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert client.get("/model-statistics").status_code == 200
+    assert len(builds) == 2
+    assert engine.model_stats_snapshot["signature"] == engine.get_stats_signature()
+
+
+def test_warmup_reports_each_stage_on_health(client, monkeypatch):
+    monkeypatch.setattr(engine, "warmup_state", {"status": "pending", "stages": {}, "total_seconds": None})
+    monkeypatch.setattr(engine, "embedding_reducer", StubReducer())
+    monkeypatch.setattr(engine, "ensure_visualization_cache", lambda: None)
+
+    def broken_ranking(*args, **kwargs):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(engine.similarity_engine, "rank_careers", broken_ranking)
+    engine.run_warmup()
+
+    warmup = client.get("/health").json()["warmup"]
+    assert warmup["status"] == "failed" and warmup["total_seconds"] >= 0
+    stages = warmup["stages"]
+    assert list(stages) == [
+        "visualization_cache", "transform_2d", "transform_3d", "project_3d", "clustering", "recommendation"
+    ]
+    assert all(stages[name]["status"] == "ok" and stages[name]["seconds"] >= 0 for name in list(stages)[:-1])
+    assert stages["recommendation"] == {"status": "failed", "seconds": None, "error": "index unavailable"}
+
+
+def test_warmup_skips_stages_without_models(monkeypatch, tmp_path):
+    unfitted = StudentClusterer(n_clusters=3, model_path=str(tmp_path / "clustering_model.joblib"))
+    monkeypatch.setattr(engine, "clusterer", unfitted)
+    monkeypatch.setattr(engine, "warmup_state", {"status": "pending", "stages": {}, "total_seconds": None})
+    monkeypatch.setattr(engine, "ensure_visualization_cache", lambda: None)
+    reducer = StubReducer()
+    reducer.has_pca_2d = reducer.has_umap_3d = lambda: False
+    monkeypatch.setattr(engine, "embedding_reducer", reducer)
+    engine.run_warmup()
+
+    stages = engine.warmup_state["stages"]
+    assert engine.warmup_state["status"] == "done"
+    for name in ("transform_2d", "transform_3d", "project_3d", "clustering"):
+        assert stages[name] == {"status": "skipped", "seconds": None}
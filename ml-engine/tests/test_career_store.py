@@ -0,0 +1,41 @@
+"""
+Tests for the compact career catalog.
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.career_store import CareerStore
+
+
+def test_to_dicts_round_trips_the_catalog_exactly():
+    rng = np.random.default_rng(0)
+    # Catalog embeddings carry a few significant digits, as in careers.json
+    careers = [
+        {'title': 'Data Scientist', 'id': 1, 'embedding': np.round(rng.normal(size=384), 4).tolist(),
+         'domain': 'Tech/Analytical', 'riasec': {'I': 0.9}, 'skills': ['python'],
+         'description': 'Models data', 'salary_range': '$$$'},
+        {'id': 2, 'title': 'Chef', 'description': '', 'domain': 'Creative',
+         'salary_range': '$$', 'skills': [], 'embedding': np.round(rng.random(20), 6).tolist() + [1e-08, 123456.7]},
+        {'id': 3, 'title': 'Unembedded', 'description': '', 'domain': 'Creative',
+         'salary_range': 'N/A', 'skills': []},
+    ]
+    store = CareerStore(json.loads(json.dumps(careers)))
+
+    assert json.dumps(store.to_dicts()) == json.dumps(careers)
+    np.testing.assert_allclose(store.embedding(1), careers[1]['embedding'], rtol=1e-6)
+
+
+def test_embeddings_are_one_unpadded_float32_array():
+    careers = [{'id': i, 'embedding': [float(i)] * dim} for i, dim in enumerate((384, 20, 0, 20))]
+    store = CareerStore(careers)
+
+    assert store.vectors.dtype == np.float32 and store.vectors.shape == (424,)
+    assert store.nbytes() == store.vectors.nbytes + store.offsets.nbytes + store.dims.nbytes
+    assert len(store.embedding(2)) == 0
+    np.testing.assert_array_equal(store.rows(np.array([3, 1, 0]), 20), [[3.0] * 20, [1.0] * 20, [0.0] * 20])
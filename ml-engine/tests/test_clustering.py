@@ -0,0 +1,161 @@
+"""
+Tests for the NumPy nearest-centroid predictor.
+"""
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.clustering
+from core.clustering import StudentClusterer, CentroidPredictor, compute_elbow_data
+from core.data_loader import DataLoader
+
+
+@pytest.fixture(scope="module")
+def fitted_clusterer(tmp_path_factory):
+    rng = np.random.default_rng(42)
+    student_vectors = rng.random((300, 20))
+    model_path = tmp_path_factory.mktemp("model") / "clustering_model.joblib"
+    clusterer = StudentClusterer(n_clusters=5, model_path=str(model_path))
+    clusterer.fit(student_vectors, compute_elbow=False)
+    return clusterer, student_vectors
+
+
+def test_predictor_labels_match_sklearn(fitted_clusterer):
+    clusterer, student_vectors = fitted_clusterer
+    queries = np.vstack([student_vectors, np.random.default_rng(7).random((1000, 20))])
+    expected = clusterer.kmeans_plus.predict(queries)
+    np.testing.assert_array_equal(clusterer.predict_labels(queries), expected)
+
+
+def test_single_vector_assignment_matches_sklearn(fitted_clusterer):
+    clusterer, _ = fitted_clusterer
+    for vector in np.random.default_rng(11).random((200, 20)):
+        expected = clusterer.kmeans_plus.predict(vector.reshape(1, -1))[0]
+        cluster_id, _ = clusterer.predict(vector)
+        assert cluster_id == expected
+        assert clusterer.predict_proba(vector).argmax() == expected
+
+
+def test_distances_match_sklearn_transform(fitted_clusterer):
+    clusterer, student_vectors = fitted_clusterer
+    predictor = clusterer.get_predictor()
+    expected = clusterer.kmeans_plus.transform(student_vectors)
+    np.testing.assert_allclose(np.sqrt(predictor.squared_distances(student_vectors)), expected, atol=1e-9)
+    np.testing.assert_allclose(predictor.distances(student_vectors[0]), expected[0], atol=1e-12)
+
+
+def test_predictor_reloaded_with_saved_model(fitted_clusterer):
+    clusterer, student_vectors = fitted_clusterer
+    reloaded = StudentClusterer(n_clusters=5, model_path=clusterer.model_path)
+    np.testing.assert_array_equal(reloaded.predict_labels(student_vectors), clusterer.predict_labels(student_vectors))
+
+
+def test_predictor_handles_vector_on_center():
+    centers = np.array([[0.0, 0.0], [1.0, 1.0]])
+    predictor = CentroidPredictor(centers)
+    np.testing.assert_array_equal(predictor.predict(centers), [0, 1])
+    assert predictor.squared_distances(centers).min() >= 0.0
+
+
+def test_every_fit_stores_the_elbow_sweep(tmp_path):
+    student_vectors = np.random.default_rng(5).random((40, 6))
+    clusterer = StudentClusterer(n_clusters=3, model_path=str(tmp_path / "clustering_model.joblib"))
+    clusterer.fit(student_vectors)
+    assert [point["k"] for point in clusterer.elbow_data] == list(range(2, 11))
+    reloaded = StudentClusterer(n_clusters=3, model_path=clusterer.model_path)
+    assert reloaded.elbow_data == clusterer.elbow_data
+
+
+def test_elbow_sweep_is_unthrottled_in_process(fitted_clusterer, monkeypatch):
+    _, student_vectors = fitted_clusterer
+    seen = []
+    real_limits = core.clustering.threadpool_limits
+
+    def recording_limits(limits=None):
+        seen.append(limits)
+        return real_limits(limits=limits)
+
+    monkeypatch.setattr(core.clustering, "threadpool_limits", recording_limits)
+    elbow = compute_elbow_data(student_vectors, k_max=4, n_jobs=1)
+    assert [point["k"] for point in elbow] == [2, 3, 4]
+    assert seen == [None, None, None]
+
+
+def test_parallel_comparison_matches_serial(tmp_path, monkeypatch):
+    student_vectors = np.random.default_rng(3).random((200, 20))
+    select = StudentClusterer._select_best_algorithm
+
+    def select_without_timings(self, kmeans_plus_metrics, kmeans_random_metrics):
+        # The efficiency term uses wall-clock times, which differ between any two runs
+        untimed = [dict(metrics, training_time=0.0, prediction_time_ms=0.0)
+                   for metrics in (kmeans_plus_metrics, kmeans_random_metrics)]
+        return select(self, *untimed)
+
+    monkeypatch.setattr(StudentClusterer, "_select_best_algorithm", select_without_timings)
+    serial = StudentClusterer(n_clusters=4, algorithm='auto', model_path=str(tmp_path / "serial" / "model.joblib"))
+    serial.fit(student_vectors, compute_elbow=False)
+
+    # Take the process-pool branch even on a single-CPU machine
+    monkeypatch.setattr(core.clustering, "resolve_n_jobs", lambda n_jobs: 4)
+    parallel = StudentClusterer(
+        n_clusters=4, algorithm='auto', model_path=str(tmp_path / "parallel" / "model.joblib"), n_jobs=4
+    )
+    parallel.fit(student_vectors, compute_elbow=False)
+
+    assert parallel.best_algorithm == serial.best_algorithm == parallel.metrics['selected']
+    for algorithm in ('kmeans_plus', 'kmeans_random'):
+        expected = {k: v for k, v in serial.metrics[algorithm].items() if k not in ('training_time', 'prediction_time_ms')}
+        actual = {k: v for k, v in parallel.metrics[algorithm].items() if k not in ('training_time', 'prediction_time_ms')}
+        assert actual.keys() == expected.keys()
+        for name, value in expected.items():
+            assert actual[name] == pytest.approx(value, rel=1e-9), name
+    np.testing.assert_array_equal(parallel.predict_labels(student_vectors), serial.predict_labels(student_vectors))
+
+
+def test_assign_probabilities_are_fuzzy_memberships(fitted_clusterer):
+    clusterer, _ = fitted_clusterer
+    centers = clusterer.get_cluster_centers()
+    queries = np.vstack([np.random.default_rng(13).random((100, 20)), centers[2]])
+    for fuzziness in (1.5, 2.0, 3.0):
+        for vector in queries:
+            assignment = clusterer.assign(vector, fuzziness=fuzziness)
+            probabilities = assignment['probabilities']
+            expected_id = clusterer.kmeans_plus.predict(vector.reshape(1, -1))[0]
+            assert assignment['cluster_id'] == expected_id == probabilities.argmax()
+            assert probabilities.sum() == pytest.approx(1.0, abs=1e-12)
+            assert np.all(probabilities >= 0)
+            distances = np.linalg.norm(centers - vector, axis=1)
+            if distances.min() > 0:
+                # Fuzzy c-means: u_i = 1 / sum_j (d_i / d_j)^(2 / (m - 1))
+                exponent = 2.0 / (fuzziness - 1.0)
+                reference = 1.0 / ((distances[:, None] / distances[None, :]) ** exponent).sum(axis=1)
+                np.testing.assert_allclose(probabilities, reference, rtol=1e-9)
+    on_center = clusterer.assign(centers[2])['probabilities']
+    np.testing.assert_array_equal(on_center, np.eye(len(centers))[2])
+
+
+def test_fit_streaming_over_a_file_larger_than_a_chunk(tmp_path):
+    rng = np.random.default_rng(21)
+    centers = rng.random((3, 20)) * 4
+    vectors = centers[rng.integers(0, 3, 250)] + rng.normal(0, 0.1, (250, 20))
+    students = [{'id': i, 'combined_vector': vector.tolist()} for i, vector in enumerate(vectors)]
+    (tmp_path / 'students.json').write_text(json.dumps(students), encoding='utf-8')
+    loader = DataLoader(data_dir=str(tmp_path))
+
+    clusterer = StudentClusterer(n_clusters=3, model_path=str(tmp_path / 'clustering_model.joblib'))
+    sample = clusterer.fit_streaming(
+        lambda: loader.iter_student_vectors(chunk_size=40), eval_sample_size=100, compute_elbow=False
+    )
+    assert clusterer.training_mode == 'minibatch'
+    assert clusterer.metrics['kmeans_plus']['n_samples'] == 250
+    assert sample.shape == (100, 20)
+    # Well-separated blobs: every true cluster maps to one learned cluster
+    labels = clusterer.predict_labels(vectors)
+    truth = np.argmin(((vectors[:, None] - centers[None]) ** 2).sum(-1), axis=1)
+    assert len(set(zip(truth, labels))) == 3
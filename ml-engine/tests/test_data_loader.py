@@ -0,0 +1,66 @@
+"""
+Tests for streaming student vectors from disk.
+"""
+import csv
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.data_loader import DataLoader, iter_json_array
+
+SUBJECTS = ('mathematics', 'science', 'arts', 'languages')
+
+
+def write_students(data_dir: Path, vectors: np.ndarray):
+    """Write vectors as students.json and as a generate_students.py-style CSV."""
+    students = [{'id': f'student_{i}', 'combined_vector': vector.tolist()} for i, vector in enumerate(vectors)]
+    # One student without a vector is skipped by both readers
+    students.insert(3, {'id': 'student_x'})
+    with open(data_dir / 'students.json', 'w', encoding='utf-8') as f:
+        json.dump(students, f, indent=2)
+
+    header = (
+        ['id', 'cluster_hint']
+        + [f'riasec_{c}' for c in 'RIASEC']
+        + [f'skill_{i}' for i in range(10)]
+        + [f'subject_{s}' for s in SUBJECTS]
+    )
+    with open(data_dir / 'students.csv', 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for i, vector in enumerate(vectors):
+            writer.writerow([f'student_{i}', 'hint'] + [repr(float(x)) for x in vector])
+
+
+def test_student_vectors_stream_in_chunks_without_loading_the_file(tmp_path, monkeypatch):
+    vectors = np.random.default_rng(0).random((25, 20))
+    write_students(tmp_path, vectors)
+    loader = DataLoader(data_dir=str(tmp_path))
+
+    def load_whole_file(*args, **kwargs):
+        raise AssertionError("students.json must not be loaded whole")
+
+    monkeypatch.setattr(loader, 'load_students', load_whole_file)
+    for filepath in (None, str(tmp_path / 'students.csv')):
+        chunks = list(loader.iter_student_vectors(chunk_size=10, filepath=filepath))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        np.testing.assert_array_equal(np.vstack(chunks), vectors)
+
+
+def test_json_array_reader_handles_elements_split_across_reads(tmp_path):
+    items = [{'v': [1.5e-10, -3, 12345678901234567890]}, 'a,]"b', [], None, 2.5e10, True]
+    path = tmp_path / 'items.json'
+    path.write_text(json.dumps(items), encoding='utf-8')
+    for read_size in (1, 2, 5, 1 << 16):
+        assert list(iter_json_array(str(path), read_size=read_size)) == items
+
+    for broken in ('[1, 2', '[1,]', '{"a": 1}'):
+        path.write_text(broken, encoding='utf-8')
+        with pytest.raises(ValueError):
+            list(iter_json_array(str(path), read_size=2))
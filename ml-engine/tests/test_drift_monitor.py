@@ -0,0 +1,50 @@
+"""
+Tests for the running drift statistics.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.drift_monitor import DriftMonitor
+
+
+def test_running_statistics_match_batch_computation():
+    rng = np.random.default_rng(0)
+    centers = rng.random((3, 6))
+    monitor = DriftMonitor.from_training(centers, centers[rng.integers(0, 3, 500)] + rng.normal(0, 0.05, (500, 6)))
+    live = centers[1] + rng.normal(0.2, 0.05, (40, 6))
+    for vector in live:
+        monitor.update(1, vector)
+
+    snapshot = monitor.snapshot()
+    cluster = snapshot['clusters'][1]
+    assert snapshot['observations'] == 40
+    assert cluster['count'] == 40 and cluster['share'] == 1.0
+    np.testing.assert_allclose(monitor.means[1], live.mean(axis=0))
+    assert cluster['mean_variance'] == pytest.approx(live.var(axis=0, ddof=1).mean())
+    assert cluster['mean_distance'] == pytest.approx(np.linalg.norm(live - centers[1], axis=1).mean())
+    assert cluster['centroid_shift'] == pytest.approx(np.linalg.norm(live.mean(axis=0) - centers[1]))
+    assert cluster['drifting'] and snapshot['drifting']
+    assert snapshot['clusters'][0]['count'] == 0 and snapshot['clusters'][0]['drift_score'] is None
+
+
+def test_training_like_traffic_does_not_drift():
+    rng = np.random.default_rng(1)
+    centers = rng.random((4, 8)) * 3
+    training = centers[rng.integers(0, 4, 2000)] + rng.normal(0, 0.1, (2000, 8))
+    monitor = DriftMonitor.from_training(centers, training)
+    live = centers[rng.integers(0, 4, 400)] + rng.normal(0, 0.1, (400, 8))
+    for vector in live:
+        distances = np.linalg.norm(centers - vector, axis=1)
+        monitor.update(int(np.argmin(distances)), vector, float(distances.min()))
+
+    snapshot = monitor.snapshot()
+    assert not snapshot['drifting']
+    assert snapshot['cluster_share_shift'] < 0.1
+    for cluster in snapshot['clusters']:
+        assert cluster['distance_ratio'] == pytest.approx(1.0, abs=0.15)
@@ -0,0 +1,147 @@
+"""
+Tests for the neighbour-interpolation 3D projector and the career embedder.
+"""
+import hashlib
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.embeddings import CareerEmbedder, EmbeddingReducer, NeighborProjector
+
+
+def test_projection_is_distance_weighted_neighbour_mean():
+    rng = np.random.default_rng(0)
+    vectors = rng.random((50, 8))
+    coords = rng.random((50, 3))
+    projector = NeighborProjector(vectors, coords, n_neighbors=4)
+    query = rng.random(8)
+
+    distances = np.linalg.norm(vectors - query, axis=1)
+    nearest = np.argsort(distances)[:4]
+    weights = 1.0 / distances[nearest]
+    expected = weights @ coords[nearest] / weights.sum()
+    np.testing.assert_allclose(projector.transform(query)[0], expected)
+
+
+def test_training_vector_maps_to_its_own_coordinates_unless_excluded():
+    rng = np.random.default_rng(1)
+    vectors = rng.random((30, 5))
+    coords = rng.random((30, 3))
+    projector = NeighborProjector(vectors, coords, n_neighbors=3)
+    np.testing.assert_allclose(projector.transform(vectors[:5]), coords[:5], atol=1e-6)
+
+    left_out = projector.transform(vectors[:5], exclude_self=True)
+    reference = NeighborProjector(vectors[1:], coords[1:], n_neighbors=3).transform(vectors[0])
+    np.testing.assert_allclose(left_out[0], reference[0])
+
+
+class LinearUMAP:
+    """UMAP stand-in: a fixed linear map, without UMAP's private training-data attributes."""
+
+    def __init__(self, vectors):
+        self.weights = np.random.default_rng(2).random((vectors.shape[1], 3))
+        self.embedding_ = vectors @ self.weights
+
+    def transform(self, vectors):
+        return np.asarray(vectors) @ self.weights
+
+
+def test_projector_is_built_from_the_given_training_vectors(tmp_path):
+    vectors = np.random.default_rng(3).random((40, 6))
+    reducer = EmbeddingReducer(model_dir=str(tmp_path))
+    reducer.umap_3d = LinearUMAP(vectors)
+    stats = reducer.fit_projection_3d(vectors, n_neighbors=4, eval_size=20)
+    assert stats['n_training_vectors'] == 40 and stats['n_evaluated'] == 20
+    np.testing.assert_allclose(reducer.project_3d(vectors[:5]), reducer.umap_3d.embedding_[:5], atol=1e-6)
+    assert EmbeddingReducer(model_dir=str(tmp_path)).projection_3d.stats == stats
+
+    with pytest.raises(ValueError, match="fitted on 40 vectors"):
+        reducer.fit_projection_3d(vectors[:30])
+
+
+class HashEncoder:
+    """Deterministic stand-in for SentenceTransformer that records its calls."""
+
+    def __init__(self, dim: int = 8):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.calls.append((list(texts), batch_size))
+        return np.array([
+            np.frombuffer(hashlib.blake2b(text.encode('utf-8'), digest_size=self.dim * 4).digest(), dtype=np.uint32) / 2**32
+            for text in texts
+        ], dtype=np.float32)
+
+
+CAREERS = [
+    {'title': 'Nurse', 'description': 'Patient care', 'riasec': [0, 0, 0, 1, 0, 0], 'skills_vector': [0.5] * 10},
+    {'title': 'Engineer', 'description': 'Build systems'},
+    {'title': 'Nurse', 'description': 'Patient care'},
+]
+
+
+def test_embed_batch_encodes_unique_texts_in_one_call(tmp_path):
+    encoder = HashEncoder()
+    embedder = CareerEmbedder(batch_size=16, cache_path=str(tmp_path / "cache.npz"), encoder=encoder)
+    embeddings = embedder.embed_batch(CAREERS)
+
+    assert encoder.calls == [(['Nurse Patient care', 'Engineer Build systems'], 16)]
+    assert embeddings.shape == (3, 8 + 6 + 10)
+    np.testing.assert_array_equal(embeddings[0, :8], encoder.encode(['Nurse Patient care'])[0])
+    np.testing.assert_array_equal(embeddings[0, 8:], [0, 0, 0, 1, 0, 0] + [0.5] * 10)
+    np.testing.assert_array_equal(embeddings[1, 8:], np.zeros(16))
+    np.testing.assert_array_equal(embedder.embed_career(CAREERS[1]), embeddings[1])
+
+
+def test_cache_only_encodes_new_or_changed_careers(tmp_path):
+    cache_path = str(tmp_path / "cache.npz")
+    embedder = CareerEmbedder(cache_path=cache_path, encoder=HashEncoder())
+    first = embedder.embed_batch(CAREERS)
+    embedder.save_cache()
+
+    encoder = HashEncoder()
+    embedder = CareerEmbedder(cache_path=cache_path, encoder=encoder)
+    changed = CAREERS[:2] + [{'title': 'Nurse', 'description': 'Patient care and triage'}]
+    embeddings = embedder.embed_batch(changed)
+
+    assert encoder.calls == [(['Nurse Patient care and triage'], embedder.batch_size)]
+    assert (embedder.hits, embedder.misses) == (2, 1)
+    np.testing.assert_array_equal(embeddings[:2], first[:2])
+
+    # The model name is part of the key
+    other = HashEncoder()
+    CareerEmbedder(model_name='other-model', cache_path=cache_path, encoder=other).embed_batch(CAREERS[:1])
+    assert len(other.calls) == 1
+
+
+def test_cache_is_bounded_and_flushed_in_batches(tmp_path):
+    cache_path = tmp_path / "cache.npz"
+    texts = [f"Career {i}" for i in range(10)]
+    embedder = CareerEmbedder(cache_path=str(cache_path), encoder=HashEncoder(), max_cache_entries=4, flush_every=3)
+
+    embedder.embed_texts(texts[:2])
+    assert not cache_path.exists()
+    embedder.embed_texts(texts[2:4])
+    saved = CareerEmbedder(cache_path=str(cache_path), encoder=HashEncoder())
+    assert len(saved._cache) == 4
+
+    # Career 0 is used again, so Career 1 is the least recently used
+    embedder.embed_texts(texts[:1])
+    embedder.embed_texts(texts[4:5])
+    assert list(embedder._cache) == [embedder.cache_key(text) for text in ("Career 2", "Career 3", "Career 0", "Career 4")]
+
+    # A single call larger than the cache still returns every embedding
+    embeddings = embedder.embed_texts(texts)
+    assert embeddings.shape == (10, 8) and len(embedder._cache) == 4
+    np.testing.assert_array_equal(embeddings[9], HashEncoder().encode(texts[9:])[0])
+    embedder.save_cache()
+    encoder = HashEncoder()
+    reloaded = CareerEmbedder(cache_path=str(cache_path), encoder=encoder, max_cache_entries=4)
+    reloaded.embed_texts(texts[6:])
+    assert encoder.calls == []
@@ -0,0 +1,42 @@
+"""
+Cold-import budget for the ML engine app module.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ML_ENGINE_DIR = Path(__file__).parent.parent
+
+# Seconds allowed for a cold `import app` (override for slow CI machines)
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET_SECONDS", 5.0))
+
+# Imported on first use only; none of these may load at startup
+LAZY_MODULES = ('umap', 'pynndescent', 'numba', 'sentence_transformers')
+
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import app
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+
+def run_cold_import() -> dict:
+    env = dict(os.environ, ML_WARMUP="0", CAREERS_WATCH_INTERVAL="0")
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ML_ENGINE_DIR, env=env, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_app_import_stays_within_budget():
+    probe = run_cold_import()
+    assert probe["loaded"] == [], f"heavy modules imported at startup: {probe['loaded']}"
+    assert probe["elapsed"] < IMPORT_TIME_BUDGET, (
+        f"import app took {probe['elapsed']:.2f}s (budget {IMPORT_TIME_BUDGET:.1f}s)"
+    )
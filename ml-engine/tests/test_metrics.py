@@ -0,0 +1,107 @@
+"""
+Tests for the blocked Dunn Index, silhouette and RIASEC ground truth.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sklearn.metrics import silhouette_score
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.metrics import calculate_dunn_index, calculate_silhouette, create_riasec_ground_truth
+
+
+def reference_dunn_index(vectors, labels):
+    """Straightforward O(n^2) definition: center separation over largest cluster diameter."""
+    clusters = [vectors[labels == c] for c in np.unique(labels)]
+    centers = [cluster.mean(axis=0) for cluster in clusters]
+    min_inter = min(
+        np.linalg.norm(centers[i] - centers[j])
+        for i in range(len(centers)) for j in range(i + 1, len(centers))
+    )
+    max_intra = max(
+        np.linalg.norm(cluster[k] - cluster[l])
+        for cluster in clusters
+        for k in range(len(cluster)) for l in range(k + 1, len(cluster))
+    )
+    return min_inter / max_intra
+
+
+@pytest.mark.parametrize("n_samples,n_clusters,block_size", [
+    (40, 2, 2048),
+    (150, 5, 16),
+    (257, 4, 7),
+])
+def test_exact_matches_reference(n_samples, n_clusters, block_size):
+    rng = np.random.default_rng(n_samples)
+    vectors = rng.random((n_samples, 12))
+    labels = rng.integers(0, n_clusters, n_samples)
+    expected = reference_dunn_index(vectors, labels)
+    assert calculate_dunn_index(vectors, labels, block_size=block_size) == pytest.approx(expected, rel=1e-9)
+
+
+def test_sampled_mode_is_exact_when_clusters_fit_in_sample():
+    rng = np.random.default_rng(3)
+    vectors = rng.random((200, 8))
+    labels = rng.integers(0, 3, 200)
+    expected = reference_dunn_index(vectors, labels)
+    assert calculate_dunn_index(vectors, labels, sample_size=200) == pytest.approx(expected, rel=1e-9)
+
+
+def test_sampled_mode_bounds_exact_value():
+    rng = np.random.default_rng(5)
+    centers = rng.random((4, 10)) * 4
+    labels = rng.integers(0, 4, 3000)
+    vectors = centers[labels] + rng.normal(0, 0.3, (3000, 10))
+    exact = calculate_dunn_index(vectors, labels)
+    approx = calculate_dunn_index(vectors, labels, sample_size=100, block_size=256)
+    # The sampled diameter can only be shorter, so the index can only be larger
+    assert approx >= exact
+    assert approx == pytest.approx(exact, rel=0.1)
+
+
+def test_single_cluster_scores_zero():
+    vectors = np.random.default_rng(0).random((20, 4))
+    assert calculate_dunn_index(vectors, np.zeros(20, dtype=int)) == 0.0
+
+
+@pytest.mark.parametrize("n_samples,n_clusters,block_size", [
+    (60, 3, 2048),
+    (301, 5, 32),
+])
+def test_chunked_silhouette_matches_sklearn(n_samples, n_clusters, block_size):
+    rng = np.random.default_rng(n_samples)
+    vectors = rng.random((n_samples, 12))
+    labels = rng.integers(0, n_clusters, n_samples)
+    labels[0] = n_clusters  # singleton cluster scores 0
+    result = calculate_silhouette(vectors, labels, sample_size=None, block_size=block_size)
+    assert result['mode'] == 'exact'
+    assert result['value'] == pytest.approx(silhouette_score(vectors, labels), abs=1e-12)
+
+
+def test_sampled_silhouette_is_seeded():
+    rng = np.random.default_rng(9)
+    vectors = rng.random((1000, 6))
+    labels = rng.integers(0, 4, 1000)
+    first = calculate_silhouette(vectors, labels, sample_size=200)
+    assert first == calculate_silhouette(vectors, labels, sample_size=200)
+    assert first['mode'] == 'sampled' and first['n_samples'] == 200
+    indices = np.random.default_rng(42).choice(1000, size=200, replace=False)
+    assert first['value'] == pytest.approx(silhouette_score(vectors[indices], labels[indices]), abs=1e-12)
+
+
+def test_riasec_ground_truth_uses_matrix_and_falls_back_per_row():
+    students = [
+        {'combined_vector': [0.1, 0.9, 0.2, 0.0, 0.0, 0.3, 0.5]},
+        {'combined_vector': [0.0] * 7, 'riasec_vector': [0, 0, 0, 0, 1, 0]},
+        {'combined_vector': [0.7, 0.1, 0.0, 0.0, 0.0, 0.0, 0.5]},
+        {'combined_vector': [0.0] * 7, 'profile': {'riasec_profile': {'S': 0.8, 'C': 0.2}}},
+        {'combined_vector': [0.0] * 7},
+    ]
+    student_vectors = np.array([student['combined_vector'] for student in students])
+    expected = [1, 4, 0, 3]
+    np.testing.assert_array_equal(create_riasec_ground_truth(students, student_vectors), expected)
+    np.testing.assert_array_equal(create_riasec_ground_truth(students), expected)
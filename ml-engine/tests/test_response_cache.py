@@ -0,0 +1,61 @@
+"""
+Tests for the LRU + TTL response cache.
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_size=2, ttl_seconds=60, clock=FakeClock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["size"] == 2
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = ResponseCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 10.0
+    assert cache.get("a") == 1
+    clock.now = 10.5
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_setting_refreshes_ttl_and_zero_size_disables():
+    clock = FakeClock()
+    cache = ResponseCache(max_size=4, ttl_seconds=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 8.0
+    cache.set("a", 2)
+    clock.now = 15.0
+    assert cache.get("a") == 2
+
+    disabled = ResponseCache(max_size=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None and not disabled.stats()["enabled"]
+
+
+def test_make_key_ignores_order_and_includes_version():
+    key = ResponseCache.make_key({"x": 1, "y": [1, 2]}, "v1")
+    assert key == ResponseCache.make_key({"y": [1, 2], "x": 1}, "v1")
+    assert key != ResponseCache.make_key({"x": 1, "y": [1, 2]}, "v2")
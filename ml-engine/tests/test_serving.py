@@ -0,0 +1,104 @@
+"""
+Tests for the NumPy serving artifact (PCA + centroids).
+"""
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.decomposition import PCA
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import core.clustering
+from core.clustering import StudentClusterer
+from core.embeddings import EmbeddingReducer
+from core.serving import ServingArtifact
+
+
+def train_and_export(model_dir: Path, vectors: np.ndarray):
+    clusterer = StudentClusterer(n_clusters=3, model_path=str(model_dir / "clustering_model.joblib"))
+    clusterer.fit(vectors, compute_elbow=False)
+    reducer = EmbeddingReducer(model_dir=str(model_dir))
+    reducer.fit_pca_2d(vectors)
+    ServingArtifact.from_models(clusterer, reducer).save(reducer.serving_path)
+    return clusterer, reducer
+
+
+def test_served_models_match_sklearn_without_unpickling(tmp_path):
+    rng = np.random.default_rng(0)
+    centers = rng.random((3, 6)) * 5
+    vectors = centers[rng.integers(0, 3, 90)] + rng.normal(0, 0.2, (90, 6))
+    trained_clusterer, trained_reducer = train_and_export(tmp_path, vectors)
+    queries = rng.random((20, 6)) * 5
+
+    clusterer = StudentClusterer(n_clusters=3, model_path=str(tmp_path / "clustering_model.joblib"))
+    reducer = EmbeddingReducer(model_dir=str(tmp_path))
+    assert clusterer.serving_artifact is not None and reducer.serving is not None
+    assert clusterer.is_fitted() and reducer.has_pca_2d()
+
+    np.testing.assert_allclose(reducer.transform_2d(queries), trained_reducer.pca_2d.transform(queries), atol=1e-12)
+    np.testing.assert_array_equal(clusterer.predict_labels(queries), trained_clusterer.kmeans_plus.predict(queries))
+    assert clusterer.cluster_names == trained_clusterer.cluster_names
+    # Nothing above needed the joblib models
+    assert clusterer._serving_only and reducer._pca_2d is None
+
+    # Reading a saved-only attribute loads the full model
+    assert clusterer.metrics == trained_clusterer.metrics
+    assert not clusterer._serving_only and clusterer.kmeans_plus is not None
+    assert clusterer.get_active_algorithm() == 'kmeans_plus'
+    assert reducer.pca_2d is not None
+
+
+def test_artifact_keeps_serving_while_deferred_model_loads(tmp_path, monkeypatch):
+    vectors = np.random.default_rng(3).random((60, 4))
+    trained_clusterer, _ = train_and_export(tmp_path, vectors)
+    clusterer = StudentClusterer(n_clusters=3, model_path=trained_clusterer.model_path)
+
+    loading = threading.Event()
+    real_load = core.clustering.joblib.load
+
+    def slow_load(path):
+        loading.set()
+        time.sleep(0.3)
+        return real_load(path)
+
+    monkeypatch.setattr(core.clustering.joblib, "load", slow_load)
+    loader = threading.Thread(target=lambda: clusterer.metrics)
+    loader.start()
+    assert loading.wait(5)
+    expected = trained_clusterer.predict_labels(vectors)
+    while loader.is_alive():
+        assert clusterer.is_fitted()
+        np.testing.assert_array_equal(clusterer.predict_labels(vectors), expected)
+        assert clusterer.assign(vectors[0])['cluster_id'] == expected[0]
+    loader.join()
+    assert not clusterer._serving_only and clusterer.kmeans_plus is not None
+    np.testing.assert_array_equal(clusterer.predict_labels(vectors), expected)
+
+
+def test_stale_artifact_falls_back_to_joblib(tmp_path):
+    vectors = np.random.default_rng(1).random((60, 4))
+    trained_clusterer, trained_reducer = train_and_export(tmp_path, vectors)
+    # Retrained (re-saved) models without a re-export
+    trained_reducer.fit_pca_2d(vectors[:30])
+    stat = os.stat(trained_clusterer.model_path)
+    os.utime(trained_clusterer.model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    clusterer = StudentClusterer(n_clusters=3, model_path=trained_clusterer.model_path)
+    reducer = EmbeddingReducer(model_dir=str(tmp_path))
+    assert clusterer.serving_artifact is None and not clusterer._serving_only
+    assert reducer.serving is None
+    np.testing.assert_allclose(reducer.transform_2d(vectors), trained_reducer.pca_2d.transform(vectors))
+
+
+def test_whitened_pca_is_folded_into_components(tmp_path):
+    vectors = np.random.default_rng(2).random((40, 5))
+    clusterer, reducer = train_and_export(tmp_path, vectors)
+    reducer.pca_2d = PCA(n_components=2, whiten=True).fit(vectors)
+
+    artifact = ServingArtifact.from_models(clusterer, reducer)
+    np.testing.assert_allclose(artifact.transform_2d(vectors), reducer.pca_2d.transform(vectors), atol=1e-12)
@@ -0,0 +1,205 @@
+"""
+Tests for career ranking in the similarity engine.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.similarity import DEFAULT_SKILL_KEYS, SKILL_NAME_MAPPING, SimilarityEngine
+
+
+def make_careers(n: int, dim: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    domains = ['Tech/Analytical', 'Creative', 'Social/People']
+    return [
+        {
+            'id': i,
+            'title': f'Career {i}',
+            'domain': domains[i % len(domains)],
+            'skills': [],
+            'embedding': rng.normal(size=dim).tolist(),
+        }
+        for i in range(n)
+    ]
+
+
+def test_ann_index_is_built_for_the_query_dim_only():
+    engine = SimilarityEngine(ann_cells=4, ann_probe=2)
+    engine.set_careers(make_careers(40, 400), query_dim=20)
+    group = engine._groups[0]
+    assert list(group['ann']) == [20]
+
+    indices, scores = engine.rank_careers(np.random.default_rng(1).random(20), top_k=5)
+    assert len(indices) == len(scores) == 5
+    # Other query dimensions are scored exactly instead of indexed on the request path
+    exact = engine.rank_careers(np.random.default_rng(1).random(30), top_k=5, n_probe=1)
+    assert len(exact[0]) == 5
+    assert list(group['ann']) == [20]
+
+
+def clustered_careers(n: int, dim: int = 20, n_domains: int = 16, seed: int = 3):
+    """Careers scattered around domain centers, like benchmark_ann.make_catalog."""
+    rng = np.random.default_rng(seed)
+    centers = rng.random((n_domains, dim))
+    embeddings = np.clip(centers[rng.integers(0, n_domains, n)] + rng.normal(0, 0.1, (n, dim)), 0, 1)
+    return [{'id': i, 'title': f'Career {i}', 'embedding': e.tolist()} for i, e in enumerate(embeddings)]
+
+
+def test_ivf_recall_against_exact_search():
+    engine = SimilarityEngine(ann_cells=8, ann_probe=3)
+    engine.set_careers(clustered_careers(800), query_dim=20)
+    queries = np.random.default_rng(4).random((50, 20))
+    top_k = 10
+
+    recalls = []
+    for query in queries:
+        exact_indices, exact_scores = engine.score_careers(query, exact=True)
+        expected = exact_indices[engine._top_k(exact_scores, top_k, exact_indices)]
+        indices, scores = engine.rank_careers(query, top_k)
+        recalls.append(len(set(indices.tolist()) & set(expected.tolist())) / top_k)
+        # Probed scores are exact cosine similarities of the careers returned
+        np.testing.assert_allclose(scores, exact_scores[np.argsort(exact_indices)][indices], atol=1e-6)
+
+        # Probing every cell falls back to the exact ranking
+        for n_probe in (8, 100):
+            all_cells = engine.rank_careers(query, top_k, n_probe=n_probe)
+            assert all_cells[0].tolist() == expected.tolist()
+    assert np.mean(recalls) >= 0.9
+
+
+def test_probe_count_must_be_positive():
+    with pytest.raises(ValueError):
+        SimilarityEngine(ann_cells=8, ann_probe=0)
+    engine = SimilarityEngine(ann_cells=8)
+    engine.set_careers(clustered_careers(100), query_dim=20)
+    for n_probe in (0, -1):
+        with pytest.raises(ValueError):
+            engine.rank_careers(np.ones(20), 5, n_probe=n_probe)
+
+
+def brute_force_ranking(engine, careers, user_vector, top_k):
+    """Reference ranking: score every career one by one, stable sort by score."""
+    scored = [
+        (i, engine.compute_similarity(user_vector, np.asarray(career['embedding'])))
+        for i, career in enumerate(careers)
+    ]
+    scored.sort(key=lambda item: -item[1])
+    return scored[:top_k]
+
+
+def test_rank_careers_matches_brute_force_with_ties():
+    careers = make_careers(30, 20, seed=2)
+    # Duplicated embeddings tie exactly, across and within domains
+    for i in (7, 13, 22, 28):
+        careers[i]['embedding'] = list(careers[3]['embedding'])
+    engine = SimilarityEngine()
+    engine.set_careers(careers)
+
+    user_vector = np.asarray(careers[3]['embedding']) + 0.01
+    for top_k in (1, 3, 4, 5, 29, 30, 50):
+        indices, scores = engine.rank_careers(user_vector, top_k)
+        expected = brute_force_ranking(engine, careers, user_vector, top_k)
+        assert len(indices) == min(top_k, len(careers))
+        assert indices.tolist() == [i for i, _ in expected]
+        np.testing.assert_allclose(scores, [score for _, score in expected], atol=1e-6)
+        batch_indices, batch_scores = engine.rank_careers_batch(np.vstack([user_vector, user_vector[::-1]]), top_k)
+        assert batch_indices[0].tolist() == indices.tolist()
+        np.testing.assert_allclose(batch_scores[0], scores, atol=1e-6)
+
+
+def reference_skill_key(career_skill_name, user_skills):
+    """Per-call fuzzy matching as compute_skill_gap() did before the resolution table."""
+    def norm(name):
+        return name.lower().strip().replace(' ', '_').replace('-', '_').replace('/', '_')
+
+    normalized = norm(career_skill_name)
+    if normalized in user_skills:
+        return normalized
+    for user_key, variations in SKILL_NAME_MAPPING.items():
+        for variation in variations:
+            if normalized == norm(variation) and user_key in user_skills:
+                return user_key
+        for variation in variations:
+            if (normalized in norm(variation) or norm(variation) in normalized) and user_key in user_skills:
+                return user_key
+        words = normalized.split('_')
+        for variation in variations:
+            if any(w in normalized for w in variation.lower().split()) or any(w in variation.lower() for w in words):
+                if user_key in user_skills:
+                    return user_key
+    for user_key in user_skills:
+        if normalized in user_key or user_key in normalized:
+            return user_key
+    return None
+
+
+def reference_skill_gap(user_skills, required_skills):
+    gaps = {}
+    for skill_name, required_level in required_skills.items():
+        key = reference_skill_key(skill_name, user_skills)
+        if key and key in user_skills:
+            gap = max(0.0, min(1.0, required_level - user_skills[key]))
+            if gap > 0.1:
+                gaps[skill_name] = round(gap, 2)
+    return gaps
+
+
+def test_skill_key_table_matches_per_call_resolution():
+    catalog_skills = [
+        'Python', 'PROGRAMMING', 'Problem Solving', 'problem-solving', 'Data Analysis',
+        'UI/UX', 'Team Work', 'Public Speaking', 'Machine Learning', 'Medical Knowledge',
+        'Empathy', 'Math', 'Statistics', 'CAD', 'Attention to Detail', 'Critical Thinking',
+    ]
+    unseen_skills = ['Creative Writing', 'COLLABORATION', 'Welding', 'ux', 'Quantum Baking', 'leadership ', 'SQL']
+    careers = make_careers(len(catalog_skills), 20, seed=4)
+    for career, skill in zip(careers, catalog_skills):
+        career['skills'] = [skill]
+    engine = SimilarityEngine()
+    engine.set_careers(careers)
+
+    rng = np.random.default_rng(6)
+    key_sets = [
+        DEFAULT_SKILL_KEYS,
+        ('communication', 'mathematics', 'teamwork'),
+        ('python', 'design', 'data_analysis', 'research'),
+    ]
+    required = {skill: 0.9 for skill in catalog_skills + unseen_skills}
+    for keys in key_sets:
+        for _ in range(2):
+            user_skills = {key: float(rng.random()) for key in keys}
+            table_keys = {skill: reference_skill_key(skill, user_skills) for skill in required}
+            assert engine.compute_skill_gap(user_skills, required) == reference_skill_gap(user_skills, required)
+            assert {skill: engine._skill_key_table(tuple(user_skills))[skill] for skill in required} == table_keys
+    # Skills matching no variation or key stay unresolved
+    assert engine._skill_key_table(DEFAULT_SKILL_KEYS)['SQL'] is None
+    assert engine._skill_key_table(DEFAULT_SKILL_KEYS)['CAD'] is None
+
+
+def test_domain_filter_ranks_within_partitions():
+    careers = make_careers(24, 20, seed=8)
+    # Two embedding lengths split every domain across two scoring groups
+    for career in careers[:6]:
+        career['embedding'] = career['embedding'][:12]
+    engine = SimilarityEngine(ann_cells=3, ann_probe=1)
+    engine.set_careers(careers)
+    user_vector = np.random.default_rng(9).random(20)
+
+    for domains in ('creative', ['Social/People', ' TECH/ANALYTICAL'], ['Creative', 'creative']):
+        wanted = {d.strip().lower() for d in ([domains] if isinstance(domains, str) else domains)}
+        members = [i for i, c in enumerate(careers) if c['domain'].lower() in wanted]
+        indices, scores = engine.rank_careers(user_vector, top_k=50, domains=domains)
+        expected = brute_force_ranking(engine, [careers[i] for i in members], user_vector, 50)
+        assert indices.tolist() == [members[i] for i, _ in expected]
+        np.testing.assert_allclose(scores, [score for _, score in expected], atol=1e-6)
+
+    # No matching partition: empty results, not an error
+    for domains in ([], 'Unknown Domain'):
+        indices, scores = engine.rank_careers(user_vector, top_k=5, domains=domains)
+        assert len(indices) == len(scores) == 0
+        batch_indices, _ = engine.rank_careers_batch(np.vstack([user_vector] * 2), top_k=5, domains=domains)
+        assert batch_indices.shape == (2, 0)